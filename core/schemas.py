@@ -62,6 +62,9 @@ class VerdictResponse(BaseModel):
     trajectory: Optional[Dict] = None
     explainer: Optional[str] = None
 
+    # Diagnostics
+    retrieval_timings: Optional[Dict] = None  # per-source evidence latency / status
+
 
 # ==============================
 # Community Co-Verification Schemas
@@ -34,23 +34,7 @@ document.addEventListener("DOMContentLoaded", () => {
     if (claimImage) formData.append("image", claimImage);
 
     try {
-      const response = await fetch("http://127.0.0.1:8000/api/factcheck", {
-        method: "POST",
-        body: formData,
-      });
-      const data = await response.json();
-
-      showVerdict(data);
-      showReasoning(data.reasoning || {});
-      showProvenance(data.provenance || {});
-      showSocialSignals(data.social_signals || []); // ✅ Social signals panel
-
-      if (data.ledger_status) {
-        document.getElementById("ledger-hash").innerText =
-          data.ledger_status.ledger_hash || "Recorded";
-      }
-
-      enableDownload(data);
+      await streamFactcheck(formData);
     } catch (err) {
       console.error(err);
       addMessage("⚠️ Backend error. Try again later.", "system");
@@ -63,6 +47,128 @@ document.addEventListener("DOMContentLoaded", () => {
     document.getElementById("claim-image").value = "";
   });
 
+  // Progressive results: render each SSE event from /api/factcheck/stream
+  // as it arrives. Falls back to the blocking endpoint if streaming fails
+  // before any event was received.
+  async function streamFactcheck(formData) {
+    let received = false;
+    try {
+      const response = await fetch("http://127.0.0.1:8000/api/factcheck/stream", {
+        method: "POST",
+        body: formData,
+      });
+      if (!response.ok || !response.body) throw new Error(`Stream HTTP ${response.status}`);
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+          const frame = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+          const event = parseEvent(frame);
+          if (event) {
+            received = true;
+            handleEvent(event.name, event.data);
+          }
+        }
+      }
+    } catch (err) {
+      if (received) throw err;
+      console.warn("Streaming unavailable, falling back:", err);
+      const response = await fetch("http://127.0.0.1:8000/api/factcheck", {
+        method: "POST",
+        body: formData,
+      });
+      showResult(await response.json());
+    }
+  }
+
+  function parseEvent(frame) {
+    let name = "message";
+    const dataLines = [];
+    frame.split("\n").forEach((line) => {
+      if (line.startsWith("event:")) name = line.slice(6).trim();
+      else if (line.startsWith("data:")) dataLines.push(line.slice(5).trim());
+    });
+    if (!dataLines.length) return null;
+    return { name, data: JSON.parse(dataLines.join("\n")) };
+  }
+
+  function handleEvent(name, data) {
+    switch (name) {
+      case "evidence":
+        showEvidence(data.source, data.items || []);
+        break;
+      case "social_signals":
+        showSocialSignals(data || []);
+        break;
+      case "reasoning":
+        showReasoning(data || {});
+        break;
+      case "provenance":
+        showProvenance(data || {});
+        break;
+      case "verdict":
+        showVerdict(data);
+        break;
+      case "ledger":
+        showLedger(data);
+        break;
+      case "done":
+        enableDownload(data);
+        break;
+      case "error":
+        console.warn(`Stage ${data.stage} failed: ${data.detail}`);
+        break;
+    }
+  }
+
+  // Full (non-streaming) response
+  function showResult(data) {
+    showVerdict(data);
+    showReasoning(data.reasoning || {});
+    showProvenance(data.provenance || {});
+    showSocialSignals(data.social_signals || []); // ✅ Social signals panel
+    showLedger(data.ledger_status);
+    enableDownload(data);
+  }
+
+  function showEvidence(source, items) {
+    const msg = document.createElement("div");
+    msg.className = "message system evidence";
+    const title = document.createElement("strong");
+    title.innerText = items.length
+      ? `🔎 ${source}: ${items.length} source(s) found`
+      : `🔎 ${source}: no sources found`;
+    msg.appendChild(title);
+    items.forEach((item) => {
+      const url = typeof item === "string" ? item : item.url;
+      const link = document.createElement("a");
+      link.href = url;
+      link.target = "_blank";
+      link.innerText = url.length > 50 ? url.substring(0, 50) + "..." : url;
+      msg.appendChild(document.createElement("br"));
+      msg.appendChild(link);
+    });
+    chatWindow.appendChild(msg);
+    chatWindow.scrollTop = chatWindow.scrollHeight;
+  }
+
+  function showLedger(ledgerStatus) {
+    if (!ledgerStatus) return;
+    document.getElementById("ledger-hash").innerText =
+      ledgerStatus.ledger_hash || "Recorded";
+    const cards = chatWindow.querySelectorAll(".verdict-card .ledger");
+    if (cards.length) {
+      cards[cards.length - 1].innerHTML = "<strong>Ledger:</strong> Recorded";
+    }
+  }
+
   function addMessage(text, type) {
     const msg = document.createElement("div");
     msg.className = `message ${type}`;
@@ -103,7 +209,7 @@ document.addEventListener("DOMContentLoaded", () => {
           : ""
       }
       <div class="ledger">
-        <strong>Ledger:</strong> ${data.ledger_status ? "Recorded" : "Failed"}
+        <strong>Ledger:</strong> ${data.ledger_status ? "Recorded" : "Pending"}
       </div>
       <button id="download-json">⬇ Download Full Report</button>
     `;
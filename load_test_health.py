@@ -0,0 +1,66 @@
+"""
+Load test: /health latency while fact-checks are running.
+
+Starts N concurrent POST /api/claims requests (retrieval + embedding + FAISS)
+and, at the same time, polls GET /health. Prints /health p50/p99 so event
+loop stalls show up directly.
+
+    uvicorn main:app --port 8080
+    python load_test_health.py --url http://localhost:8080 --concurrency 8 --duration 30
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+CLAIMS = [
+    "NASA confirms Earth will experience 15 days of darkness in November",
+    "Earth will go dark for 6 days in December",
+    "5G towers spread Covid-19",
+    "Drinking hot water kills the coronavirus",
+]
+
+
+async def fact_check_worker(client: httpx.AsyncClient, url: str, stop_at: float, counter: list):
+    i = 0
+    while time.monotonic() < stop_at:
+        try:
+            await client.post(f"{url}/api/claims", json={"claim_text": CLAIMS[i % len(CLAIMS)]}, timeout=120)
+            counter[0] += 1
+        except httpx.HTTPError:
+            pass
+        i += 1
+
+
+async def health_poller(client: httpx.AsyncClient, url: str, stop_at: float, interval: float) -> list[float]:
+    latencies = []
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        await client.get(f"{url}/health", timeout=60)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def main(url: str, concurrency: int, duration: float, interval: float):
+    stop_at = time.monotonic() + duration
+    counter = [0]
+    async with httpx.AsyncClient() as client:
+        workers = [fact_check_worker(client, url, stop_at, counter) for _ in range(concurrency)]
+        results = await asyncio.gather(health_poller(client, url, stop_at, interval), *workers)
+    latencies = sorted(results[0])
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"fact-checks completed: {counter[0]}")
+    print(f"/health samples: {len(latencies)}  p50={statistics.median(latencies):.1f} ms  "
+          f"p99={p99:.1f} ms  max={latencies[-1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.concurrency, args.duration, args.interval))
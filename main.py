@@ -12,8 +12,17 @@ from modules.provenance.provenance_logic import provenance_pipeline
 from modules.reasoning.reasoning_logic import reasoning_pipeline
 from modules.provenance.deepfake_detector import detect_deepfake
 from services.ledger_service import sign_record
+from services import vector_store
+from services import http_client
+from services.response_cache import response_cache
+from services.ingest_queue import evidence_queue
+from services.singleflight import singleflight
+from services.llm_cache import llm_cache
+from services.gemini_client import gateway as llm_gateway
+from services.request_context import RequestContextMiddleware
 from modules.fact_check import fact_check_api
 
+import asyncio
 import shutil
 import uuid
 import os
@@ -36,6 +45,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-request memoization of engine and connector calls
+app.add_middleware(RequestContextMiddleware)
 
 # Routers
 app.include_router(orchestration_router, prefix="/api", tags=["Orchestration"])
@@ -44,6 +55,22 @@ app.include_router(community_router, prefix="/api/community", tags=["Community R
 app.include_router(fact_check_api.router)
 
 
+# Shared outbound HTTP pool
+@app.on_event("startup")
+async def open_http_client():
+    await http_client.open_session()
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await http_client.close_session()
+
+
+@app.on_event("shutdown")
+async def flush_evidence_queue():
+    await asyncio.to_thread(evidence_queue.flush)
+
+
 def prov_to_cytoscape(prov: dict) -> list[dict]:
     """Convert provenance JSON (nodes/edges) into Cytoscape.js elements"""
     elements = []
@@ -185,6 +212,24 @@ async def health_check():
     return {"status": "ok", "message": "TruthLens backend running!"}
 
 
+@app.get("/api/stats")
+async def service_stats():
+    """Cache, index and queue counters for dashboards."""
+    # Both stores count their rows in SQLite; keep that off the event loop.
+    vector_stats, llm_cache_stats = await asyncio.gather(
+        asyncio.to_thread(vector_store.stats),
+        asyncio.to_thread(llm_cache.stats),
+    )
+    return {
+        "vector_store": vector_stats,
+        "connector_cache": response_cache.stats(),
+        "ingest_queue": evidence_queue.stats(),
+        "singleflight": singleflight.stats(),
+        "llm_cache": llm_cache_stats,
+        "llm_gateway": llm_gateway.stats(),
+    }
+
+
 # ✅ Serve static frontend
 frontend_dir = os.path.join(os.path.dirname(__file__), "frontend")
 if os.path.exists(frontend_dir):
@@ -1,12 +1,15 @@
 # modules/disinfo/socialconnector.py
 
-import aiohttp
+import asyncio
+from services.http_client import get_session
+from services.response_cache import cached_connector
 from datetime import datetime
 from core.config import settings
 
 # ==============================
 # Twitter / X Connector
 # ==============================
+@cached_connector("twitter", ttl=5 * 60)
 async def fetch_twitter_mentions(query: str, limit: int = 10):
     """
     Fetch recent tweets about the claim.
@@ -17,7 +20,8 @@ async def fetch_twitter_mentions(query: str, limit: int = 10):
             "user": "@demo",
             "text": f"Mock tweet about {query}",
             "url": "",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow().isoformat(),
+            "mock": True,  # placeholder without API credentials; never ingested as evidence
         }]
 
     url = (
@@ -27,20 +31,20 @@ async def fetch_twitter_mentions(query: str, limit: int = 10):
     headers = {"Authorization": f"Bearer {settings.twitter_bearer}"}
     results = []
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(url, headers=headers, timeout=10) as resp:
-                data = await resp.json()
-                for t in data.get("data", []):
-                    results.append({
-                        "platform": "Twitter",
-                        "user": t["author_id"],
-                        "text": t["text"],
-                        "url": f"https://twitter.com/i/web/status/{t['id']}",
-                        "timestamp": t["created_at"]
-                    })
-        except Exception as e:
-            print(f"[Twitter API Error] {e}")
+    session = get_session()
+    try:
+        async with session.get(url, headers=headers, timeout=10) as resp:
+            data = await resp.json()
+            for t in data.get("data", []):
+                results.append({
+                    "platform": "Twitter",
+                    "user": t["author_id"],
+                    "text": t["text"],
+                    "url": f"https://twitter.com/i/web/status/{t['id']}",
+                    "timestamp": t["created_at"]
+                })
+    except Exception as e:
+        print(f"[Twitter API Error] {e}")
 
     return results
 
@@ -48,6 +52,7 @@ async def fetch_twitter_mentions(query: str, limit: int = 10):
 # ==============================
 # YouTube Connector
 # ==============================
+@cached_connector("youtube", ttl=5 * 60)
 async def fetch_youtube_mentions(query: str, limit: int = 5):
     """
     Fetch YouTube video mentions about the claim.
@@ -58,7 +63,8 @@ async def fetch_youtube_mentions(query: str, limit: int = 5):
             "user": "demo_channel",
             "text": f"Mock YouTube video about {query}",
             "url": "",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow().isoformat(),
+            "mock": True,
         }]
 
     url = (
@@ -67,20 +73,20 @@ async def fetch_youtube_mentions(query: str, limit: int = 5):
     )
     results = []
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(url, timeout=10) as resp:
-                data = await resp.json()
-                for item in data.get("items", []):
-                    results.append({
-                        "platform": "YouTube",
-                        "user": item["snippet"]["channelTitle"],
-                        "text": item["snippet"]["title"],
-                        "url": f"https://www.youtube.com/watch?v={item['id'].get('videoId', '')}",
-                        "timestamp": item["snippet"].get("publishTime", datetime.utcnow().isoformat())
-                    })
-        except Exception as e:
-            print(f"[YouTube API Error] {e}")
+    session = get_session()
+    try:
+        async with session.get(url, timeout=10) as resp:
+            data = await resp.json()
+            for item in data.get("items", []):
+                results.append({
+                    "platform": "YouTube",
+                    "user": item["snippet"]["channelTitle"],
+                    "text": item["snippet"]["title"],
+                    "url": f"https://www.youtube.com/watch?v={item['id'].get('videoId', '')}",
+                    "timestamp": item["snippet"].get("publishTime", datetime.utcnow().isoformat())
+                })
+    except Exception as e:
+        print(f"[YouTube API Error] {e}")
 
     return results
 
@@ -88,6 +94,7 @@ async def fetch_youtube_mentions(query: str, limit: int = 5):
 # ==============================
 # Facebook Connector
 # ==============================
+@cached_connector("facebook", ttl=5 * 60)
 async def fetch_facebook_mentions(query: str, limit: int = 5):
     """
     Fetch Facebook page mentions about the claim.
@@ -98,7 +105,8 @@ async def fetch_facebook_mentions(query: str, limit: int = 5):
             "user": "demo_page",
             "text": f"Mock FB post about {query}",
             "url": "",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow().isoformat(),
+            "mock": True,
         }]
 
     url = (
@@ -107,20 +115,20 @@ async def fetch_facebook_mentions(query: str, limit: int = 5):
     )
     results = []
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(url, timeout=10) as resp:
-                data = await resp.json()
-                for item in data.get("data", []):
-                    results.append({
-                        "platform": "Facebook",
-                        "user": item.get("name", "unknown"),
-                        "text": f"Page mentioning {query}",
-                        "url": f"https://facebook.com/{item.get('id')}",
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
-        except Exception as e:
-            print(f"[Facebook API Error] {e}")
+    session = get_session()
+    try:
+        async with session.get(url, timeout=10) as resp:
+            data = await resp.json()
+            for item in data.get("data", []):
+                results.append({
+                    "platform": "Facebook",
+                    "user": item.get("name", "unknown"),
+                    "text": f"Page mentioning {query}",
+                    "url": f"https://facebook.com/{item.get('id')}",
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+    except Exception as e:
+        print(f"[Facebook API Error] {e}")
 
     return results
 
@@ -130,11 +138,16 @@ async def fetch_facebook_mentions(query: str, limit: int = 5):
 # ==============================
 async def fetch_social_signals(query: str, limit: int = 5):
     """
-    Aggregates claims across Twitter, YouTube, and Facebook.
+    Aggregates claims across Twitter, YouTube, and Facebook (queried
+    concurrently; results keep that platform order).
     Always returns a list of normalized dicts.
     """
+    platforms = await asyncio.gather(
+        fetch_twitter_mentions(query, limit),
+        fetch_youtube_mentions(query, limit),
+        fetch_facebook_mentions(query, limit),
+    )
     results = []
-    results.extend(await fetch_twitter_mentions(query, limit))
-    results.extend(await fetch_youtube_mentions(query, limit))
-    results.extend(await fetch_facebook_mentions(query, limit))
+    for mentions in platforms:
+        results.extend(mentions)
     return results
\ No newline at end of file
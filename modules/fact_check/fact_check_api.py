@@ -1,12 +1,20 @@
 # backend/api/fact_check_api.py
 
+import json
+import asyncio
 from fastapi import APIRouter, UploadFile, Form, HTTPException
+from fastapi.responses import StreamingResponse
 from modules.reasoning.reasoning_logic import reasoning_pipeline
 from modules.provenance.provenance_logic import provenance_pipeline
 from services.ledger_service import sign_record
-from services.gemini_client import gemini_fact_check_prompt, gemini_reasoning_prompt
+from services.gemini_client import gemini_fact_check_prompt, gemini_reasoning_prompt, GEMINI_PROMPT_MODE
 from services.google_factcheck import query_factcheck_api
 from modules.disinfo.social_connector import fetch_social_signals  # ✅ integrate social signals
+from services.singleflight import coalesced
+
+from core.logger import setup_logger
+
+logger = setup_logger()
 
 router = APIRouter(prefix="/api", tags=["FactCheck"])
 
@@ -15,6 +23,38 @@ last_ledger = {"ledger_hash": None, "signed_at": None}
 votes = {"agree": 0, "disagree": 0}
 
 
+def _main_claim(claim_text: str, claim_url: str, image: UploadFile) -> str:
+    # Ensure at least one input is provided
+    if not claim_text and not claim_url and not image:
+        raise HTTPException(status_code=400, detail="Provide claim_text, claim_url, or image.")
+
+    # Pick main text for reasoning (priority: claim_text > claim_url > image.filename)
+    return claim_text or claim_url or (image.filename if image else "Unknown claim")
+
+
+def _merge_reasoning(main_claim: str, gemini_reasoning: dict, custom_reasoning: dict) -> dict:
+    """Safe merge of Gemini and custom reasoning results."""
+    return {
+        "fallacy": (gemini_reasoning.get("fallacy") or []) + (custom_reasoning.get("fallacy") or []),
+        "bias": (gemini_reasoning.get("bias") or []) + (custom_reasoning.get("bias") or []),
+        "debiased_text": gemini_reasoning.get("debiased_text")
+            or custom_reasoning.get("debiased_text")
+            or main_claim,
+        "explanation": gemini_reasoning.get("explanation")
+            or custom_reasoning.get("explanation")
+            or "",
+        "generative_explainer": gemini_reasoning.get("generative_explainer") or "",
+    }
+
+
+def _verdict(gemini_result: dict, evidence: list) -> dict:
+    return {
+        "verdict": gemini_result.get("verdict", "Unverified"),
+        "confidence": gemini_result.get("confidence", 0),
+        "relevant_sources": gemini_result.get("relevant_sources", evidence),
+    }
+
+
 @router.post("/factcheck")
 async def unified_factcheck(
     claim_text: str = Form(None),
@@ -26,13 +66,13 @@ async def unified_factcheck(
     Runs Google FactCheck API + Gemini + reasoning + provenance + ledger + social signals.
     """
 
-    # Ensure at least one input is provided
-    if not claim_text and not claim_url and not image:
-        raise HTTPException(status_code=400, detail="Provide claim_text, claim_url, or image.")
+    main_claim = _main_claim(claim_text, claim_url, image)
+    return await _run_factcheck(main_claim)
 
-    # Pick main text for reasoning (priority: claim_text > claim_url > image.filename)
-    main_claim = claim_text or claim_url or (image.filename if image else "Unknown claim")
 
+@coalesced("api_factcheck")
+async def _run_factcheck(main_claim: str) -> dict:
+    """/factcheck pipeline for one claim; identical concurrent requests share a run."""
     # 1. Get evidence from Google Fact Check API
     evidence = await query_factcheck_api(main_claim)
 
@@ -45,18 +85,7 @@ async def unified_factcheck(
     # 4. Run custom reasoning pipeline (your existing logic)
     custom_reasoning = await reasoning_pipeline(main_claim)
 
-    # Safe merge of reasoning results
-    reasoning = {
-        "fallacy": (gemini_reasoning.get("fallacy") or []) + (custom_reasoning.get("fallacy") or []),
-        "bias": (gemini_reasoning.get("bias") or []) + (custom_reasoning.get("bias") or []),
-        "debiased_text": gemini_reasoning.get("debiased_text")
-            or custom_reasoning.get("debiased_text")
-            or main_claim,
-        "explanation": gemini_reasoning.get("explanation")
-            or custom_reasoning.get("explanation")
-            or "",
-        "generative_explainer": gemini_reasoning.get("generative_explainer") or "",
-    }
+    reasoning = _merge_reasoning(main_claim, gemini_reasoning, custom_reasoning)
 
     # 5. Run provenance pipeline
     provenance = await provenance_pipeline(main_claim)
@@ -71,9 +100,7 @@ async def unified_factcheck(
 
     # Build final response
     return {
-        "verdict": gemini_result.get("verdict", "Unverified"),
-        "confidence": gemini_result.get("confidence", 0),
-        "relevant_sources": gemini_result.get("relevant_sources", evidence),
+        **_verdict(gemini_result, evidence),
         "reasoning": reasoning,
         "provenance": provenance,
         "social_signals": social_signals,   # ✅ now included
@@ -81,6 +108,106 @@ async def unified_factcheck(
     }
 
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _factcheck_events(main_claim: str):
+    """
+    Run the /factcheck stages concurrently and yield one SSE event per
+    stage as it completes: evidence, social_signals, reasoning, provenance,
+    verdict (once its evidence is in), then ledger and a final `done` event
+    carrying the same payload /factcheck returns. A failed stage yields an
+    `error` event and falls back to an empty result. In combined prompt
+    mode reasoning waits for the verdict, whose Gemini call answers both.
+    """
+    yield _sse("accepted", {"claim": main_claim})
+
+    fallbacks = {"evidence": [], "social_signals": [], "gemini_reasoning": {}, "custom_reasoning": {},
+                 "provenance": {}, "verdict": {}}
+    def start_reasoning():
+        tasks[asyncio.create_task(gemini_reasoning_prompt(main_claim))] = "gemini_reasoning"
+        tasks[asyncio.create_task(reasoning_pipeline(main_claim))] = "custom_reasoning"
+
+    tasks = {
+        asyncio.create_task(query_factcheck_api(main_claim)): "evidence",
+        asyncio.create_task(provenance_pipeline(main_claim)): "provenance",
+        asyncio.create_task(fetch_social_signals(main_claim, limit=5)): "social_signals",
+    }
+    if GEMINI_PROMPT_MODE != "combined":
+        start_reasoning()
+    results = {}
+    try:
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage = tasks.pop(task)
+                try:
+                    results[stage] = task.result()
+                except Exception as e:
+                    logger.error(f"[FactCheck stream] {stage} failed: {e}")
+                    results[stage] = fallbacks[stage]
+                    yield _sse("error", {"stage": stage, "detail": str(e)})
+
+                if stage == "evidence":
+                    yield _sse("evidence", {"source": "GoogleFactCheck", "items": results["evidence"]})
+                    verdict_task = asyncio.create_task(
+                        gemini_fact_check_prompt(main_claim, evidence=results["evidence"])
+                    )
+                    tasks[verdict_task] = "verdict"
+                elif stage == "social_signals":
+                    yield _sse("social_signals", results["social_signals"])
+                elif stage in ("gemini_reasoning", "custom_reasoning"):
+                    if "gemini_reasoning" in results and "custom_reasoning" in results:
+                        results["reasoning"] = _merge_reasoning(
+                            main_claim, results["gemini_reasoning"], results["custom_reasoning"]
+                        )
+                        yield _sse("reasoning", results["reasoning"])
+                elif stage == "provenance":
+                    yield _sse("provenance", results["provenance"])
+                elif stage == "verdict":
+                    results["verdict"] = _verdict(results["verdict"], results["evidence"])
+                    yield _sse("verdict", results["verdict"])
+                    if GEMINI_PROMPT_MODE == "combined":
+                        start_reasoning()
+
+        signed = sign_record(main_claim)
+        global last_ledger
+        last_ledger = signed
+        yield _sse("ledger", signed)
+
+        yield _sse("done", {
+            **results["verdict"],
+            "reasoning": results["reasoning"],
+            "provenance": results["provenance"],
+            "social_signals": results["social_signals"],
+            "ledger_status": signed,
+        })
+    finally:
+        # Client disconnected mid-stream: stop the remaining stages.
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/factcheck/stream")
+async def unified_factcheck_stream(
+    claim_text: str = Form(None),
+    claim_url: str = Form(None),
+    image: UploadFile = None
+):
+    """
+    Streaming variant of /factcheck (Server-Sent Events). Results arrive
+    stage by stage, so the first evidence shows up as soon as the fastest
+    source returns instead of after the whole pipeline.
+    """
+    main_claim = _main_claim(claim_text, claim_url, image)
+    return StreamingResponse(
+        _factcheck_events(main_claim),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/community/vote")
 async def community_vote(vote: dict):
     """
@@ -1,9 +1,13 @@
 from services.gemini_client import gemini_fact_check_prompt
-from modules.fact_check.retriever import retrieve_evidence
+from modules.fact_check.retriever import retrieve_evidence_detailed
+from services.singleflight import coalesced
+from services.request_context import memoized
 from core.logger import setup_logger
 
 logger = setup_logger()
 
+@memoized("fact_check_pipeline")
+@coalesced("fact_check_pipeline")
 async def fact_check_pipeline(claim: str) -> dict:
     """
     Main fact-check pipeline:
@@ -12,14 +16,15 @@ async def fact_check_pipeline(claim: str) -> dict:
     - Normalize + fallback confidence
     """
     try:
-        evidence = await retrieve_evidence(claim)
+        evidence, retrieval_timings = await retrieve_evidence_detailed(claim)
 
         if not evidence:
             return {
                 "verdict": "Unverified",
                 "confidence": 0,
                 "reasoning": "No evidence found.",
-                "relevant_sources": []
+                "relevant_sources": [],
+                "retrieval_timings": retrieval_timings
             }
 
         result = await gemini_fact_check_prompt(claim, evidence)
@@ -47,7 +52,8 @@ async def fact_check_pipeline(claim: str) -> dict:
             "verdict": result.get("verdict", "Unverified"),
             "confidence": confidence,
             "reasoning": result.get("reasoning", "No explanation available."),
-            "relevant_sources": result.get("relevant_sources", evidence)
+            "relevant_sources": result.get("relevant_sources", evidence),
+            "retrieval_timings": retrieval_timings
         }
 
     except Exception as e:
@@ -1,4 +1,5 @@
-import aiohttp
+from services.http_client import get_session
+from services.response_cache import cached_connector
 from core.config import settings
 from core.logger import setup_logger
 
@@ -6,6 +7,7 @@ logger = setup_logger()
 
 NEWS_API_URL = "https://newsapi.org/v2/everything"
 
+@cached_connector("news", ttl=30 * 60)
 async def fetch_news_articles(query: str, limit: int = 3):
     """
     Fetch recent news articles about the claim using NewsAPI.
@@ -23,13 +25,13 @@ async def fetch_news_articles(query: str, limit: int = 3):
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(NEWS_API_URL, params=params, timeout=10) as resp:
-                if resp.status != 200:
-                    logger.error(f"NewsAPI error {resp.status}")
-                    return []
-                data = await resp.json()
-                return data.get("articles", [])
+        session = get_session()
+        async with session.get(NEWS_API_URL, params=params, timeout=10) as resp:
+            if resp.status != 200:
+                logger.error(f"NewsAPI error {resp.status}")
+                return []
+            data = await resp.json()
+            return data.get("articles", [])
     except Exception as e:
         logger.error(f"[NewsAPI Fetch Error] {e}")
         return []
@@ -1,5 +1,6 @@
 import asyncpraw
 from core.config import settings
+from services.response_cache import cached_connector
 from core.logger import setup_logger
 
 logger = setup_logger()
@@ -11,6 +12,7 @@ reddit = asyncpraw.Reddit(
     user_agent=settings.reddit_user_agent,
 )
 
+@cached_connector("reddit", ttl=10 * 60)
 async def fetch_reddit_mentions(query: str, limit: int = 5):
     """
     Search Reddit for recent mentions of the claim.
@@ -1,5 +1,10 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timedelta
 from services.factcheck_client import fetch_factcheck_articles
-from services.vector_store import search_similar, add_document, save_index
+from services.vector_store import asearch_similar, asearch_similar_many
+from services.ingest_queue import evidence_queue
 from modules.fact_check.news_client import fetch_news_articles
 from modules.fact_check.wikipedia_client import fetch_wikipedia_snippets
 from modules.fact_check.reddit_client import fetch_reddit_mentions
@@ -8,130 +13,297 @@ from core.logger import setup_logger
 
 logger = setup_logger()
 
-async def retrieve_evidence(claim: str) -> list[str]:
+# ==============================
+# Retrieval Budget
+# ==============================
+# External sources run concurrently after the FAISS lookup; each gets its own
+# deadline and the whole retrieval is capped by the overall budget, so claim
+# latency is ~max(source), not sum.
+RETRIEVAL_BUDGET = float(os.getenv("RETRIEVAL_BUDGET_SECONDS", "8"))
+SOURCE_DEADLINES = {
+    "FAISS": float(os.getenv("RETRIEVAL_DEADLINE_FAISS", "2")),
+    "GoogleFactCheck": float(os.getenv("RETRIEVAL_DEADLINE_FACTCHECK", "6")),
+    "NewsAPI": float(os.getenv("RETRIEVAL_DEADLINE_NEWS", "5")),
+    "Wikipedia": float(os.getenv("RETRIEVAL_DEADLINE_WIKIPEDIA", "5")),
+    "Reddit": float(os.getenv("RETRIEVAL_DEADLINE_REDDIT", "5")),
+    "Social": float(os.getenv("RETRIEVAL_DEADLINE_SOCIAL", "5")),
+}
+MAX_EVIDENCE = 5
+
+# ==============================
+# Cache-First Policy
+# ==============================
+# When FAISS already holds enough close, fresh matches for the claim, external
+# sources are skipped (CACHE_FIRST_MODE=skip) or refreshed in the background
+# after answering from the cache (refresh). "off" always queries every source.
+CACHE_FIRST_MODE = os.getenv("CACHE_FIRST_MODE", "refresh")
+CACHE_FIRST_MIN_SCORE = float(os.getenv("CACHE_FIRST_MIN_SCORE", "0.9"))  # cosine similarity
+CACHE_FIRST_MIN_HITS = int(os.getenv("CACHE_FIRST_MIN_HITS", "2"))
+CACHE_FIRST_MAX_AGE_DAYS = float(os.getenv("CACHE_FIRST_MAX_AGE_DAYS", "30"))  # 0 = any age
+
+_refreshing: dict[str, asyncio.Task] = {}  # claim -> background refresh in flight
+
+
+def _cached_to_evidence(doc: dict) -> dict:
+    return {
+        "text": doc.get("text"),
+        "url": doc.get("url", "cache"),
+        "source": doc.get("source", "FAISS"),
+        "timestamp": doc.get("timestamp", None),
+        "score": doc.get("score"),
+    }
+
+
+async def search_cached_evidence_many(claims: list[str], top_k: int = 3) -> list[list[dict]]:
     """
-    Retrieve evidence for a claim using:
-    - FAISS cache
-    - FactCheck API
-    - NewsAPI
-    - Wikipedia
-    - Reddit mentions
-    - Social connectors (Twitter, YouTube, FB, IG)
-    - Deduplication & normalization
+    FAISS cache lookup for many claims at once (multi-claim requests and
+    offline re-verification jobs). One embedding pass + one index.search;
+    results come back per claim, in order.
     """
-    evidence_pool = []
+    if not claims:
+        return []
+    return [
+        [_cached_to_evidence(doc) for doc in hits]
+        for hits in await asearch_similar_many(claims, top_k=top_k)
+    ]
 
-    # 1. FAISS Cache
-    cached_results = search_similar(claim, top_k=3)
-    for doc in cached_results:
-        evidence_pool.append({
-            "text": doc.get("text"),
-            "url": doc.get("url", "cache"),
-            "source": doc.get("source", "FAISS"),
-            "timestamp": doc.get("timestamp", None)
-        })
-
-    # 2. FactCheck API
-    try:
-        api_results = await fetch_factcheck_articles(claim)
-        for article in api_results:
-            structured = {
-                "text": article.get("text", ""),
-                "url": article.get("url", ""),
-                "source": "GoogleFactCheck",
-                "timestamp": article.get("date", None)
-            }
-            if structured["text"]:
-                evidence_pool.append(structured)
-                add_document(structured["text"], url=structured["url"], source="GoogleFactCheck")
-    except Exception as e:
-        logger.error(f"FactCheck API error: {e}")
 
-    # 3. NewsAPI
-    try:
-        news_results = await fetch_news_articles(claim, limit=3)
-        for n in news_results:
-            structured = {
-                "text": f"{n.get('title', '')} - {n.get('description', '')}",
-                "url": n.get("url", ""),
-                "source": "NewsAPI",
-                "timestamp": n.get("publishedAt", None)
-            }
-            if structured["text"]:
-                evidence_pool.append(structured)
-                add_document(structured["text"], url=structured["url"], source="NewsAPI")
-    except Exception as e:
-        logger.error(f"NewsAPI fetch error: {e}")
+# ==============================
+# Evidence Sources
+# ==============================
+# Each returns structured evidence dicts; "ingest" marks items worth caching in FAISS.
 
-    # 4. Wikipedia
-    try:
-        wiki_results = await fetch_wikipedia_snippets(claim, limit=2)
-        for w in wiki_results:
-            structured = {
-                "text": w.get("snippet", ""),
-                "url": w.get("url", ""),
-                "source": "Wikipedia",
-                "timestamp": None
-            }
-            if structured["text"]:
-                evidence_pool.append(structured)
-                add_document(structured["text"], url=structured["url"], source="Wikipedia")
-    except Exception as e:
-        logger.error(f"Wikipedia fetch error: {e}")
+async def _from_cache(claim: str) -> list[dict]:
+    return [_cached_to_evidence(doc) for doc in await asearch_similar(claim, top_k=3)]
+
+
+async def _from_factcheck(claim: str) -> list[dict]:
+    return [
+        {
+            "text": article.get("text", ""),
+            "url": article.get("url", ""),
+            "source": "GoogleFactCheck",
+            "timestamp": article.get("date", None),
+            "ingest": True,
+        }
+        for article in await fetch_factcheck_articles(claim)
+    ]
+
+
+async def _from_news(claim: str) -> list[dict]:
+    return [
+        {
+            "text": f"{n.get('title', '')} - {n.get('description', '')}",
+            "url": n.get("url", ""),
+            "source": "NewsAPI",
+            "timestamp": n.get("publishedAt", None),
+            "ingest": True,
+        }
+        for n in await fetch_news_articles(claim, limit=3)
+    ]
 
-    # 5. Reddit
+
+async def _from_wikipedia(claim: str) -> list[dict]:
+    return [
+        {
+            "text": w.get("snippet", ""),
+            "url": w.get("url", ""),
+            "source": "Wikipedia",
+            "timestamp": None,
+            "ingest": True,
+        }
+        for w in await fetch_wikipedia_snippets(claim, limit=2)
+    ]
+
+
+async def _from_reddit(claim: str) -> list[dict]:
     try:
         reddit_results = await fetch_reddit_mentions(claim, limit=2)
-        if reddit_results:
-            for r in reddit_results:
-                structured = {
-                    "text": r.get("title", "") + " " + r.get("text", ""),
-                    "url": f"https://reddit.com/r/{r.get('subreddit', '')}",
-                    "source": "Reddit",
-                    "timestamp": r.get("created_utc", None)
-                }
-                if structured["text"]:
-                    evidence_pool.append(structured)
-                    add_document(structured["text"], url=structured["url"], source="Reddit")
-        else:
-            evidence_pool.append({"text": f"Mock Reddit discussion on {claim}", "url": "", "source": "Reddit", "timestamp": None})
     except Exception as e:
         logger.error(f"Reddit fetch error: {e}")
-        evidence_pool.append({"text": f"Mock Reddit fallback: {claim}", "url": "", "source": "Reddit", "timestamp": None})
+        return [{"text": f"Mock Reddit fallback: {claim}", "url": "", "source": "Reddit", "timestamp": None}]
+    if not reddit_results:
+        return [{"text": f"Mock Reddit discussion on {claim}", "url": "", "source": "Reddit", "timestamp": None}]
+    return [
+        {
+            "text": r.get("title", "") + " " + r.get("text", ""),
+            "url": f"https://reddit.com/r/{r.get('subreddit', '')}",
+            "source": "Reddit",
+            "timestamp": r.get("created_utc", None),
+            "ingest": True,
+        }
+        for r in reddit_results
+    ]
+
+
+async def _from_social(claim: str) -> list[dict]:
+    return [
+        {
+            "text": s.get("text", ""),
+            "url": s.get("url", ""),
+            "source": s.get("platform", "Social"),
+            "timestamp": s.get("timestamp", None),
+            # Mock placeholders echo the claim, so caching them would fake confident hits later.
+            "ingest": not s.get("mock") and bool(s.get("url")),
+        }
+        for s in await fetch_social_signals(claim, limit=2)
+    ]
+
 
-    # 6. Social signals
+# Merge (priority) order: evidence is ranked by source, never by arrival time.
+EVIDENCE_SOURCES = [
+    ("FAISS", _from_cache),
+    ("GoogleFactCheck", _from_factcheck),
+    ("NewsAPI", _from_news),
+    ("Wikipedia", _from_wikipedia),
+    ("Reddit", _from_reddit),
+    ("Social", _from_social),
+]
+
+
+async def _run_source(name: str, fetch, claim: str, timings: dict) -> list[dict]:
+    """Run one source under its deadline, recording status and latency."""
+    started = time.perf_counter()
+    status, items = "ok", []
+    try:
+        items = await asyncio.wait_for(fetch(claim), timeout=SOURCE_DEADLINES.get(name, RETRIEVAL_BUDGET))
+    except asyncio.TimeoutError:
+        status = "timeout"
+        logger.warning(f"{name} evidence source timed out.")
+    except asyncio.CancelledError:
+        status = "budget_exceeded"
+        raise
+    except Exception as e:
+        status = "error"
+        logger.error(f"{name} fetch error: {e}")
+    finally:
+        timings[name] = {
+            "status": status,
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+            "items": len(items),
+        }
+    return items
+
+
+async def _fan_out(claim: str, sources: list, timings: dict, budget: float) -> list[dict]:
+    """
+    Query `sources` concurrently within `budget` seconds; results merge in
+    the order of `sources`, whatever order they finished in.
+    """
+    tasks = [asyncio.create_task(_run_source(name, fetch, claim, timings)) for name, fetch in sources]
+    done, pending = await asyncio.wait(tasks, timeout=max(budget, 0))
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    evidence_pool = []
+    for task in tasks:
+        if task in done and not task.cancelled() and task.exception() is None:
+            evidence_pool.extend(ev for ev in task.result() if ev["text"])
+    return evidence_pool
+
+
+def _ingest(evidence_pool: list[dict]):
+    """Hand fresh evidence to the write-behind queue; FAISS inserts happen off the request path."""
+    fresh = [
+        {"text": ev["text"], "url": ev["url"], "source": ev["source"]}
+        for ev in evidence_pool if ev.get("ingest")
+    ]
+    if fresh:
+        evidence_queue.submit(fresh)
+
+
+def _confident_hits(cached: list[dict]) -> list[dict]:
+    """
+    Cached evidence that satisfies the cache-first policy (score and age).
+    Docs without a real source URL (mock placeholders stored by older
+    versions) never count: they echo the claim and would always match.
+    """
+    cutoff = None
+    if CACHE_FIRST_MAX_AGE_DAYS > 0:
+        cutoff = (datetime.utcnow() - timedelta(days=CACHE_FIRST_MAX_AGE_DAYS)).isoformat()
+    return [
+        ev for ev in cached
+        if ev.get("url") not in (None, "", "cache")
+        and (ev.get("score") or 0) >= CACHE_FIRST_MIN_SCORE
+        and (cutoff is None or (ev.get("timestamp") or "") >= cutoff)
+    ]
+
+
+async def _refresh(claim: str):
+    """Background refresh of external sources for a claim answered from the cache."""
     try:
-        social_results = await fetch_social_signals(claim, limit=2)
-        for s in social_results:
-            structured = {
-                "text": s.get("text", ""),
-                "url": s.get("url", ""),
-                "source": s.get("platform", "Social"),
-                "timestamp": s.get("timestamp", None)
-            }
-            if structured["text"]:
-                evidence_pool.append(structured)
-                add_document(structured["text"], url=structured["url"], source=structured["source"])
+        _ingest(await _fan_out(claim, EVIDENCE_SOURCES[1:], {}, RETRIEVAL_BUDGET))
     except Exception as e:
-        logger.error(f"Social signals fetch error: {e}")
+        logger.error(f"Background evidence refresh failed: {e}")
+    finally:
+        _refreshing.pop(claim, None)
+
+
+async def retrieve_evidence_detailed(claim: str) -> tuple[list[str], dict]:
+    """
+    Retrieve evidence for a claim: FAISS first, then every external source
+    concurrently unless the cache-first policy is satisfied.
+    Returns (evidence strings, timings) where timings holds per-source
+    status / latency plus the total, for latency dashboards.
+    """
+    started = time.perf_counter()
+    source_timings = {}
+    cache_name, cache_fetch = EVIDENCE_SOURCES[0]
+    external = EVIDENCE_SOURCES[1:]
 
-    # Save FAISS
-    save_index()
+    evidence_pool = [ev for ev in await _run_source(cache_name, cache_fetch, claim, source_timings) if ev["text"]]
+    answered_from_cache = (
+        CACHE_FIRST_MODE in ("skip", "refresh")
+        and len(_confident_hits(evidence_pool)) >= CACHE_FIRST_MIN_HITS
+    )
+
+    if answered_from_cache:
+        for name, _ in external:
+            source_timings[name] = {"status": "skipped", "ms": 0.0, "items": 0}
+        if CACHE_FIRST_MODE == "refresh" and claim not in _refreshing:
+            _refreshing[claim] = asyncio.create_task(_refresh(claim))
+    else:
+        budget = RETRIEVAL_BUDGET - (time.perf_counter() - started)
+        evidence_pool.extend(await _fan_out(claim, external, source_timings, budget))
+        _ingest(evidence_pool)
 
     # Deduplicate
     seen = set()
     merged = []
     for ev in evidence_pool:
         key = (ev["text"], ev["url"])
-        if key not in seen and ev["text"]:
+        if key not in seen:
             seen.add(key)
             merged.append(ev)
 
     # Normalize & limit
     final_evidence = [
         f"{ev['text']} (Source: {ev['url']})"
-        for ev in merged[:5]
+        for ev in merged[:MAX_EVIDENCE]
     ]
 
-    logger.info(f"Retrieved {len(final_evidence)} evidence items for claim.")
-    return final_evidence
+    timings = {
+        "sources": {name: source_timings.get(name) for name, _ in EVIDENCE_SOURCES},
+        "cache_first": answered_from_cache,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        "budget_ms": RETRIEVAL_BUDGET * 1000,
+    }
+    logger.info(f"Retrieved {len(final_evidence)} evidence items for claim in {timings['total_ms']} ms.")
+    return final_evidence, timings
+
+
+async def retrieve_evidence(claim: str) -> list[str]:
+    """
+    Retrieve evidence for a claim using:
+    - FAISS cache
+    - FactCheck API
+    - NewsAPI
+    - Wikipedia
+    - Reddit mentions
+    - Social connectors (Twitter, YouTube, FB, IG)
+    - Deduplication & normalization
+    """
+    evidence, _ = await retrieve_evidence_detailed(claim)
+    return evidence
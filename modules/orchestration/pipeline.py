@@ -7,11 +7,17 @@ from core.schemas import (
 from modules.fact_check.fact_check_logic import fact_check_pipeline
 from modules.reasoning.reasoning_logic import reasoning_pipeline
 from modules.provenance.provenance_logic import provenance_pipeline
+from services.singleflight import coalesced
 from core.logger import setup_logger
 
 logger = setup_logger()
 
 
+def _claim_key(claim: ClaimRequest):
+    return claim.claim_text or claim.claim_url or "Media File", {"media_file": claim.media_file}
+
+
+@coalesced("process_claim", key_fn=_claim_key)
 async def process_claim(claim: ClaimRequest) -> VerdictResponse:
     """
     Orchestrates Fact-Check Engine + Reasoning Engine + Provenance Engine.
@@ -141,6 +147,9 @@ async def process_claim(claim: ClaimRequest) -> VerdictResponse:
         emotion_score=None,
         provenance=provenance_result,   # raw dict for debug/logs
         trajectory=trajectory,
+
+        # Diagnostics
+        retrieval_timings=factcheck_result.get("retrieval_timings"),
     )
 
     return result
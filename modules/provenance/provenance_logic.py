@@ -1,8 +1,12 @@
 from modules.provenance.deepfake_detector import detect_deepfake
 from modules.provenance.metadata_validator import validate_metadata
 from modules.provenance.claim_journey import build_claim_journey
+from services.singleflight import coalesced
+from services.request_context import memoized
 
 
+@memoized("provenance_pipeline")
+@coalesced("provenance_pipeline")
 async def provenance_pipeline(claim_text: str, media_file: str = None) -> dict:
     """
     Provenance Engine:
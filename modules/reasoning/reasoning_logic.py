@@ -1,9 +1,13 @@
 from services.gemini_client import gemini_reasoning_prompt
 from modules.reasoning.fallacy_patterns import detect_patterns
+from services.singleflight import coalesced
+from services.request_context import memoized
 from core.logger import setup_logger
 
 logger = setup_logger()
 
+@memoized("reasoning_pipeline")
+@coalesced("reasoning_pipeline")
 async def reasoning_pipeline(claim: str) -> dict:
     """
     Advanced Reasoning Engine with Confidence Scoring:
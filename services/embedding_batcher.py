@@ -0,0 +1,115 @@
+import queue
+import threading
+import time
+import numpy as np
+from core.logger import setup_logger
+
+logger = setup_logger()
+
+
+class _PendingBatch:
+    """Texts submitted by one caller, plus a slot for its rows of the result."""
+
+    def __init__(self, texts: list[str]):
+        self.texts = texts
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class EmbeddingBatcher:
+    """
+    Cross-request embedding micro-batcher.
+
+    Callers on any thread submit texts via `embed()`. A single worker thread
+    gathers submissions for up to `max_wait_ms` (or until `max_batch_size`
+    texts are queued), runs one `encode_fn` call over all of them, and hands
+    each caller back its own rows.
+    """
+
+    def __init__(self, encode_fn, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self.batches_run = 0
+        self.texts_encoded = 0
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts, blocking until the batch containing them has run."""
+        pending = _PendingBatch(list(texts))
+        self._ensure_worker()
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> list[_PendingBatch]:
+        """Block for the first submission, then gather more until full or the wait expires."""
+        batch = [self._queue.get()]
+        count = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            count += len(item.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [t for pending in batch for t in pending.texts]
+            try:
+                vectors = np.asarray(self.encode_fn(texts, self.max_batch_size), dtype="float32")
+                self.batches_run += 1
+                self.texts_encoded += len(texts)
+                offset = 0
+                for pending in batch:
+                    pending.result = vectors[offset:offset + len(pending.texts)]
+                    offset += len(pending.texts)
+            except Exception as e:
+                logger.error(f"[EmbeddingBatcher] encode failed for {len(texts)} texts: {e}")
+                for pending in batch:
+                    pending.error = e
+            finally:
+                for pending in batch:
+                    pending.done.set()
+
+
+def benchmark_throughput(encode_fn, batch_sizes=(1, 8, 32, 128), n_texts: int = 512) -> dict:
+    """
+    Measure encode throughput (texts/sec) at each batch size.
+    Uses synthetic claim-like sentences so results are comparable between runs.
+    """
+    texts = [f"Claim number {i}: officials confirmed event {i % 17} happened in region {i % 5}." for i in range(n_texts)]
+    encode_fn(texts[:8], 8)  # warm-up
+    results = {}
+    for size in batch_sizes:
+        start = time.perf_counter()
+        for i in range(0, n_texts, size):
+            encode_fn(texts[i:i + size], size)
+        elapsed = time.perf_counter() - start
+        results[size] = round(n_texts / elapsed, 1)
+    return results
+
+
+if __name__ == "__main__":
+    from services.vector_store import _encode
+
+    for size, rate in benchmark_throughput(_encode).items():
+        print(f"batch_size={size:>4}  {rate:>8} texts/sec")
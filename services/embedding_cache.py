@@ -0,0 +1,138 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from core.logger import setup_logger
+
+logger = setup_logger()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache for one embedding model, keyed by `key(text)`:
+    SHA256 of the model name plus the exact text (cased models embed
+    "US" and "us" differently, so the lowercased dedup hash is not used).
+
+    - Memory tier: LRU of the most recently used vectors.
+    - Disk tier: fixed-capacity memory-mapped vector file plus a memory-mapped
+      key/sequence table. Slots are reused in FIFO order once full, so the
+      files never grow beyond `disk_capacity` rows. A slot's stored key is
+      re-checked on every read, since another process sharing the files
+      may have reused it.
+    """
+
+    _KEY_DTYPE = np.dtype([("key", "S32"), ("seq", "<i8")])
+
+    def __init__(self, directory: str, name: str, dimension: int,
+                 memory_size: int = 10_000, disk_capacity: int = 100_000):
+        self.name = name
+        self.dimension = dimension
+        self.memory_size = memory_size
+        self.disk_capacity = disk_capacity
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        self._vectors = None
+        self._keys = None
+        self._slots = {}  # key bytes -> slot
+        if disk_capacity > 0:
+            self._open_disk(os.path.join(directory, f"embedding_cache.{name}"))
+
+    def _open_disk(self, base_path: str):
+        vec_path, key_path = base_path + ".f32", base_path + ".keys"
+        try:
+            mode = "r+" if os.path.exists(vec_path) and os.path.exists(key_path) else "w+"
+            self._vectors = np.memmap(vec_path, dtype="float32", mode=mode, shape=(self.disk_capacity, self.dimension))
+            self._keys = np.memmap(key_path, dtype=self._KEY_DTYPE, mode=mode, shape=(self.disk_capacity,))
+        except (OSError, ValueError) as e:
+            # Size mismatch after a config change: start over with fresh files.
+            logger.warning(f"[EmbeddingCache] Recreating disk tier ({e})")
+            self._vectors = np.memmap(vec_path, dtype="float32", mode="w+", shape=(self.disk_capacity, self.dimension))
+            self._keys = np.memmap(key_path, dtype=self._KEY_DTYPE, mode="w+", shape=(self.disk_capacity,))
+
+        used = np.nonzero(self._keys["seq"] > 0)[0]
+        self._slots = {bytes(self._keys["key"][slot]): int(slot) for slot in used}
+        self._seq = int(self._keys["seq"].max()) if len(used) else 0
+        # Next slot to (over)write: first empty one, else the oldest.
+        self._next_slot = int(np.argmin(self._keys["seq"]))
+        logger.info(f"[EmbeddingCache] Disk tier opened with {len(self._slots)} cached vectors.")
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.name}\n{text}".encode("utf-8")).hexdigest()
+
+    def _read_slot(self, slot: int, raw_key: bytes) -> np.ndarray | None:
+        """The slot's vector if it still holds `raw_key`, checked before and after the copy."""
+        before = self._keys[slot].copy()
+        if before["seq"] <= 0 or bytes(before["key"]) != raw_key:
+            return None
+        vector = np.array(self._vectors[slot])
+        return vector if self._keys[slot] == before else None
+
+    def get(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return vector
+            raw_key = bytes.fromhex(key)
+            slot = self._slots.get(raw_key)
+            if slot is not None:
+                vector = self._read_slot(slot, raw_key)
+                if vector is not None:
+                    self._remember(key, vector)
+                    self.hits_disk += 1
+                    return vector
+                self._slots.pop(raw_key, None)  # overwritten elsewhere
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vector: np.ndarray):
+        with self._lock:
+            self._remember(key, vector)
+            if self._vectors is None:
+                return
+            raw_key = bytes.fromhex(key)
+            if raw_key in self._slots:
+                return
+            slot = self._next_slot
+            evicted = bytes(self._keys["key"][slot])
+            if self._keys["seq"][slot] > 0:
+                self._slots.pop(evicted, None)
+            self._seq += 1
+            self._keys["seq"][slot] = 0  # invalidate while the vector is being replaced
+            self._vectors[slot] = vector
+            self._keys[slot] = (raw_key, self._seq)
+            self._slots[raw_key] = slot
+            self._next_slot = (slot + 1) % self.disk_capacity
+
+    def _remember(self, key: str, vector: np.ndarray):
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def flush(self):
+        """Push dirty memory-mapped pages to disk."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._keys.flush()
+
+    def stats(self) -> dict:
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": round((self.hits_memory + self.hits_disk) / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._slots),
+            "disk_capacity": self.disk_capacity,
+        }
@@ -1,43 +1,63 @@
-import aiohttp
+import os
+from services.http_client import get_session
+from services.response_cache import cached_connector
 from core.config import settings
 from core.logger import setup_logger
 
 logger = setup_logger()
 
 FACTCHECK_API_URL = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+# Review language kept by fetch_factcheck_articles ("" = any). Filtered here rather
+# than sent as languageCode, so the shared search keeps the API's own defaults.
+FACTCHECK_LANGUAGE = os.getenv("FACTCHECK_LANGUAGE", "en")
 
-async def fetch_factcheck_articles(query: str, limit: int = 3):
+@cached_connector("factcheck", ttl=6 * 3600)
+async def search_factcheck_claims(query: str) -> list:
     """
-    Fetch fact-check articles from Google FactCheck Tools API.
-    Normalizes response into list of dicts.
+    One Google FactCheck Tools search, normalized into a list of dicts.
+    Shared by the retriever and /api/factcheck, so a request that needs
+    both views of the same claim makes a single API call. Sends only the
+    query and key, as /api/factcheck always has; each view narrows the
+    results itself.
     """
     params = {
         "query": query,
-        "key": settings.factcheck_api_key,
-        "pageSize": limit,
-        "languageCode": "en"
+        "key": settings.factcheck_api_key
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(FACTCHECK_API_URL, params=params, timeout=10) as resp:
-                if resp.status != 200:
-                    logger.error(f"[FactCheck API] HTTP {resp.status}")
-                    return []
-
-                data = await resp.json()
-                claims = data.get("claims", [])
-                results = []
-
-                for c in claims:
-                    review = c.get("claimReview", [{}])[0]
-                    results.append({
-                        "text": c.get("text", ""),
-                        "url": review.get("url", ""),
-                        "publisher": review.get("publisher", {}).get("name", ""),
-                        "date": review.get("reviewDate", "")
-                    })
-                return results
+        session = get_session()
+        async with session.get(FACTCHECK_API_URL, params=params, timeout=10) as resp:
+            if resp.status != 200:
+                logger.error(f"[FactCheck API] HTTP {resp.status}")
+                return []
+
+            data = await resp.json()
+            claims = data.get("claims", [])
+            results = []
+
+            for c in claims:
+                review = c.get("claimReview", [{}])[0]
+                results.append({
+                    "text": c.get("text", ""),
+                    "url": review.get("url", ""),
+                    "publisher": review.get("publisher", {}).get("name", ""),
+                    "date": review.get("reviewDate", ""),
+                    "language": review.get("languageCode", "")
+                })
+            return results
     except Exception as e:
         logger.error(f"[FactCheck API Error] {e}")
         return []
+
+
+async def fetch_factcheck_articles(query: str, limit: int = 3):
+    """
+    Fetch fact-check articles from Google FactCheck Tools API.
+    Normalizes response into list of dicts, keeping reviews in
+    FACTCHECK_LANGUAGE (or of unknown language).
+    """
+    articles = await search_factcheck_claims(query)
+    if FACTCHECK_LANGUAGE:
+        articles = [a for a in articles if a["language"] in ("", FACTCHECK_LANGUAGE)]
+    return articles[:limit]
@@ -1,14 +1,54 @@
 import google.generativeai as genai
+import os
 import json
 import re
+import time
+import heapq
+import random
 import asyncio
+import itertools
+import aiohttp
+from contextlib import contextmanager
+from contextvars import ContextVar
 from core.config import settings
 from core.logger import setup_logger
+from services.http_client import get_session
+from services.llm_cache import llm_cache
+from services.request_context import memoized
 
 logger = setup_logger()
 
 # Configure Gemini
 genai.configure(api_key=settings.gemini_api_key)
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-pro")
+# separate: one round trip each for fact-check and reasoning; combined: one round trip for both
+GEMINI_PROMPT_MODE = os.getenv("GEMINI_PROMPT_MODE", "separate")
+
+VERDICTS = ("True", "False", "Misleading", "Unverified")
+FACT_CHECK_FIELDS = ("verdict", "confidence", "reasoning", "relevant_sources")
+REASONING_FIELDS = ("fallacy", "bias", "debiased_text", "generative_explainer")
+# Keys an answer must carry to count as parsed (and be cached); anything less is retried.
+FACT_CHECK_REQUIRED = ("verdict",)
+REASONING_REQUIRED = ("fallacy", "bias")
+
+# ==============================
+# Gateway Config
+# ==============================
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "60"))  # requests per minute
+GEMINI_TPM = float(os.getenv("GEMINI_TPM", "250000"))  # tokens per minute (prompt + output)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "1"))  # seconds
+GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "30"))
+GEMINI_QUEUE_TIMEOUT = float(os.getenv("GEMINI_QUEUE_TIMEOUT", "60"))  # max wait for a slot before giving up
+GEMINI_OUTPUT_TOKENS = int(os.getenv("GEMINI_OUTPUT_TOKENS", "1024"))  # budgeted per call until usage is known
+# REST endpoint (e.g. http://127.0.0.1:8085 for a local fake server); empty uses the SDK transport
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "").rstrip("/")
+
+# Lower value is served first.
+PRIORITIES = {"interactive": 0, "bulk": 1}
+# google.api_core exceptions worth retrying when they carry no HTTP code.
+_TRANSIENT_SDK_ERRORS = ("ServiceUnavailable", "InternalServerError", "DeadlineExceeded", "GatewayTimeout")
 
 
 # ------------------------------
@@ -24,15 +64,343 @@ def clean_json_output(text: str) -> str:
     return text.strip()
 
 
+def require_fields(parsed, fields) -> dict:
+    """Raise ValueError unless `parsed` is a JSON object carrying every key in `fields`."""
+    if not isinstance(parsed, dict):
+        raise ValueError("Gemini response is not a JSON object")
+    missing = [field for field in fields if field not in parsed]
+    if missing:
+        raise ValueError(f"Gemini response is missing {missing}")
+    return parsed
+
+
+def _parse_required(text: str, fields) -> dict:
+    """JSON object from a raw answer, carrying `fields`; ValueError (incl. JSONDecodeError) otherwise."""
+    return require_fields(json.loads(clean_json_output(text)), fields)
+
+
+def _parse_fact_check(text: str, evidence: list[str]) -> dict:
+    parsed = _parse_required(text, FACT_CHECK_REQUIRED)
+    try:
+        parsed["confidence"] = min(100, max(0, int(parsed.get("confidence", 0))))
+    except TypeError as e:
+        raise ValueError(f"Invalid confidence: {e}")
+    if not parsed.get("relevant_sources"):
+        parsed["relevant_sources"] = evidence or []
+    return parsed
+
+
+def _parse_reasoning(text: str, claim: str) -> dict:
+    parsed = _parse_required(text, REASONING_REQUIRED)
+    parsed.setdefault("debiased_text", claim)
+    parsed.setdefault("generative_explainer", "")
+    return parsed
+
+
+# ==============================
+# LLM Gateway
+# ==============================
+class LLMGatewayError(Exception):
+    """Gemini could not be reached within the retry / queueing budget."""
+
+
+class TransientError(Exception):
+    """A 5xx, timeout or dropped connection: worth retrying after a backoff."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitedError(TransientError):
+    """HTTP 429 / quota exhausted: retried, and pauses admission for everyone."""
+
+
+_priority: ContextVar[str] = ContextVar("llm_priority", default="interactive")
+
+
+@contextmanager
+def llm_priority(name: str):
+    """
+    Run Gemini calls made inside this block in priority class `name`.
+    Opt-in: request handlers stay "interactive"; offline jobs that call
+    the prompts in a loop should wrap themselves in `llm_priority("bulk")`.
+    """
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority: {name}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _parse_retry_after(value) -> float | None:
+    """Seconds from a Retry-After header, or from "retry in 12.5s" style error text."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        match = re.search(r"retry(?:_delay)?[^0-9]{0,20}([0-9.]+)\s*s", str(value), flags=re.IGNORECASE)
+        return float(match.group(1)) if match else None
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute, holding at most one minute's worth."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)  # oversized calls wait for a full bucket, not forever
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        """Take (or, with a negative amount, return) units; the level may go negative as debt."""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+
+class LLMGateway:
+    """
+    Admission control in front of Gemini.
+
+    Each call waits for a concurrency slot plus room in the requests- and
+    tokens-per-minute buckets; waiters are served by priority class, then
+    FIFO. Token use is budgeted from the prompt size and corrected from the
+    reported usage afterwards. Rate-limit and transient errors are retried
+    with jittered exponential backoff, honouring Retry-After, and a 429
+    pauses admission for everyone instead of letting each caller retry
+    into the overload.
+    """
+
+    def __init__(self, rpm: float, tpm: float, max_concurrency: int, max_retries: int = 3,
+                 backoff_base: float = 1, backoff_max: float = 30, queue_timeout: float = 60,
+                 api_base: str = ""):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.queue_timeout = queue_timeout
+        self.api_base = api_base
+        self._waiters: list = []  # heap of (priority, seq, future, tokens)
+        self._seq = itertools.count()
+        self._active = 0
+        self._paused_until = 0.0
+        self._timer = None
+        self.counters = {"calls": 0, "succeeded": 0, "failed": 0, "retries": 0, "rate_limited": 0,
+                         "malformed": 0, "queue_timeouts": 0, "tokens_used": 0}
+
+    # ---- admission ----
+    def _wake_in(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _dispatch(self):
+        self._timer = None
+        while self._waiters and self._active < self.max_concurrency:
+            priority, seq, future, tokens = self._waiters[0]
+            if future.done():  # timed out or cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            wait = max(self._paused_until - time.monotonic(), self.requests.wait_time(1),
+                       self.tokens.wait_time(tokens))
+            if wait > 0:
+                # Head of line waits; lower priorities queue behind it.
+                self._wake_in(wait)
+                return
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self._active += 1
+            future.set_result(None)
+
+    async def _acquire(self, priority: str, tokens: int):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITIES[priority], next(self._seq), future, tokens))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.counters["queue_timeouts"] += 1
+            raise LLMGatewayError(f"No Gemini slot within {self.queue_timeout}s")
+        except BaseException:
+            if future.done() and not future.cancelled():
+                self._release(tokens, tokens)  # granted just as the caller went away
+            raise
+
+    def _release(self, budgeted: int, used: int):
+        self._active -= 1
+        self.tokens.take(used - budgeted)
+        if self._waiters:
+            self._dispatch()
+
+    def _backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))  # full jitter
+
+    # ---- transports ----
+    async def _send_sdk(self, prompt: str) -> tuple[str, int | None]:
+        model = genai.GenerativeModel(GEMINI_MODEL)
+        try:
+            response = await model.generate_content_async(prompt)
+        except asyncio.TimeoutError as e:
+            raise TransientError(f"Timed out: {e}")
+        except Exception as e:
+            code = getattr(e, "code", None)
+            if code == 429 or type(e).__name__ == "ResourceExhausted":
+                raise RateLimitedError(str(e), _parse_retry_after(str(e)))
+            if (isinstance(code, int) and code >= 500) or type(e).__name__ in _TRANSIENT_SDK_ERRORS:
+                raise TransientError(str(e), _parse_retry_after(str(e)))
+            raise
+        usage = getattr(response, "usage_metadata", None)
+        return response.candidates[0].content.parts[0].text, getattr(usage, "total_token_count", None)
+
+    async def _send_rest(self, prompt: str) -> tuple[str, int | None]:
+        url = f"{self.api_base}/v1beta/models/{GEMINI_MODEL}:generateContent"
+        body = {"contents": [{"parts": [{"text": prompt}]}]}
+        try:
+            async with get_session().post(url, params={"key": settings.gemini_api_key}, json=body) as resp:
+                retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+                if resp.status == 429:
+                    raise RateLimitedError(f"HTTP {resp.status}", retry_after)
+                if resp.status >= 500:
+                    raise TransientError(f"HTTP {resp.status}", retry_after)
+                resp.raise_for_status()
+                data = await resp.json()
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+            raise TransientError(f"{type(e).__name__}: {e}")
+        usage = data.get("usageMetadata") or {}
+        return data["candidates"][0]["content"]["parts"][0]["text"], usage.get("totalTokenCount")
+
+    # ---- public ----
+    async def generate(self, prompt: str, priority: str | None = None, parse=None):
+        """
+        Text of Gemini's answer to `prompt`, or `parse(text)` when a parser
+        is given. Only rate limits and transient errors are retried; anything
+        else (auth, invalid argument, blocked answer) fails at once. A
+        malformed answer (`parse` raising ValueError) is re-asked once,
+        within the same `max_retries` budget, so a prompt never costs more
+        than `max_retries` upstream calls. Raises LLMGatewayError on every
+        failure.
+        """
+        priority = priority or _priority.get()
+        budgeted = len(prompt) // 4 + GEMINI_OUTPUT_TOKENS
+        send = self._send_rest if self.api_base else self._send_sdk
+        self.counters["calls"] += 1
+        error = None
+        reasked = False
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await self._acquire(priority, budgeted)
+            except LLMGatewayError:
+                self.counters["failed"] += 1
+                raise
+            used = budgeted
+            retry_after = None
+            answered = False
+            try:
+                text, reported = await send(prompt)
+                answered = True
+                used = reported or budgeted
+                self.counters["tokens_used"] += used
+            except RateLimitedError as e:
+                self.counters["rate_limited"] += 1
+                error, retry_after = e, e.retry_after
+                # Stop admitting anyone until the provider says we may continue.
+                pause = retry_after if retry_after is not None else self._backoff(attempt)
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            except TransientError as e:
+                error, retry_after = e, e.retry_after
+            except Exception as e:
+                self.counters["failed"] += 1
+                raise LLMGatewayError(f"Gemini call rejected: {type(e).__name__}: {e}") from e
+            finally:
+                self._release(budgeted, used)
+
+            if answered:
+                text = (text or "").strip()
+                if parse is None:
+                    self.counters["succeeded"] += 1
+                    return text
+                try:
+                    result = parse(text)
+                except ValueError as e:
+                    self.counters["malformed"] += 1
+                    if reasked or attempt >= self.max_retries:
+                        self.counters["failed"] += 1
+                        raise LLMGatewayError(f"Malformed Gemini answer: {e}") from e
+                    reasked = True
+                    logger.warning(f"[Gemini] Malformed answer ({e}); asking once more.")
+                    continue
+                self.counters["succeeded"] += 1
+                return result
+
+            if attempt < self.max_retries:
+                self.counters["retries"] += 1
+                delay = self._backoff(attempt, retry_after)
+                logger.warning(f"[Gemini] Call failed ({error}); retry {attempt} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        self.counters["failed"] += 1
+        raise LLMGatewayError(f"Gemini call failed after {self.max_retries} attempts: {error}")
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "active": self._active,
+            "queued": sum(1 for _, _, future, _ in self._waiters if not future.done()),
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 2),
+            "requests_available": round(self.requests.level, 1),
+            "tokens_available": round(self.tokens.level),
+            "transport": "rest" if self.api_base else "sdk",
+        }
+
+
+gateway = LLMGateway(
+    rpm=GEMINI_RPM,
+    tpm=GEMINI_TPM,
+    max_concurrency=GEMINI_MAX_CONCURRENCY,
+    max_retries=GEMINI_MAX_RETRIES,
+    backoff_base=GEMINI_BACKOFF_BASE,
+    backoff_max=GEMINI_BACKOFF_MAX,
+    queue_timeout=GEMINI_QUEUE_TIMEOUT,
+    api_base=GEMINI_API_BASE,
+)
+
+
 # ------------------------------
 # Gemini Fact-Check Prompt
 # ------------------------------
-async def gemini_fact_check_prompt(claim: str, evidence: list[str]) -> dict:
+@memoized("gemini_fact_check")
+async def gemini_fact_check_prompt(claim: str, evidence: list[str], cache_mode: str = None) -> dict:
     """
     Calls Gemini 2.5 Pro API with claim + retrieved evidence.
     Returns structured JSON verdict with retries and validation.
+    Successful answers are cached per prompt; `cache_mode` (use | refresh | bypass)
+    overrides LLM_CACHE_MODE for this call.
+    With GEMINI_PROMPT_MODE=combined the answer comes from the combined prompt.
     """
-    model = genai.GenerativeModel("gemini-2.5-pro")
+    if GEMINI_PROMPT_MODE == "combined":
+        combined = await _combined_answer(claim, evidence, cache_mode)
+        if combined is None:
+            return _combined_fallback(claim, evidence, FACT_CHECK_FIELDS)
+        # The reasoning half is answered too: gemini_reasoning_prompt(claim) later in this request reuses it.
+        gemini_reasoning_prompt.prime({field: combined[field] for field in REASONING_FIELDS}, claim)
+        return {field: combined[field] for field in FACT_CHECK_FIELDS}
 
     prompt = f"""
     You are a strict JSON generator.
@@ -49,31 +417,20 @@ async def gemini_fact_check_prompt(claim: str, evidence: list[str]) -> dict:
     Evidence: {evidence}
     """
 
-    retries = 3
-    for attempt in range(1, retries + 1):
-        try:
-            response = await model.generate_content_async(prompt)
-            text_output = response.candidates[0].content.parts[0].text.strip()
-            text_output = clean_json_output(text_output)
-
-            parsed = json.loads(text_output)
-
-            # Normalize confidence
-            parsed["confidence"] = min(100, max(0, int(parsed.get("confidence", 0))))
-
-            # Guarantee sources
-            if not parsed.get("relevant_sources"):
-                parsed["relevant_sources"] = evidence or []
+    cached = await llm_cache.get(GEMINI_MODEL, prompt, cache_mode)
+    if cached is not None:
+        logger.info("[Gemini] Fact-check served from cache.")
+        return cached
 
-            logger.info(f"[Gemini] Fact-check JSON parsed successfully (attempt {attempt}).")
-            return parsed
-
-        except json.JSONDecodeError as je:
-            logger.warning(f"[Gemini] JSON parsing failed (attempt {attempt}): {je}")
-        except Exception as e:
-            logger.error(f"[Gemini] Fact-check API error (attempt {attempt}): {e}")
-
-        await asyncio.sleep(2**attempt)  # exponential backoff
+    try:
+        parsed = await gateway.generate(prompt, parse=lambda text: _parse_fact_check(text, evidence))
+    except LLMGatewayError as e:
+        # Transport retries, backoff and the one re-ask of a malformed answer happened in the gateway.
+        logger.error(f"[Gemini] Fact-check failed: {e}")
+    else:
+        logger.info("[Gemini] Fact-check JSON parsed successfully.")
+        await llm_cache.put(GEMINI_MODEL, prompt, parsed, cache_mode)
+        return parsed
 
     # Final fallback
     return {
@@ -87,14 +444,13 @@ async def gemini_fact_check_prompt(claim: str, evidence: list[str]) -> dict:
 # ------------------------------
 # Gemini Reasoning Prompt
 # ------------------------------
-async def gemini_reasoning_prompt(claim: str) -> dict:
+@memoized("gemini_reasoning")
+async def gemini_reasoning_prompt(claim: str, cache_mode: str = None) -> dict:
     """
     Uses Gemini 2.5 Pro to detect logical fallacies, biases,
     and generate a debiased version of the claim.
-    Returns structured JSON with retries and validation.
+    Returns structured JSON with retries and validation (cached like the fact-check prompt).
     """
-    model = genai.GenerativeModel("gemini-2.5-pro")
-
     prompt = f"""
     Analyze the following claim for logical fallacies and biases.
     Respond ONLY in valid JSON strictly matching this schema:
@@ -108,35 +464,201 @@ async def gemini_reasoning_prompt(claim: str) -> dict:
     Claim: {claim}
     """
 
-    retries = 3
-    for attempt in range(1, retries + 1):
-        try:
-            response = await model.generate_content_async(prompt)
-            text_output = response.candidates[0].content.parts[0].text.strip()
-            text_output = clean_json_output(text_output)
+    cached = await llm_cache.get(GEMINI_MODEL, prompt, cache_mode)
+    if cached is not None:
+        logger.info("[Gemini] Reasoning served from cache.")
+        return cached
 
-            parsed = json.loads(text_output)
+    try:
+        parsed = await gateway.generate(prompt, parse=lambda text: _parse_reasoning(text, claim))
+    except LLMGatewayError as e:
+        logger.error(f"[Gemini] Reasoning failed: {e}")
+    else:
+        logger.info("[Gemini] Reasoning JSON parsed successfully.")
+        await llm_cache.put(GEMINI_MODEL, prompt, parsed, cache_mode)
+        return parsed
 
-            # Ensure all keys exist
-            parsed.setdefault("fallacy", [])
-            parsed.setdefault("bias", [])
-            parsed.setdefault("debiased_text", claim)
-            parsed.setdefault("generative_explainer", "")
+    # Final fallback
+    return {
+        "fallacy": [],
+        "bias": [],
+        "debiased_text": claim,
+        "generative_explainer": "No explanation generated due to API failure.",
+    }
 
-            logger.info(f"[Gemini] Reasoning JSON parsed successfully (attempt {attempt}).")
-            return parsed
 
-        except json.JSONDecodeError as je:
-            logger.warning(f"[Gemini] Reasoning JSON parsing failed (attempt {attempt}): {je}")
-        except Exception as e:
-            logger.error(f"[Gemini] Reasoning API error (attempt {attempt}): {e}")
+# ------------------------------
+# Gemini Combined Prompt
+# ------------------------------
+def _validate_combined(parsed: dict, claim: str, evidence: list[str]) -> tuple[dict, list[str]]:
+    """Check each field of a combined answer; returns the result and the fields that fell back to defaults."""
+    if not isinstance(parsed, dict):
+        raise ValueError("Combined response is not a JSON object")
 
-        await asyncio.sleep(2**attempt)
+    result, defaulted = {}, []
 
-    # Final fallback
-    return {
+    def take(field: str, value, valid: bool, default):
+        result[field] = value if valid else default
+        if not valid:
+            defaulted.append(field)
+
+    def is_strings(value) -> bool:
+        return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+    verdict = str(parsed.get("verdict", "")).strip().capitalize()
+    take("verdict", verdict, verdict in VERDICTS, "Unverified")
+
+    try:
+        take("confidence", min(100, max(0, int(parsed["confidence"]))), True, 0)
+    except (KeyError, TypeError, ValueError):
+        take("confidence", None, False, 0)
+
+    sources = parsed.get("relevant_sources")
+    take("relevant_sources", sources or evidence or [], is_strings(sources), evidence or [])
+
+    for field in ("fallacy", "bias"):
+        take(field, parsed.get(field), is_strings(parsed.get(field)), [])
+
+    for field, default in (("reasoning", ""), ("debiased_text", claim), ("generative_explainer", "")):
+        value = parsed.get(field)
+        take(field, value or default, isinstance(value, str), default)
+
+    return result, defaulted
+
+
+def _combined_fallback(claim: str, evidence: list[str], fields=FACT_CHECK_FIELDS + REASONING_FIELDS) -> dict:
+    fallback = {
+        "verdict": "Unverified",
+        "confidence": 0,
+        "reasoning": "Gemini API failed to return valid JSON.",
+        "relevant_sources": evidence or [],
         "fallacy": [],
         "bias": [],
         "debiased_text": claim,
         "generative_explainer": "No explanation generated due to API failure.",
-    }
\ No newline at end of file
+    }
+    return {field: fallback[field] for field in fields}
+
+
+async def _combined_answer(claim: str, evidence: list[str], cache_mode: str = None) -> dict | None:
+    """One Gemini round trip for verdict and reasoning. None when every attempt failed."""
+    prompt = f"""
+    You are a strict JSON generator.
+    Evaluate the claim below using the provided evidence, and analyze it
+    for logical fallacies and biases.
+    Respond ONLY with valid JSON strictly matching this schema:
+    {{
+      "verdict": "True | False | Misleading | Unverified",
+      "confidence": number (0-100),
+      "reasoning": "string",
+      "relevant_sources": ["list", "of", "strings"],
+      "fallacy": ["list of fallacies or []"],
+      "bias": ["list of biases or []"],
+      "debiased_text": "neutral rewritten version of the claim",
+      "generative_explainer": "a short explanation in plain language"
+    }}
+
+    Claim: {claim}
+    Evidence: {evidence}
+    """
+
+    cached = await llm_cache.get(GEMINI_MODEL, prompt, cache_mode)
+    if cached is not None:
+        logger.info("[Gemini] Combined answer served from cache.")
+        return cached
+
+    try:
+        result, defaulted = await gateway.generate(
+            prompt, parse=lambda text: _validate_combined(_parse_required(text, FACT_CHECK_REQUIRED), claim, evidence)
+        )
+    except LLMGatewayError as e:
+        logger.error(f"[Gemini] Combined answer failed: {e}")
+        return None
+
+    if defaulted:
+        # Usable, but partly defaults: return it without caching.
+        logger.warning(f"[Gemini] Combined JSON missing/invalid fields {defaulted}.")
+    else:
+        logger.info("[Gemini] Combined JSON parsed successfully.")
+        await llm_cache.put(GEMINI_MODEL, prompt, result, cache_mode)
+    return result
+
+
+@memoized("gemini_combined")
+async def gemini_combined_prompt(claim: str, evidence: list[str], cache_mode: str = None) -> dict:
+    """
+    Fact-check and reasoning in a single Gemini call: verdict, confidence,
+    reasoning, relevant_sources, fallacy, bias, debiased_text and
+    generative_explainer. Fields missing from a partial answer get their
+    defaults; if every attempt fails, the whole answer is the fallback.
+    """
+    combined = await _combined_answer(claim, evidence, cache_mode)
+    return combined if combined is not None else _combined_fallback(claim, evidence)
+
+
+# ==============================
+# Fake Gemini Server (load tests)
+# ==============================
+def fake_gemini_app(rate_limit_every: int = 0, retry_after: float = 1.0, latency_ms: float = 0,
+                    text: str = '{"verdict": "Unverified", "confidence": 0}'):
+    """
+    aiohttp app mimicking the generateContent REST endpoint: every call is
+    delayed by `latency_ms`, and every `rate_limit_every`-th call gets a
+    429 with a Retry-After header. Point a gateway's `api_base` at it.
+    """
+    from aiohttp import web
+
+    calls = itertools.count(1)
+
+    async def generate(request):
+        await request.json()
+        await asyncio.sleep(latency_ms / 1000)
+        if rate_limit_every and next(calls) % rate_limit_every == 0:
+            return web.json_response({"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}, status=429,
+                                     headers={"Retry-After": str(retry_after)})
+        return web.json_response({
+            "candidates": [{"content": {"parts": [{"text": text}]}}],
+            "usageMetadata": {"totalTokenCount": 200},
+        })
+
+    app = web.Application()
+    app.router.add_post("/v1beta/models/{model}:generateContent", generate)
+    return app
+
+
+async def benchmark_gateway(n_calls: int = 60, rate_limit_every: int = 7, latency_ms: float = 200,
+                            max_concurrency: int = 4) -> dict:
+    """
+    Mixed interactive / bulk load against the fake server through a
+    dedicated gateway: per-priority mean latency plus gateway counters.
+    """
+    from aiohttp import web
+
+    runner = web.AppRunner(fake_gemini_app(rate_limit_every, retry_after=0.5, latency_ms=latency_ms))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    bench = LLMGateway(rpm=6000, tpm=10_000_000, max_concurrency=max_concurrency, max_retries=5,
+                       backoff_base=0.2, api_base=f"http://127.0.0.1:{port}")
+
+    latencies = {name: [] for name in PRIORITIES}
+
+    async def one(i: int):
+        priority = "bulk" if i % 2 else "interactive"
+        started = time.perf_counter()
+        await bench.generate(f"claim {i}", priority=priority)
+        latencies[priority].append(time.perf_counter() - started)
+
+    try:
+        await asyncio.gather(*(one(i) for i in range(n_calls)))
+    finally:
+        await runner.cleanup()
+    return {
+        **{f"{name}_mean_ms": round(1000 * sum(values) / len(values), 1) for name, values in latencies.items()},
+        "gateway": bench.stats(),
+    }
+
+
+if __name__ == "__main__":
+    print(asyncio.run(benchmark_gateway()))
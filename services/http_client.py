@@ -0,0 +1,115 @@
+import os
+import time
+import asyncio
+import aiohttp
+from core.logger import setup_logger
+
+logger = setup_logger()
+
+# ==============================
+# Connection Pool Config
+# ==============================
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+
+_session: aiohttp.ClientSession | None = None
+_session_loop = None
+
+
+def _new_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        use_dns_cache=True,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Application-scoped session shared by every outbound connector, so
+    DNS, TCP and TLS setup are paid once per host instead of once per call.
+    Opened on FastAPI startup; created lazily for scripts that run their
+    own event loop.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        # A session is bound to the loop it was created in.
+        _session = _new_session()
+        _session_loop = loop
+    return _session
+
+
+async def open_session():
+    get_session()
+    logger.info("Shared HTTP client ready.")
+
+
+async def close_session():
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+# ==============================
+# Benchmark
+# ==============================
+async def benchmark_requests_per_second(n_requests: int = 2000, concurrency: int = 50) -> dict:
+    """
+    Requests/sec against a local aiohttp stub server: a new ClientSession
+    per call (the old connector pattern) vs the shared pooled session.
+    """
+    from aiohttp import web
+
+    async def handler(request):
+        return web.json_response({"claims": []})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/"
+
+    async def per_call():
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as resp:
+                await resp.json()
+
+    async def pooled():
+        async with get_session().get(url) as resp:
+            await resp.json()
+
+    async def run(fetch) -> float:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                await fetch()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n_requests)))
+        return n_requests / (time.perf_counter() - started)
+
+    results = {}
+    try:
+        results["session_per_call_rps"] = round(await run(per_call), 1)
+        results["shared_session_rps"] = round(await run(pooled), 1)
+    finally:
+        await close_session()
+        await runner.cleanup()
+    return results
+
+
+if __name__ == "__main__":
+    print(asyncio.run(benchmark_requests_per_second()))
@@ -0,0 +1,148 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from core.logger import setup_logger
+from services import vector_store
+
+logger = setup_logger()
+
+# ==============================
+# Config
+# ==============================
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "10000"))
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "64"))
+INGEST_MAX_WAIT_MS = float(os.getenv("INGEST_MAX_WAIT_MS", "200"))
+# drop_newest: reject new docs while full; drop_oldest: evict the oldest pending doc
+INGEST_BACKPRESSURE = os.getenv("INGEST_BACKPRESSURE", "drop_newest")
+
+BACKPRESSURE_POLICIES = ("drop_newest", "drop_oldest")
+
+
+class IngestQueue:
+    """
+    Bounded write-behind queue in front of vector_store.add_bulk.
+
+    Request handlers `submit` documents and return immediately; one worker
+    thread drains the queue in batches (up to `batch_size` docs, waiting at
+    most `max_wait_ms` for a batch to fill), so embedding and insertion run
+    batched and off the request path. Documents already pending (same
+    `key_fn`) are coalesced. When full, the backpressure policy decides
+    which document is dropped.
+    """
+
+    def __init__(self, ingest_fn, key_fn, max_size: int = 10000, batch_size: int = 64,
+                 max_wait_ms: float = 200, policy: str = "drop_newest"):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.ingest_fn = ingest_fn
+        self.key_fn = key_fn
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.policy = policy
+        self._pending: OrderedDict[str, tuple[dict, float]] = OrderedDict()  # key -> (doc, enqueued_at)
+        self._in_flight = 0
+        self._flushing = False
+        self._cond = threading.Condition()
+        self._worker = None
+        self.counters = {"enqueued": 0, "coalesced": 0, "dropped": 0, "ingested": 0, "failed": 0, "batches": 0}
+        self.last_batch_lag_ms = 0.0  # enqueue -> insert, for the oldest doc of the last batch
+
+    def submit(self, docs: list[dict]) -> int:
+        """Queue docs for ingestion without blocking. Returns how many were accepted."""
+        accepted = 0
+        with self._cond:
+            now = time.monotonic()
+            for doc in docs:
+                key = self.key_fn(doc["text"])
+                if key in self._pending:
+                    self.counters["coalesced"] += 1
+                    continue
+                if len(self._pending) >= self.max_size:
+                    self.counters["dropped"] += 1
+                    if self.policy == "drop_newest":
+                        continue
+                    self._pending.popitem(last=False)
+                self._pending[key] = (doc, now)
+                accepted += 1
+            self.counters["enqueued"] += accepted
+            if accepted:
+                self._ensure_worker()
+                self._cond.notify_all()
+        return accepted
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="evidence-ingest", daemon=True)
+            self._worker.start()
+
+    def _next_batch(self) -> list[tuple[dict, float]]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.batch_size and not self._flushing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = [self._pending.popitem(last=False)[1] for _ in range(min(self.batch_size, len(self._pending)))]
+            self._in_flight = len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self.ingest_fn([doc for doc, _ in batch])
+                self.counters["ingested"] += len(batch)
+            except Exception as e:
+                self.counters["failed"] += len(batch)
+                logger.error(f"[IngestQueue] Batch of {len(batch)} docs failed: {e}")
+            self.counters["batches"] += 1
+            self.last_batch_lag_ms = round((time.monotonic() - batch[0][1]) * 1000, 1)
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def flush(self, timeout: float = 30) -> bool:
+        """Ingest everything pending now (e.g. on shutdown). Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._flushing = True
+            self._cond.notify_all()
+            try:
+                while self._pending or self._in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.warning(f"[IngestQueue] Flush timed out with {len(self._pending)} docs pending.")
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._flushing = False
+
+    def stats(self) -> dict:
+        with self._cond:
+            oldest = next(iter(self._pending.values()), None)
+            return {
+                **self.counters,
+                "depth": len(self._pending),
+                "in_flight": self._in_flight,
+                "capacity": self.max_size,
+                "lag_ms": round((time.monotonic() - oldest[1]) * 1000, 1) if oldest else 0.0,
+                "last_batch_lag_ms": self.last_batch_lag_ms,
+                "policy": self.policy,
+            }
+
+
+# Evidence discovered during retrieval; shared by every request in the process.
+evidence_queue = IngestQueue(
+    vector_store.add_bulk,
+    vector_store.text_hash,
+    max_size=INGEST_QUEUE_SIZE,
+    batch_size=INGEST_BATCH_SIZE,
+    max_wait_ms=INGEST_MAX_WAIT_MS,
+    policy=INGEST_BACKPRESSURE,
+)
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from core.logger import setup_logger
+
+logger = setup_logger()
+
+# ==============================
+# Config
+# ==============================
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", os.path.join("data", "llm_cache.db"))  # empty disables the cache
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+# use: read and write; refresh: skip reads but store the new answer; bypass: neither
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "use")
+
+CACHE_MODES = ("use", "refresh", "bypass")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    stored_at   REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at);
+"""
+
+
+def prompt_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent cache of parsed LLM answers, keyed by model name plus a
+    hash of the rendered prompt. Entries expire after `ttl` seconds; past
+    `max_entries` the least recently used ones are evicted. Callers only
+    store successful answers, so fallbacks are never served from here.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_entries: int = 5000, mode: str = "use"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evicted": 0, "bypassed": 0}
+
+    def _mode(self, mode: str | None) -> str:
+        mode = mode or self.mode
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+        return mode if self._db is not None else "bypass"
+
+    # ---- sqlite (run in a worker thread) ----
+    def _get(self, key: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+            if now - row[1] >= self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.counters["expired"] += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.counters["hits"] += 1
+            return json.loads(row[0])
+
+    def _put(self, key: str, model: str, value: dict):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, value, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(value, default=str), now, now),
+            )
+            self.counters["stores"] += 1
+            excess = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                )
+                self.counters["evicted"] += excess
+
+    # ---- async API ----
+    async def get(self, model: str, prompt: str, mode: str | None = None) -> dict | None:
+        """Cached answer for (model, prompt), or None on a miss or when reads are disabled."""
+        if self._mode(mode) != "use":
+            self.counters["bypassed"] += 1
+            return None
+        try:
+            return await asyncio.to_thread(self._get, prompt_key(model, prompt))
+        except Exception as e:
+            logger.warning(f"[LLMCache] Read failed: {e}")
+            return None
+
+    async def put(self, model: str, prompt: str, value: dict, mode: str | None = None):
+        """Store a successful answer. Never call this with a fallback response."""
+        if self._mode(mode) == "bypass":
+            return
+        try:
+            await asyncio.to_thread(self._put, prompt_key(model, prompt), model, value)
+        except Exception as e:
+            logger.warning(f"[LLMCache] Write failed: {e}")
+
+    def clear(self, model: str | None = None) -> int:
+        """Drop every entry (or only one model's). Returns how many were removed."""
+        if self._db is None:
+            return 0
+        with self._lock:
+            if model is None:
+                return self._db.execute("DELETE FROM responses").rowcount
+            return self._db.execute("DELETE FROM responses WHERE model = ?", (model,)).rowcount
+
+    def stats(self) -> dict:
+        entries = 0
+        if self._db is not None:
+            with self._lock:
+                entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            **self.counters,
+            "entries": entries,
+            "capacity": self.max_entries,
+            "ttl": self.ttl,
+            "mode": self.mode if self._db is not None else "disabled",
+        }
+
+
+llm_cache = LLMCache(LLM_CACHE_DB, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES, mode=LLM_CACHE_MODE)
+
+
+if __name__ == "__main__":
+    # Operator-only: python -m services.llm_cache clear [model]
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != "clear":
+        sys.exit("usage: python -m services.llm_cache clear [model]")
+    print(f"Removed {llm_cache.clear(sys.argv[2] if len(sys.argv) > 2 else None)} cached answers.")
@@ -0,0 +1,390 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from core.logger import setup_logger
+
+logger = setup_logger()
+
+_COLUMNS = ("id", "hash", "text", "url", "source", "labels", "timestamp", "last_hit")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id        INTEGER PRIMARY KEY,
+    hash      TEXT NOT NULL UNIQUE,
+    text      TEXT NOT NULL,
+    url       TEXT,
+    source    TEXT,
+    labels    TEXT,
+    timestamp TEXT,
+    last_hit  TEXT
+);
+CREATE INDEX IF NOT EXISTS docs_source ON docs(source);
+CREATE INDEX IF NOT EXISTS docs_timestamp ON docs(timestamp);
+CREATE TABLE IF NOT EXISTS doc_labels (
+    label TEXT NOT NULL,
+    id    INTEGER NOT NULL,
+    PRIMARY KEY (label, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    name  TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# BM25 full-text index over docs.text, kept in sync with docs by triggers.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(text, content='docs', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS docs_fts_insert AFTER INSERT ON docs BEGIN
+    INSERT INTO docs_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_fts_delete AFTER DELETE ON docs BEGIN
+    INSERT INTO docs_fts (docs_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_fts_update AFTER UPDATE OF text ON docs BEGIN
+    INSERT INTO docs_fts (docs_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO docs_fts (rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+_MAX_QUERY_TERMS = 32
+
+# Recency used for LRU eviction: last search hit, else ingestion time.
+_RECENCY = "COALESCE(last_hit, timestamp)"
+_RECENCY_INDEX = f"CREATE INDEX IF NOT EXISTS docs_recency ON docs({_RECENCY})"
+
+
+def _filter_clauses(sources: list[str] = None, labels: list[str] = None,
+                    since: str = None, until: str = None) -> tuple[list[str], list]:
+    """WHERE clauses (on docs columns) and parameters for the search filters."""
+    clauses, params = [], []
+    if sources:
+        clauses.append(f"source IN ({','.join('?' * len(sources))})")
+        params.extend(sources)
+    if labels:
+        clauses.append(f"id IN (SELECT id FROM doc_labels WHERE label IN ({','.join('?' * len(labels))}))")
+        params.extend(labels)
+    if since:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if until:
+        clauses.append("timestamp <= ?")
+        params.append(until)
+    return clauses, params
+
+
+class MetadataStore:
+    """
+    On-disk metadata for the FAISS store, one row per vector id.
+
+    Backed by SQLite in WAL mode with `mmap_size` set, so pages are mapped
+    from the OS page cache instead of the process holding the whole corpus
+    as Python dicts. Only rows for the top-k hits of a search are ever
+    materialized. Ids are allocated from a counter row (`reserve_ids`), so
+    every connection to the file sees one id sequence.
+    """
+
+    def __init__(self, path: str, mmap_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.mmap_bytes = mmap_bytes
+        self._local = threading.local()
+        conn = self._conn()
+        had_labels_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'doc_labels'"
+        ).fetchone()
+        conn.executescript(_SCHEMA)
+        if not had_labels_table:
+            with conn:  # stores created before filtered search existed
+                conn.execute(
+                    "INSERT OR IGNORE INTO doc_labels (label, id) "
+                    "SELECT json_each.value, docs.id FROM docs, json_each(docs.labels) WHERE docs.labels != '[]'"
+                )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(docs)")}
+        if "last_hit" not in columns:
+            conn.execute("ALTER TABLE docs ADD COLUMN last_hit TEXT")  # stores created before eviction existed
+        conn.execute(_RECENCY_INDEX)
+        self.lexical = self._init_fts(conn)
+
+    @staticmethod
+    def _init_fts(conn: sqlite3.Connection) -> bool:
+        had_fts = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'docs_fts'").fetchone()
+        try:
+            conn.executescript(_FTS_SCHEMA)
+            if not had_fts:
+                with conn:  # index rows stored before lexical search existed
+                    conn.execute("INSERT INTO docs_fts (docs_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"[MetadataStore] SQLite FTS5 unavailable, lexical search disabled: {e}")
+            return False
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not thread-safe)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row_to_doc(row: tuple) -> dict:
+        doc = dict(zip(_COLUMNS, row))
+        doc["labels"] = json.loads(doc["labels"]) if doc["labels"] else []
+        return doc
+
+    # ---------- writes ----------
+    def insert_many(self, rows: list[tuple[int, dict]]):
+        """Insert (id, metadata) rows. Rows whose hash already exists are ignored."""
+        if not rows:
+            return
+        conn = self._conn()
+        with conn:
+            # High-water mark so ids are never reused, even after the newest rows are evicted.
+            conn.execute(
+                "INSERT INTO counters (name, value) VALUES ('next_id', ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = MAX(value, excluded.value)",
+                (max(row_id for row_id, _ in rows) + 1,),
+            )
+            for row_id, m in rows:
+                labels = m.get("labels") or []
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO docs (id, hash, text, url, source, labels, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (row_id, m["hash"], m.get("text", ""), m.get("url", ""), m.get("source", "unknown"),
+                     json.dumps(labels), m.get("timestamp")),
+                ).rowcount
+                if inserted and labels:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO doc_labels (label, id) VALUES (?, ?)", [(label, row_id) for label in labels]
+                    )
+
+    def delete_from(self, first_id: int) -> int:
+        """Delete rows with id >= first_id (orphans whose vectors never reached the index)."""
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM doc_labels WHERE id >= ?", (first_id,))
+            return conn.execute("DELETE FROM docs WHERE id >= ?", (first_id,)).rowcount
+
+    def delete_ids(self, ids: list[int]) -> int:
+        params = [(int(i),) for i in ids]
+        conn = self._conn()
+        with conn:
+            conn.executemany("DELETE FROM doc_labels WHERE id = ?", params)
+            return conn.executemany("DELETE FROM docs WHERE id = ?", params).rowcount
+
+    def touch_many(self, hits: dict[int, str]):
+        """Record last search-hit times (id -> ISO timestamp) for LRU eviction."""
+        if not hits:
+            return
+        conn = self._conn()
+        with conn:
+            conn.executemany("UPDATE docs SET last_hit = ? WHERE id = ?", [(ts, int(i)) for i, ts in hits.items()])
+
+    def expired_ids(self, cutoff: str, limit: int = 10_000) -> list[int]:
+        """Ids ingested before `cutoff` (ISO timestamp)."""
+        rows = self._conn().execute(
+            "SELECT id FROM docs WHERE timestamp < ? ORDER BY timestamp LIMIT ?", (cutoff, limit)
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def least_recent_ids(self, limit: int) -> list[int]:
+        """The `limit` least recently hit (or ingested) ids."""
+        rows = self._conn().execute(f"SELECT id FROM docs ORDER BY {_RECENCY} LIMIT ?", (limit,)).fetchall()
+        return [r[0] for r in rows]
+
+    # ---------- reads ----------
+    def get_many(self, ids: list[int]) -> dict[int, dict]:
+        """Fetch metadata for the given ids (missing ids are simply absent)."""
+        ids = [int(i) for i in ids]
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        rows = self._conn().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM docs WHERE id IN ({placeholders})", ids
+        ).fetchall()
+        return {row[0]: self._row_to_doc(row) for row in rows}
+
+    def id_for_hash(self, doc_hash: str) -> int | None:
+        row = self._conn().execute("SELECT id FROM docs WHERE hash = ?", (doc_hash,)).fetchone()
+        return row[0] if row else None
+
+    def existing_hashes(self, hashes: list[str]) -> set[str]:
+        """Subset of `hashes` already stored."""
+        if not hashes:
+            return set()
+        placeholders = ",".join("?" * len(hashes))
+        rows = self._conn().execute(f"SELECT hash FROM docs WHERE hash IN ({placeholders})", hashes).fetchall()
+        return {r[0] for r in rows}
+
+    def get_by_hash(self, doc_hash: str) -> dict | None:
+        row = self._conn().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM docs WHERE hash = ?", (doc_hash,)
+        ).fetchone()
+        return self._row_to_doc(row) if row else None
+
+    def filter_ids(self, sources: list[str] = None, labels: list[str] = None,
+                   since: str = None, until: str = None) -> list[int]:
+        """
+        Ids matching every given filter: source in `sources`, any label in
+        `labels`, and timestamp within [since, until]. Served from the
+        source / timestamp / doc_labels indexes.
+        """
+        clauses, params = _filter_clauses(sources, labels, since, until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return [r[0] for r in self._conn().execute(f"SELECT id FROM docs {where}", params)]
+
+    def lexical_search(self, query: str, limit: int = 20, sources: list[str] = None, labels: list[str] = None,
+                       since: str = None, until: str = None) -> list[tuple[int, float]]:
+        """
+        BM25-ranked (id, score) for docs sharing any term with `query`, best
+        first, with the same filters as filter_ids. Scores are SQLite's
+        bm25(), where lower is better.
+        """
+        terms = list(dict.fromkeys(re.findall(r"\w+", query.lower())))[:_MAX_QUERY_TERMS]
+        if not self.lexical or not terms:
+            return []
+        match = " OR ".join(f'"{t}"' for t in terms)
+        clauses, params = _filter_clauses(sources, labels, since, until)
+        where = "".join(f" AND docs.{c}" for c in clauses)
+        return self._conn().execute(
+            "SELECT docs_fts.rowid, bm25(docs_fts) AS rank FROM docs_fts JOIN docs ON docs.id = docs_fts.rowid "
+            f"WHERE docs_fts MATCH ?{where} ORDER BY rank LIMIT ?",
+            [match, *params, limit],
+        ).fetchall()
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def reserve_ids(self, n: int, floor: int = 0) -> int:
+        """
+        Atomically claim `n` consecutive fresh ids (none below `floor`) and
+        return the first. The counter lives in the database, so stores
+        sharing it never hand out the same id.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            first = max(self.next_id(), floor)
+            conn.execute(
+                "INSERT INTO counters (name, value) VALUES ('next_id', ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (first + n,),
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return first
+
+    def next_id(self) -> int:
+        """One past the largest id ever inserted (ids are never reused)."""
+        row = self._conn().execute("SELECT value FROM counters WHERE name = 'next_id'").fetchone()
+        if row:
+            return row[0]
+        row = self._conn().execute("SELECT MAX(id) FROM docs").fetchone()
+        return row[0] + 1 if row[0] is not None else 0
+
+    def get_setting(self, name: str) -> str | None:
+        row = self._conn().execute("SELECT value FROM settings WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_setting(self, name: str, value: str):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO settings (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, value),
+            )
+
+    def all_ids(self) -> list[int]:
+        return [r[0] for r in self._conn().execute("SELECT id FROM docs")]
+
+    def iter_all(self, batch_size: int = 10_000):
+        """Yield every row in id order, in batches, without loading the table at once."""
+        last_id = -1
+        while True:
+            rows = self._conn().execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM docs WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_doc(row)
+            last_id = rows[-1][0]
+
+    # ---------- migration ----------
+    def migrate_from_json(self, json_path: str, hash_fn) -> int:
+        """
+        One-off import of the legacy faiss_metadata.json list (row id = list
+        position). Legacy integer hashes are recomputed with `hash_fn`. The
+        JSON file is renamed to *.migrated so it is not imported twice.
+        """
+        if not os.path.exists(json_path) or self.count():
+            return 0
+        with open(json_path, "r") as f:
+            entries = json.load(f)
+        rows = []
+        for row_id, meta in enumerate(entries):
+            if not isinstance(meta.get("hash"), str):
+                meta["hash"] = hash_fn(meta.get("text", ""))
+            rows.append((row_id, meta))
+        self.insert_many(rows)
+        os.replace(json_path, json_path + ".migrated")
+        logger.info(f"[MetadataStore] Migrated {len(rows)} entries from {json_path}.")
+        return len(rows)
+
+
+def _rss_mb() -> float:
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark_memory(n: int = 1_000_000, top_k: int = 5):
+    """
+    Peak RSS of holding n synthetic snippets as a JSON-loaded list of dicts
+    versus opening the SQLite store and fetching one page of top-k rows.
+    Run each mode in a fresh process: `python -m services.metadata_store json|sqlite`.
+    """
+    import sys
+    import tempfile
+    import random
+
+    mode = sys.argv[1] if len(sys.argv) > 1 else "sqlite"
+    workdir = os.path.join(tempfile.gettempdir(), "truthlens_meta_bench")
+    os.makedirs(workdir, exist_ok=True)
+    json_path, db_path = os.path.join(workdir, "meta.json"), os.path.join(workdir, "meta.db")
+
+    if not os.path.exists(json_path):
+        entries = [{
+            "text": f"Claim {i}: officials say event {i % 97} in region {i % 13} was reported by outlet {i % 31}.",
+            "url": f"https://example.org/factcheck/{i}", "source": ("GoogleFactCheck", "NewsAPI", "Wikipedia")[i % 3],
+            "labels": [], "hash": f"{i:064x}", "timestamp": "2025-09-11T19:09:24.742474",
+        } for i in range(n)]
+        with open(json_path, "w") as f:
+            json.dump(entries, f)
+        del entries
+        store = MetadataStore(db_path)
+        store.insert_many(list(enumerate(json.load(open(json_path)))))
+        print("corpus generated; rerun to measure")
+        return
+
+    before = _rss_mb()
+    if mode == "json":
+        with open(json_path) as f:
+            metadata = json.load(f)
+        hits = [metadata[random.randrange(n)].copy() for _ in range(top_k)]
+    else:
+        store = MetadataStore(db_path)
+        hits = list(store.get_many([random.randrange(n) for _ in range(top_k)]).values())
+    print(f"{mode}: {len(hits)} hits fetched, peak RSS {_rss_mb():.1f} MB (baseline {before:.1f} MB)")
+
+
+if __name__ == "__main__":
+    benchmark_memory()
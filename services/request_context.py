@@ -0,0 +1,89 @@
+import copy
+import json
+import asyncio
+import inspect
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Calls made during the current request: key -> task. None outside a request.
+_memo: ContextVar[dict | None] = ContextVar("request_memo", default=None)
+
+
+@contextmanager
+def request_scope():
+    """Memoize engine and connector calls made inside this block (one API request)."""
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+class RequestContextMiddleware:
+    """ASGI middleware opening a `request_scope` for every HTTP request, streamed bodies included."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with request_scope():
+            await self.app(scope, receive, send)
+
+
+def call_key(name: str, params: dict) -> str:
+    return json.dumps([name, params], sort_keys=True, default=str)
+
+
+async def memoize(name: str, key: str, loader):
+    """
+    Return `loader()`'s result, running it at most once per request for
+    `key`; later and concurrent calls in the same request share it. Runs
+    `loader()` directly outside a request scope.
+    """
+    memo = _memo.get()
+    if memo is None:
+        return await loader()
+    task = memo.get(key)
+    if task is None:
+        task = asyncio.ensure_future(loader())
+        memo[key] = task
+    # Callers get their own copy; one stage cancelling must not cancel the shared call.
+    return copy.deepcopy(await asyncio.shield(task))
+
+
+def prime(key: str, value):
+    """Record `value` as the result for `key` in the current request, if there is one."""
+    memo = _memo.get()
+    if memo is not None and key not in memo:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        memo[key] = future
+
+
+def memoized(name: str):
+    """
+    Per-request memoization of an async `fn(...)`, keyed by all of its
+    arguments. `fn.prime(value, *args, **kwargs)` records a result
+    obtained some other way, so a later call with those arguments reuses it.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        def key(*args, **kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return call_key(name, dict(bound.arguments))
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await memoize(name, key(*args, **kwargs), lambda: fn(*args, **kwargs))
+
+        wrapper.prime = lambda value, *args, **kwargs: prime(key(*args, **kwargs), value)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,222 @@
+import os
+import re
+import copy
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import inspect
+import functools
+from collections import OrderedDict
+from core.logger import setup_logger
+from services.request_context import memoize
+
+logger = setup_logger()
+
+# ==============================
+# Config
+# ==============================
+CONNECTOR_CACHE_SIZE = int(os.getenv("CONNECTOR_CACHE_SIZE", "2048"))  # in-memory entries
+CONNECTOR_CACHE_DB = os.getenv("CONNECTOR_CACHE_DB", "")  # e.g. data/connector_cache.db; empty disables the disk tier
+CONNECTOR_NEGATIVE_TTL = float(os.getenv("CONNECTOR_NEGATIVE_TTL", "60"))  # seconds to remember empty / failed lookups
+CONNECTOR_STALE_TTL = float(os.getenv("CONNECTOR_STALE_TTL", "300"))  # serve stale this long past TTL while refreshing
+CONNECTOR_CACHE_DB_MAX_ROWS = int(os.getenv("CONNECTOR_CACHE_DB_MAX_ROWS", "50000"))  # oldest rows beyond this are dropped
+CONNECTOR_CACHE_PRUNE_EVERY = int(os.getenv("CONNECTOR_CACHE_PRUNE_EVERY", "500"))  # disk writes between prunes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key       TEXT PRIMARY KEY,
+    value     TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    ttl       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_stored ON responses(stored_at);
+"""
+
+
+def normalize_query(query) -> str:
+    """Case- and whitespace-insensitive form of a connector query."""
+    return re.sub(r"\s+", " ", str(query or "")).strip().lower()
+
+
+def cache_key(connector: str, query, params: dict) -> str:
+    raw = json.dumps([connector, normalize_query(query), params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Response cache under the outbound connectors.
+
+    Entries live in an in-memory LRU and, optionally, an SQLite file shared
+    by every worker. Each entry carries its own TTL: empty results (the
+    connectors report errors as empty results too) get the short negative
+    TTL. Past its TTL an entry is still served for `stale_ttl` seconds
+    while one background call refreshes it, and concurrent misses for the
+    same key share a single outbound call.
+
+    The disk tier is pruned on open and every `prune_every` writes: rows
+    past TTL + `stale_ttl` can never be served again, and beyond
+    `max_disk_rows` the oldest are dropped.
+    """
+
+    def __init__(self, memory_size: int = 2048, disk_path: str = "", stale_ttl: float = 300,
+                 negative_ttl: float = 60, max_disk_rows: int = 50000, prune_every: int = 500):
+        self.memory_size = memory_size
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_disk_rows = max_disk_rows
+        self.prune_every = prune_every
+        self._writes_since_prune = 0
+        self._memory: OrderedDict[str, tuple] = OrderedDict()  # key -> (value, stored_at, ttl)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._disk = None
+        if disk_path:
+            os.makedirs(os.path.dirname(disk_path) or ".", exist_ok=True)
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False, isolation_level=None)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.executescript(_SCHEMA)
+        self.counters = {"hits": 0, "negative_hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "pruned": 0}
+        if self._disk is not None:
+            self._disk_prune()
+
+    # ---- storage tiers ----
+    def _remember(self, key: str, entry: tuple):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> tuple | None:
+        row = self._disk.execute("SELECT value, stored_at, ttl FROM responses WHERE key = ?", (key,)).fetchone()
+        return (json.loads(row[0]), row[1], row[2]) if row else None
+
+    def _disk_put(self, key: str, entry: tuple):
+        value, stored_at, ttl = entry
+        self._disk.execute(
+            "INSERT OR REPLACE INTO responses (key, value, stored_at, ttl) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, default=str), stored_at, ttl),
+        )
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= self.prune_every:
+            self._disk_prune()
+
+    def _disk_prune(self) -> int:
+        """Delete rows too old to be served, then the oldest rows beyond `max_disk_rows`."""
+        self._writes_since_prune = 0
+        removed = self._disk.execute(
+            "DELETE FROM responses WHERE stored_at + ttl + ? < ?", (self.stale_ttl, time.time())
+        ).rowcount
+        excess = self._disk.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_disk_rows
+        if excess > 0:
+            removed += self._disk.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY stored_at LIMIT ?)",
+                (excess,),
+            ).rowcount
+        self.counters["pruned"] += removed
+        return removed
+
+    async def _lookup(self, key: str) -> tuple | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        if self._disk is None:
+            return None
+        try:
+            entry = await asyncio.to_thread(self._disk_get, key)
+        except Exception as e:
+            logger.warning(f"[ResponseCache] Disk read failed: {e}")
+            return None
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    async def _store(self, key: str, value, ttl: float):
+        entry = (value, time.time(), ttl if value else self.negative_ttl)
+        self._remember(key, entry)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk_put, key, entry)
+            except Exception as e:
+                logger.warning(f"[ResponseCache] Disk write failed: {e}")
+
+    # ---- lookups ----
+    async def _fill(self, key: str, loader, ttl: float):
+        value = await loader()
+        await self._store(key, value, ttl)
+        return value
+
+    def _finish_fill(self, key: str, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            # Failed calls are not cached; waiters (if any) get the exception.
+            logger.warning(f"[ResponseCache] Connector call failed: {task.exception()}")
+
+    def _start_fill(self, key: str, loader, ttl: float) -> asyncio.Future:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fill(key, loader, ttl))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finish_fill, key))
+        else:
+            self.counters["coalesced"] += 1
+        return task
+
+    async def fetch(self, key: str, loader, ttl: float):
+        """Return the cached value for `key`, calling `loader()` only when needed."""
+        entry = await self._lookup(key)
+        if entry is not None:
+            value, stored_at, entry_ttl = entry
+            age = time.time() - stored_at
+            if age < entry_ttl:
+                self.counters["hits" if value else "negative_hits"] += 1
+                return copy.deepcopy(value)
+            if value and age < entry_ttl + self.stale_ttl:
+                self.counters["stale_hits"] += 1
+                self._start_fill(key, loader, ttl)  # revalidate in the background
+                return copy.deepcopy(value)
+        self.counters["misses"] += 1
+        # Shielded: a caller hitting its own deadline must not cancel the shared call.
+        return copy.deepcopy(await asyncio.shield(self._start_fill(key, loader, ttl)))
+
+    def stats(self) -> dict:
+        return {**self.counters, "memory_entries": len(self._memory), "disk": self._disk is not None}
+
+
+response_cache = ResponseCache(
+    memory_size=CONNECTOR_CACHE_SIZE,
+    disk_path=CONNECTOR_CACHE_DB,
+    stale_ttl=CONNECTOR_STALE_TTL,
+    negative_ttl=CONNECTOR_NEGATIVE_TTL,
+    max_disk_rows=CONNECTOR_CACHE_DB_MAX_ROWS,
+    prune_every=CONNECTOR_CACHE_PRUNE_EVERY,
+)
+
+
+def cached_connector(name: str, ttl: float):
+    """
+    Cache an async connector `fn(query, ...)` in `response_cache`, keyed by
+    (name, normalized query, remaining arguments), and memoize it within the
+    current request. The TTL can be overridden per connector with
+    CONNECTOR_TTL_<NAME> (seconds).
+    """
+    ttl = float(os.getenv(f"CONNECTOR_TTL_{name.upper()}", ttl))
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            query = params.pop(next(iter(signature.parameters)))
+            key = cache_key(name, query, params)
+            return await memoize(name, key, lambda: response_cache.fetch(key, lambda: fn(*args, **kwargs), ttl))
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
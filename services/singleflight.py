@@ -0,0 +1,101 @@
+import copy
+import json
+import asyncio
+import hashlib
+import inspect
+import functools
+from core.logger import setup_logger
+
+logger = setup_logger()
+
+
+def claim_fingerprint(name: str, claim, params: dict | None = None) -> str:
+    """
+    Key for one claim check: the claim exactly as given (only surrounding
+    whitespace stripped) plus any other arguments. Results echo the claim
+    text back, so claims differing in case must not share one.
+    """
+    raw = json.dumps([name, str(claim or "").strip(), params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Request coalescing for claim checks.
+
+    While a computation for a fingerprint is running, identical calls wait
+    on it instead of starting their own; every caller gets its own copy of
+    the result (or the exception). Nothing is kept once the call finishes,
+    so this only merges concurrent work and never serves stale verdicts.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.counters: dict[str, dict] = {}
+
+    def _count(self, name: str, counter: str):
+        group = self.counters.setdefault(name, {"calls": 0, "executions": 0, "coalesced": 0, "failed": 0})
+        group[counter] += 1
+
+    def _finish(self, name: str, key: str, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self._count(name, "failed")
+
+    async def do(self, name: str, key: str, fn):
+        """Run `fn()` for `key`, or join the call already in flight for it."""
+        self._count(name, "calls")
+        task = self._inflight.get(key)
+        if task is None:
+            self._count(name, "executions")
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finish, name, key))
+        else:
+            self._count(name, "coalesced")
+            logger.info(f"[SingleFlight] {name}: joined in-flight call")
+        # Shielded: one client disconnecting must not cancel the others' result.
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def stats(self) -> dict:
+        groups = {}
+        for name, group in self.counters.items():
+            groups[name] = {
+                **group,
+                "hit_rate": round(group["coalesced"] / group["calls"], 3) if group["calls"] else 0.0,
+            }
+        return {"inflight": len(self._inflight), "groups": groups}
+
+
+singleflight = SingleFlight()
+
+
+def coalesced(name: str, key_fn=None):
+    """
+    Coalesce concurrent calls of an async `fn(claim, ...)` in `singleflight`.
+    By default the key is the stripped first argument plus the remaining
+    arguments; `key_fn(*args, **kwargs)` returns a (claim, params) pair
+    for callers whose claim is not a plain string.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        def default_key(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            return params.pop(next(iter(signature.parameters))), params
+
+        make_key = key_fn or default_key
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            claim, params = make_key(*args, **kwargs)
+            key = claim_fingerprint(name, claim, params)
+            return await singleflight.do(name, key, lambda: fn(*args, **kwargs))
+
+        wrapper.uncoalesced = fn
+        return wrapper
+
+    return decorator
@@ -0,0 +1,50 @@
+import os
+import numpy as np
+
+
+class FloatVectorFile:
+    """
+    Full-precision vectors on disk, row i = FAISS id i.
+
+    Used to re-rank candidates from a quantized index. Rows are written with
+    pwrite at their id's offset (idempotent, safe to replay) and read with
+    pread, so only the handful of rows being re-ranked are ever touched and
+    the corpus never has to sit in process memory.
+    """
+
+    def __init__(self, path: str, dimension: int):
+        self.path = path
+        self.dimension = dimension
+        self.row_bytes = dimension * 4
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        self.rows = size // self.row_bytes
+        if size % self.row_bytes:
+            os.ftruncate(self._fd, self.rows * self.row_bytes)  # drop a torn final row
+
+    def write(self, first_row: int, vectors: np.ndarray):
+        data = np.ascontiguousarray(vectors, dtype="float32").tobytes()
+        os.pwrite(self._fd, data, first_row * self.row_bytes)
+        self.rows = max(self.rows, first_row + len(data) // self.row_bytes)
+
+    def truncate(self, rows: int):
+        os.ftruncate(self._fd, rows * self.row_bytes)
+        self.rows = rows
+
+    def fetch(self, ids) -> np.ndarray:
+        out = np.empty((len(ids), self.dimension), dtype="float32")
+        for i, row in enumerate(ids):
+            out[i] = np.frombuffer(os.pread(self._fd, self.row_bytes, int(row) * self.row_bytes), dtype="float32")
+        return out
+
+    def sync(self):
+        os.fsync(self._fd)
+
+    def close(self):
+        if getattr(self, "_fd", None) is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self):
+        # Readers may still hold a swapped-out file (e.g. mid re-rank); close on release.
+        self.close()
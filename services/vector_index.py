@@ -0,0 +1,316 @@
+import math
+import time
+import faiss
+import numpy as np
+
+# ==============================
+# Index Types
+# ==============================
+# All indexes use inner product on normalized vectors (cosine similarity).
+# sq8 / ivf_sq8 store int8 codes (~4x smaller); pq / ivf_pq store pq_m bytes per vector.
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw", "sq8", "ivf_sq8", "pq")
+QUANTIZED_TYPES = ("ivf_pq", "sq8", "ivf_sq8", "pq")
+
+
+def default_nlist(n: int) -> int:
+    """Rule of thumb: ~4*sqrt(n) IVF lists, with at least 39 training points per list."""
+    return max(1, min(int(4 * math.sqrt(n)), n // 39 or 1))
+
+
+def factory_string(kind: str, n: int, nlist: int = 0, pq_m: int = 48, hnsw_m: int = 32) -> str:
+    """Map a configured index type to a faiss index_factory description."""
+    nlist = nlist or default_nlist(n)
+    if kind == "flat":
+        return "Flat"
+    if kind == "ivf_flat":
+        return f"IVF{nlist},Flat"
+    if kind == "ivf_pq":
+        return f"IVF{nlist},PQ{pq_m}"
+    if kind == "hnsw":
+        return f"HNSW{hnsw_m},Flat"
+    if kind == "sq8":
+        return "SQ8"
+    if kind == "ivf_sq8":
+        return f"IVF{nlist},SQ8"
+    if kind == "pq":
+        return f"PQ{pq_m}"
+    raise ValueError(f"Unknown FAISS index type '{kind}'. Expected one of {INDEX_TYPES}.")
+
+
+def build_index(kind: str, dimension: int, vectors: np.ndarray, ids: np.ndarray = None, nlist: int = 0,
+                pq_m: int = 48, hnsw_m: int = 32, ef_construction: int = 200, train_size: int = 0) -> faiss.Index:
+    """
+    Create an ID-mapped index of the given kind, train it on (a sample of)
+    `vectors` if needed, and add all of `vectors` under `ids` (default 0..n-1).
+
+    IVF indexes store ids natively (with a hashtable direct map so rows can be
+    reconstructed and removed by id); every other type is wrapped in
+    IndexIDMap2 so document ids stay stable across removals.
+    """
+    n = len(vectors)
+    ids = np.arange(n, dtype="int64") if ids is None else np.asarray(ids, dtype="int64")
+    base = faiss.index_factory(dimension, factory_string(kind, n, nlist, pq_m, hnsw_m), faiss.METRIC_INNER_PRODUCT)
+    if kind == "hnsw":
+        base.hnsw.efConstruction = ef_construction
+    if not base.is_trained:
+        train_size = train_size or min(n, 256 * (nlist or default_nlist(n)))
+        sample = vectors
+        if train_size < n:
+            rng = np.random.default_rng(0)
+            sample = vectors[rng.choice(n, size=train_size, replace=False)]
+        base.train(np.ascontiguousarray(sample, dtype="float32"))
+    index = _with_id_support(base)
+    if n:
+        index.add_with_ids(np.ascontiguousarray(vectors, dtype="float32"), ids)
+    return index
+
+
+def empty_index(dimension: int) -> faiss.Index:
+    """Empty exact (flat, ID-mapped) index."""
+    return build_index("flat", dimension, np.zeros((0, dimension), dtype="float32"))
+
+
+def _with_id_support(base: faiss.Index) -> faiss.Index:
+    try:
+        faiss.extract_index_ivf(base).set_direct_map_type(faiss.DirectMap.Hashtable)
+        return base
+    except RuntimeError:
+        return faiss.IndexIDMap2(base)
+
+
+def _is_id_mapped(index: faiss.Index) -> bool:
+    return isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2))
+
+
+def inner_index(index: faiss.Index) -> faiss.Index:
+    """The index doing the actual search, underneath any IndexIDMap wrapper."""
+    return faiss.downcast_index(index.index) if _is_id_mapped(index) else index
+
+
+def ensure_id_mapped(index: faiss.Index) -> faiss.Index:
+    """
+    Upgrade a legacy position-addressed index (id == row position) to one
+    that supports add/remove by id. Already ID-capable indexes are returned as is.
+    """
+    if _is_id_mapped(index):
+        return index
+    try:
+        ivf = faiss.extract_index_ivf(index)
+        if ivf.direct_map.type != faiss.DirectMap.Hashtable:
+            ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return index
+    except RuntimeError:
+        pass
+    vectors = index.reconstruct_n(0, index.ntotal) if index.ntotal else np.zeros((0, index.d), dtype="float32")
+    base = faiss.clone_index(index)
+    base.reset()
+    upgraded = faiss.IndexIDMap2(base)
+    if len(vectors):
+        upgraded.add_with_ids(vectors, np.arange(len(vectors), dtype="int64"))
+    return upgraded
+
+
+def all_ids(index: faiss.Index) -> np.ndarray:
+    """Every document id currently stored in the index."""
+    if _is_id_mapped(index):
+        return faiss.vector_to_array(index.id_map).astype("int64")
+    invlists = faiss.extract_index_ivf(index).invlists
+    chunks = []
+    for list_no in range(invlists.nlist):
+        size = invlists.list_size(list_no)
+        if size:
+            chunks.append(faiss.rev_swig_ptr(invlists.get_ids(list_no), size).copy())
+    return np.concatenate(chunks).astype("int64") if chunks else np.zeros(0, dtype="int64")
+
+
+def search_with_selector(index: faiss.Index, queries: np.ndarray, k: int, selector,
+                         nprobe: int = None, ef_search: int = None):
+    """
+    Search only the ids accepted by `selector` (pre-filtering inside faiss,
+    so no over-fetch). Search params are passed explicitly because a
+    SearchParameters object overrides the index's own nprobe / efSearch.
+    """
+    kind = index_kind(index)
+    if kind == "hnsw":
+        params = faiss.SearchParametersHNSW(sel=selector, efSearch=ef_search or 16)
+    elif kind.startswith("ivf"):
+        params = faiss.SearchParametersIVF(sel=selector, nprobe=nprobe or 1)
+    else:
+        params = faiss.SearchParameters(sel=selector)
+    return index.search(queries, k, params=params)
+
+
+def exact_top_k(query_vectors: np.ndarray, ids: np.ndarray, vectors: np.ndarray, top_k: int):
+    """Brute-force top-k over a small candidate set. Returns (scores, ids), -1 padded."""
+    n_queries = len(query_vectors)
+    out_ids = np.full((n_queries, top_k), -1, dtype="int64")
+    out_scores = np.full((n_queries, top_k), -np.inf, dtype="float32")
+    if not len(ids):
+        return out_scores, out_ids
+    scores = query_vectors @ vectors.T
+    k = min(top_k, len(ids))
+    for q in range(n_queries):
+        best = np.argpartition(-scores[q], k - 1)[:k]
+        best = best[np.argsort(-scores[q][best])]
+        out_ids[q, :k] = ids[best]
+        out_scores[q, :k] = scores[q][best]
+    return out_scores, out_ids
+
+
+def rrf_fuse(rankings: list[list[int]], k: int = 60) -> list[tuple[int, float]]:
+    """
+    Reciprocal rank fusion: score(id) = sum over rankings of 1 / (k + rank).
+    Returns (id, score) best first; ties keep the order of the first ranking.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+def reconstruct_ids(index: faiss.Index, ids) -> np.ndarray:
+    """Stored vectors for the given ids (exact for flat/HNSW-flat/IVF-flat, approximate for quantized)."""
+    ids = np.asarray(ids, dtype="int64")
+    if not len(ids):
+        return np.zeros((0, index.d), dtype="float32")
+    return index.reconstruct_batch(ids)
+
+
+def reconstruct_all(index: faiss.Index) -> tuple[np.ndarray, np.ndarray]:
+    """(ids, vectors) for everything stored in the index."""
+    ids = all_ids(index)
+    return ids, reconstruct_ids(index, ids)
+
+
+def supports_remove(index: faiss.Index) -> bool:
+    """HNSW graphs cannot delete in place; removals there wait for a rebuild."""
+    return index_kind(index) != "hnsw"
+
+
+def index_kind(index: faiss.Index) -> str:
+    """Best-effort reverse mapping from a loaded faiss index to a configured type."""
+    index = inner_index(index)
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexScalarQuantizer):
+        return "sq8"
+    if isinstance(index, faiss.IndexPQ):
+        return "pq"
+    try:
+        # extract_index_ivf returns a plain IndexIVF; downcast to see PQ / SQ codes.
+        ivf = faiss.downcast_index(faiss.extract_index_ivf(index))
+    except RuntimeError:
+        return "flat"
+    if isinstance(ivf, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(ivf, faiss.IndexIVFScalarQuantizer):
+        return "ivf_sq8"
+    return "ivf_flat"
+
+
+def is_quantized(index: faiss.Index) -> bool:
+    """Whether the index stores lossy codes, so results benefit from a full-precision re-rank."""
+    return index_kind(index) in QUANTIZED_TYPES
+
+
+def rerank(query_vectors: np.ndarray, candidate_ids: np.ndarray, fetch_vectors, top_k: int):
+    """
+    Re-score approximate candidates with exact float inner products.
+    `fetch_vectors(ids)` returns the float32 rows for the given ids.
+    Returns (scores, ids) arrays shaped (n_queries, top_k), -1 padded.
+    """
+    n_queries = len(query_vectors)
+    out_ids = np.full((n_queries, top_k), -1, dtype="int64")
+    out_scores = np.full((n_queries, top_k), -np.inf, dtype="float32")
+    for q in range(n_queries):
+        ids = candidate_ids[q][candidate_ids[q] >= 0]
+        if not len(ids):
+            continue
+        scores = fetch_vectors(ids) @ query_vectors[q]
+        order = np.argsort(-scores)[:top_k]
+        out_ids[q, :len(order)] = ids[order]
+        out_scores[q, :len(order)] = scores[order]
+    return out_scores, out_ids
+
+
+def memory_bytes(index: faiss.Index) -> int:
+    """Serialized size of an index, a close proxy for its resident memory."""
+    return faiss.serialize_index(index).nbytes
+
+
+def apply_search_params(index: faiss.Index, nprobe: int = None, ef_search: int = None):
+    """Set IVF nprobe / HNSW efSearch on an index, ignoring params it does not have."""
+    index = inner_index(index)
+    if ef_search and isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = ef_search
+        return
+    if nprobe:
+        try:
+            faiss.extract_index_ivf(index).nprobe = nprobe
+        except RuntimeError:
+            pass
+
+
+# ==============================
+# Benchmark
+# ==============================
+def _synthetic_corpus(n: int, dimension: int, clusters: int = 256, seed: int = 0) -> np.ndarray:
+    """Clustered, normalized vectors that roughly mimic sentence-embedding structure."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype("float32")
+    vectors = centers[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dimension)).astype("float32")
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def benchmark_recall(n: int = 200_000, dimension: int = 384, n_queries: int = 500, k: int = 10,
+                     configs: list[dict] = None) -> list[dict]:
+    """
+    Compare ANN / quantized configurations against an exact flat baseline.
+    Returns one row per config with recall@k, mean per-query latency (ms) and
+    index bytes per vector. A config with "rerank": f fetches k*f candidates
+    and re-scores them against the float vectors.
+    """
+    corpus = _synthetic_corpus(n, dimension)
+    queries = _synthetic_corpus(n_queries, dimension, seed=1)
+    configs = configs or [
+        {"kind": "ivf_flat", "nprobe": 8}, {"kind": "ivf_flat", "nprobe": 32},
+        {"kind": "ivf_pq", "nprobe": 16}, {"kind": "ivf_pq", "nprobe": 64},
+        {"kind": "hnsw", "ef_search": 32}, {"kind": "hnsw", "ef_search": 128},
+        {"kind": "sq8"}, {"kind": "sq8", "rerank": 4},
+        {"kind": "pq"}, {"kind": "pq", "rerank": 4}, {"kind": "pq", "rerank": 10},
+        {"kind": "ivf_sq8", "nprobe": 32}, {"kind": "ivf_sq8", "nprobe": 32, "rerank": 4},
+    ]
+
+    flat = build_index("flat", dimension, corpus)
+    start = time.perf_counter()
+    _, truth = flat.search(queries, k)
+    rows = [{"kind": "flat", "recall": 1.0, "ms_per_query": 1000 * (time.perf_counter() - start) / n_queries,
+             "bytes_per_vector": memory_bytes(flat) / n}]
+
+    built = {}
+    for config in configs:
+        kind = config["kind"]
+        if kind not in built:
+            built[kind] = build_index(kind, dimension, corpus)
+        index = built[kind]
+        apply_search_params(index, nprobe=config.get("nprobe"), ef_search=config.get("ef_search"))
+        factor = config.get("rerank", 0)
+        start = time.perf_counter()
+        _, found = index.search(queries, k * factor if factor else k)
+        if factor:
+            _, found = rerank(queries, found, lambda ids: corpus[ids], k)
+        elapsed = time.perf_counter() - start
+        hits = sum(len(set(found[i]) & set(truth[i])) for i in range(n_queries))
+        rows.append({**config, "recall": hits / (n_queries * k), "ms_per_query": 1000 * elapsed / n_queries,
+                     "bytes_per_vector": memory_bytes(index) / n})
+    return rows
+
+
+if __name__ == "__main__":
+    for row in benchmark_recall():
+        params = ", ".join(f"{key}={value}" for key, value in row.items()
+                           if key not in ("recall", "ms_per_query", "bytes_per_vector"))
+        print(f"{params:<40} recall@10={row['recall']:.3f}  {row['ms_per_query']:.3f} ms/query  "
+              f"{row['bytes_per_vector']:.0f} B/vector")
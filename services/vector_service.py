@@ -0,0 +1,167 @@
+"""
+Shared vector store service.
+
+With `uvicorn --workers N`, run the FAISS store once per host instead of once
+per worker:
+
+    VECTOR_STORE_MODE=server python -m services.vector_service
+    VECTOR_STORE_MODE=client uvicorn main:app --workers 4
+
+The server owns the only in-memory index and serializes all writes. API
+workers in client mode never load the index or the embedding model; every
+public vector_store call is forwarded over a Unix socket, authenticated with
+VECTOR_STORE_AUTHKEY or, if unset, a random key the server writes to the data
+directory.
+"""
+import os
+import queue
+import secrets
+import threading
+from multiprocessing.connection import Client, Listener
+from core.logger import setup_logger
+
+logger = setup_logger()
+
+AUTHKEY_ENV = "VECTOR_STORE_AUTHKEY"
+
+
+class VectorStoreError(RuntimeError):
+    """Raised in a client when the vector store service reports a failure."""
+
+
+def load_authkey(path: str, create: bool = False) -> bytes:
+    """
+    Shared secret for the socket handshake. Connections exchange pickles, so
+    the key must not be guessable: VECTOR_STORE_AUTHKEY if set, else a random
+    key the server writes to `path` (mode 0600) and clients read from it.
+    """
+    configured = os.getenv(AUTHKEY_ENV)
+    if configured:
+        return configured.encode("utf-8")
+    if create:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            os.chmod(path, 0o600)
+        else:
+            with os.fdopen(fd, "wb") as f:
+                f.write(secrets.token_hex(32).encode("ascii"))
+    try:
+        with open(path, "rb") as f:
+            key = f.read().strip()
+    except FileNotFoundError:
+        key = b""
+    if not key:
+        raise VectorStoreError(f"No vector store key in {path}; start the service first or set {AUTHKEY_ENV}.")
+    return key
+
+
+class VectorStoreClient:
+    """
+    Thin client with a small pool of socket connections, so concurrent
+    threads (e.g. the async executor) do not serialize on one connection.
+    """
+
+    def __init__(self, address: str, authkey: bytes = None, authkey_path: str = None, pool_size: int = 8):
+        self.address = address
+        self.authkey = authkey
+        self.authkey_path = authkey_path
+        self._pool = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def _acquire(self):
+        self._slots.acquire()
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            try:
+                # Read on first connect: the server may start after this worker.
+                self.authkey = self.authkey or load_authkey(self.authkey_path)
+                return Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            except Exception:
+                self._slots.release()
+                raise
+
+    def _release(self, conn, broken: bool = False):
+        if broken:
+            conn.close()
+        else:
+            self._pool.put(conn)
+        self._slots.release()
+
+    def call_many(self, calls: list[tuple[str, tuple, dict]]) -> list:
+        """Send several calls in one round trip; results come back in order."""
+        conn = self._acquire()
+        try:
+            conn.send(calls)
+            replies = conn.recv()
+        except (EOFError, OSError):
+            self._release(conn, broken=True)
+            raise
+        self._release(conn)
+        results = []
+        for status, value in replies:
+            if status != "ok":
+                raise VectorStoreError(value)
+            results.append(value)
+        return results
+
+    def call(self, name: str, *args, **kwargs):
+        return self.call_many([(name, args, kwargs)])[0]
+
+
+def _handle(conn, handlers: dict):
+    """Serve one client connection until it closes."""
+    try:
+        while True:
+            calls = conn.recv()
+            replies = []
+            for name, args, kwargs in calls:
+                fn = handlers.get(name)
+                if fn is None:
+                    replies.append(("error", f"Unknown vector store call: {name}"))
+                    continue
+                try:
+                    replies.append(("ok", fn(*args, **kwargs)))
+                except Exception as e:
+                    logger.error(f"[VectorService] {name} failed: {e}")
+                    replies.append(("error", f"{type(e).__name__}: {e}"))
+            conn.send(replies)
+    except (EOFError, OSError):
+        pass
+    finally:
+        conn.close()
+
+
+def serve(address: str = None, authkey: bytes = None):
+    """Load the store in this process and serve it over a Unix socket."""
+    from services import vector_store
+
+    if vector_store.VECTOR_STORE_MODE == "client":
+        raise RuntimeError("Refusing to serve the vector store with VECTOR_STORE_MODE=client.")
+    address = address or vector_store.VECTOR_STORE_SOCKET
+    authkey = authkey or load_authkey(vector_store.AUTHKEY_PATH, create=True)
+    if os.path.exists(address):
+        os.remove(address)  # stale socket from a previous run
+
+    handlers = {name: getattr(vector_store, name) for name in vector_store.ROUTED_CALLS}
+    listener = Listener(address, family="AF_UNIX", authkey=authkey)
+    os.chmod(address, 0o600)  # only this user may connect
+    logger.info(f"[VectorService] Serving {vector_store.index.ntotal} docs on {address}")
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                # Failed auth handshake etc.; keep serving other clients.
+                logger.warning(f"[VectorService] Rejected connection: {e}")
+                continue
+            threading.Thread(target=_handle, args=(conn, handlers), daemon=True).start()
+    finally:
+        listener.close()
+        vector_store.save_index()
+        vector_store.compact_index()
+
+
+if __name__ == "__main__":
+    serve()
@@ -1,12 +1,23 @@
 import os
+import fcntl
+import asyncio
+import functools
 import faiss
-import json
 import numpy as np
 import hashlib
 import threading
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from sentence_transformers import SentenceTransformer
 from core.logger import setup_logger
+from services.embedding_batcher import EmbeddingBatcher
+from services.vector_wal import SegmentLog, fsync_dir, write_durably
+from services.embedding_cache import EmbeddingCache
+from services.metadata_store import MetadataStore
+from services.vector_file import FloatVectorFile
+from services.vector_service import VectorStoreClient
+from services import vector_index
 
 logger = setup_logger()
 
@@ -15,30 +26,129 @@ logger = setup_logger()
 # ==============================
 DATA_DIR = os.getenv("VECTOR_STORE_DIR", "data")
 INDEX_PATH = os.path.join(DATA_DIR, "faiss_index.bin")
-META_PATH = os.path.join(DATA_DIR, "faiss_metadata.json")
+META_DB_PATH = os.path.join(DATA_DIR, "faiss_metadata.db")
+LEGACY_META_PATH = os.path.join(DATA_DIR, "faiss_metadata.json")  # migrated into META_DB_PATH on load
+RAW_VECTORS_PATH = os.path.join(DATA_DIR, "faiss_vectors.f32")
+OWNER_LOCK_PATH = os.path.join(DATA_DIR, "vector_store.lock")
+AUTHKEY_PATH = os.path.join(DATA_DIR, "vector_store.key")  # written by the service unless VECTOR_STORE_AUTHKEY is set
+META_MMAP_BYTES = int(os.getenv("VECTOR_META_MMAP_BYTES", str(256 * 1024 * 1024)))
 
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# local:  this process owns the index (default, single worker)
+# server: this process owns the index and serves it (python -m services.vector_service)
+# client: forward every call to the server; never load the index or the model
+VECTOR_STORE_MODE = os.getenv("VECTOR_STORE_MODE", "local")
+VECTOR_STORE_SOCKET = os.getenv("VECTOR_STORE_SOCKET", os.path.join(DATA_DIR, "vector_store.sock"))
+
+# Compact the write-ahead log into a fresh snapshot after this many records,
+# or every WAL_COMPACT_INTERVAL seconds, whichever comes first.
+WAL_COMPACT_RECORDS = int(os.getenv("WAL_COMPACT_RECORDS", "1000"))
+WAL_COMPACT_INTERVAL = float(os.getenv("WAL_COMPACT_INTERVAL", "300"))
+
+# ANN index: the store starts as an exact flat index and is trained/migrated to
+# FAISS_INDEX_TYPE (flat | ivf_flat | ivf_pq | hnsw | sq8 | ivf_sq8 | pq) once
+# it holds FAISS_PROMOTE_THRESHOLD vectors.
+INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "flat")
+PROMOTE_THRESHOLD = int(os.getenv("FAISS_PROMOTE_THRESHOLD", "100000"))
+IVF_NLIST = int(os.getenv("FAISS_IVF_NLIST", "0"))  # 0 = derive from corpus size
+PQ_M = int(os.getenv("FAISS_PQ_M", "48"))
+HNSW_M = int(os.getenv("FAISS_HNSW_M", "32"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("FAISS_HNSW_EF_CONSTRUCTION", "200"))
+REEMBED_BATCH_SIZE = int(os.getenv("REEMBED_BATCH_SIZE", "256"))  # docs per batch when re-embedding after a model change
+REBUILD_COPY_CHUNK = int(os.getenv("FAISS_REBUILD_COPY_CHUNK", "50000"))  # vectors copied per _index_lock hold during a rebuild
+search_params = {
+    "nprobe": int(os.getenv("FAISS_NPROBE", "16")),
+    "ef_search": int(os.getenv("FAISS_EF_SEARCH", "64")),
+}
+
+# Quantized indexes (sq8, ivf_sq8, pq, ivf_pq) can re-rank top_k * FAISS_RERANK_FACTOR
+# candidates against full-precision vectors kept on disk (0 disables re-ranking).
+RERANK_FACTOR = int(os.getenv("FAISS_RERANK_FACTOR", "0"))
+
+# Evidence cache bounds. Documents past EVIDENCE_TTL_DAYS (by ingestion
+# timestamp) are expired; beyond EVIDENCE_MAX_DOCS the least recently hit are
+# evicted. Both run every EVICTION_INTERVAL seconds (0 disables a bound). When
+# more than FAISS_REBUILD_DEAD_FRACTION of the index is dead vectors (e.g. HNSW,
+# which cannot delete in place), the index is rebuilt in the background.
+EVIDENCE_MAX_DOCS = int(os.getenv("EVIDENCE_MAX_DOCS", "0"))
+EVIDENCE_TTL_DAYS = float(os.getenv("EVIDENCE_TTL_DAYS", "0"))
+EVICTION_INTERVAL = float(os.getenv("EVICTION_INTERVAL", "600"))
+REBUILD_DEAD_FRACTION = float(os.getenv("FAISS_REBUILD_DEAD_FRACTION", "0.2"))
+
+# Filtered searches whose filter matches at most this many docs are scored
+# exactly over the matches; larger matches are searched with an ID selector.
+FILTER_EXACT_LIMIT = int(os.getenv("FAISS_FILTER_EXACT_LIMIT", "20000"))
+
+# dense: FAISS only. hybrid: FAISS fused with BM25 over the metadata store's
+# full-text index (exact names, numbers and dates) by reciprocal rank fusion.
+# Hybrid changes result order and scores, so it is opt-in (env or mode="hybrid")
+# until benchmark_hybrid() shows it wins on our data.
+SEARCH_MODE = os.getenv("SEARCH_MODE", "dense")
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "4"))  # each retriever contributes top_k * this
+RRF_K = int(os.getenv("RRF_K", "60"))
+
 # ==============================
 # Embedding Model (Lazy Loaded)
 # ==============================
 _embedding_model = None
+MODEL_NAME = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
 dimension = 384
 _index_lock = threading.Lock()
 
+EMBED_MAX_BATCH_SIZE = int(os.getenv("EMBED_MAX_BATCH_SIZE", "64"))
+EMBED_MAX_WAIT_MS = float(os.getenv("EMBED_MAX_WAIT_MS", "5"))
+EMBED_CACHE_MEMORY_SIZE = int(os.getenv("EMBED_CACHE_MEMORY_SIZE", "10000"))
+EMBED_CACHE_DISK_SIZE = int(os.getenv("EMBED_CACHE_DISK_SIZE", "100000"))  # 0 disables the disk tier
+
+# Bounded pool for the async wrappers; torch and faiss release the GIL, so
+# threads give real parallelism without blocking the event loop.
+VECTOR_STORE_WORKERS = int(os.getenv("VECTOR_STORE_WORKERS", "4"))
+
 def get_model():
     """Load embedding model only once (lazy load)."""
     global _embedding_model
     if _embedding_model is None:
-        logger.info("Loading embedding model: all-MiniLM-L6-v2")
-        _embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+        logger.info(f"Loading embedding model: {MODEL_NAME}")
+        _embedding_model = SentenceTransformer(MODEL_NAME)
     return _embedding_model
 
 # ==============================
 # FAISS Index + Metadata
 # ==============================
-index = faiss.IndexFlatIP(dimension)  # cosine via inner product
-metadata = []  # parallel metadata list
+index = vector_index.empty_index(dimension)  # ID-mapped, cosine via inner product
+_owns_files = VECTOR_STORE_MODE != "client"  # clients must not create or truncate the server's files
+# Keyed by FAISS id; hash is UNIQUE. Clients forward every call, so they never open (or migrate) the server's DB.
+metadata = MetadataStore(META_DB_PATH, mmap_bytes=META_MMAP_BYTES) if _owns_files else None
+_next_id = 0  # ids are monotonic and never reused
+_recent_hits: dict[int, str] = {}  # id -> last search hit, flushed to metadata on each eviction pass
+_wal = SegmentLog(DATA_DIR)
+_raw_vectors = FloatVectorFile(RAW_VECTORS_PATH, dimension) if RERANK_FACTOR > 0 and _owns_files else None
+_compact_lock = threading.Lock()
+_compactor = None
+_rebuild_lock = threading.Lock()
+_rebuild_removed = None  # ids removed while a rebuild is in flight
+_rebuild_status = {"state": "idle"}  # progress of the current / last rebuild, reported by stats()
+_generation = 0  # bumped when a rebuild swaps in a new embedding model
+_evictor = None
+_owner_lock = None  # open lock file held for the life of the owning process
+
+# ==============================
+# Service Routing
+# ==============================
+_service_client = None  # set in client mode
+ROUTED_CALLS = set()
+
+def _routed(fn):
+    """Forward a public call to the shared vector store service when running as a client."""
+    ROUTED_CALLS.add(fn.__name__)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _service_client is not None:
+            return _service_client.call(fn.__name__, *args, **kwargs)
+        return fn(*args, **kwargs)
+    return wrapper
 
 # ==============================
 # Utility Functions
@@ -47,58 +157,142 @@ def normalize(vec: np.ndarray) -> np.ndarray:
     """Normalize vector for cosine similarity."""
     return vec / np.linalg.norm(vec)
 
+def _encode(texts: list[str], batch_size: int) -> np.ndarray:
+    """Run one SentenceTransformer forward pass over a list of texts."""
+    model = get_model()
+    return model.encode(texts, batch_size=batch_size, normalize_embeddings=True).astype("float32")
+
+# Shared across add_document / add_bulk / search_similar callers on all threads
+_batcher = EmbeddingBatcher(_encode, max_batch_size=EMBED_MAX_BATCH_SIZE, max_wait_ms=EMBED_MAX_WAIT_MS)
+def _open_embedding_cache(model_name: str, dim: int) -> EmbeddingCache:
+    """Embedding caches are per model: vectors from different models are not comparable."""
+    return EmbeddingCache(
+        DATA_DIR, model_name.replace("/", "_"), dim,
+        memory_size=EMBED_CACHE_MEMORY_SIZE, disk_capacity=EMBED_CACHE_DISK_SIZE if _owns_files else 0,
+    )
+
+_embedding_cache = _open_embedding_cache(MODEL_NAME, dimension)
+
+@_routed
+def embed_texts(texts: list[str]) -> np.ndarray:
+    """
+    Convert texts into normalized embedding vectors (one row per text).
+    Cached vectors are reused; only cache misses reach the model.
+    """
+    if not texts:
+        return np.zeros((0, dimension), dtype="float32")
+    cache = _embedding_cache  # a model swap replaces the cache; keep writing to the one we read from
+    keys = [cache.key(t) for t in texts]
+    vectors = [cache.get(k) for k in keys]
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        fresh = _batcher.embed([texts[i] for i in missing])
+        for i, vector in zip(missing, fresh):
+            vectors[i] = vector
+            cache.put(keys[i], vector)
+    return np.vstack(vectors).astype("float32")
+
 def embed_text(text: str) -> np.ndarray:
     """Convert text into normalized embedding vector."""
-    model = get_model()
-    vector = model.encode([text], normalize_embeddings=True)[0].astype("float32")
-    return vector
+    return embed_texts([text])[0]
+
+def _refresh_stale(texts: list[str], vectors: np.ndarray, generation: int) -> np.ndarray:
+    """
+    Re-embed if the embedding model was swapped since `generation` was read.
+    Caller holds _index_lock, so the index cannot change model underneath.
+    """
+    if generation == _generation:
+        return vectors
+    return _encode(texts, EMBED_MAX_BATCH_SIZE)
 
 def text_hash(text: str) -> str:
     """Stable SHA256 hash for deduplication."""
     return hashlib.sha256(text.strip().lower().encode("utf-8")).hexdigest()
 
+@_routed
+def contains_hash(doc_hash: str) -> bool:
+    """Indexed duplicate check against the metadata store's UNIQUE hash column."""
+    return metadata.id_for_hash(doc_hash) is not None
+
+@_routed
+def get_by_hash(doc_hash: str) -> dict | None:
+    """Return the metadata stored for a document hash, if any."""
+    return metadata.get_by_hash(doc_hash)
+
+@_routed
+def get_by_text(text: str) -> dict | None:
+    """Return stored metadata for an exact (normalized) text match, if any."""
+    return get_by_hash(text_hash(text))
+
+def _append_vectors(vectors: list[np.ndarray]) -> int:
+    """
+    Assign the next ids and add vectors to the index, the write-ahead log and
+    the re-rank file. Caller holds _index_lock. Returns the first id.
+    """
+    global _next_id
+    matrix = np.array(vectors, dtype="float32")
+    first_id = metadata.reserve_ids(len(matrix), floor=_next_id)
+    ids = np.arange(first_id, first_id + len(matrix), dtype="int64")
+    _next_id = first_id + len(matrix)
+    index.add_with_ids(matrix, ids)
+    _wal.append([(int(i), v, None) for i, v in zip(ids, matrix)])
+    if _raw_vectors is not None:
+        _raw_vectors.write(first_id, matrix)
+    return first_id
+
 # ==============================
 # Document Management
 # ==============================
+@_routed
 def add_document(text: str, url: str, source: str, labels: list[str] = None, auto_save: bool = True):
     """Add a new document to FAISS index + metadata store."""
-    global index, metadata
+    global index
     doc_hash = text_hash(text)
 
-    if any(m.get("hash") == doc_hash for m in metadata):
+    if contains_hash(doc_hash):
         logger.info("Duplicate skipped in FAISS store.")
         return
 
+    generation = _generation
     vector = embed_text(text)
 
     with _index_lock:
-        index.add(np.array([vector]))
-        metadata.append({
+        # Re-check under the lock: a concurrent caller may have added it while we embedded.
+        if contains_hash(doc_hash):
+            logger.info("Duplicate skipped in FAISS store.")
+            return
+        vector = _refresh_stale([text], vector[None, :], generation)[0]
+        meta = {
             "text": text,
             "url": url,
             "source": source,
             "labels": labels or [],
             "hash": doc_hash,
-            "score": None,
             "timestamp": datetime.utcnow().isoformat()
-        })
+        }
+        row_id = _append_vectors([vector])
+        metadata.insert_many([(row_id, meta)])
 
     logger.info(f"Added doc to FAISS: {text[:60]}...")
+    _maybe_promote()
 
     if auto_save:
         save_index()
 
+@_routed
 def add_bulk(docs: list[dict], auto_save: bool = True):
     """Efficiently add multiple documents at once."""
-    global index, metadata
-    new_vectors, new_meta = [], []
+    global index
+    new_meta = []
+    batch_hashes = set()
+    known = metadata.existing_hashes([text_hash(doc["text"]) for doc in docs])
 
     for doc in docs:
         text = doc["text"]
         doc_hash = text_hash(text)
-        if any(m.get("hash") == doc_hash for m in metadata):
+        if doc_hash in batch_hashes or doc_hash in known:
             continue
-        new_vectors.append(embed_text(text))
+        batch_hashes.add(doc_hash)
         new_meta.append({
             "text": text,
             "url": doc.get("url", ""),
@@ -108,11 +302,21 @@ def add_bulk(docs: list[dict], auto_save: bool = True):
             "timestamp": datetime.utcnow().isoformat()
         })
 
-    if new_vectors:
+    if new_meta:
+        generation = _generation
+        new_vectors = embed_texts([m["text"] for m in new_meta])
         with _index_lock:
-            index.add(np.array(new_vectors))
-            metadata.extend(new_meta)
+            new_vectors = list(_refresh_stale([m["text"] for m in new_meta], new_vectors, generation))
+            # Drop anything a concurrent writer inserted while we were embedding.
+            raced = metadata.existing_hashes([m["hash"] for m in new_meta])
+            keep = [i for i, m in enumerate(new_meta) if m["hash"] not in raced]
+            new_vectors = [new_vectors[i] for i in keep]
+            new_meta = [new_meta[i] for i in keep]
+            if new_vectors:
+                first_row = _append_vectors(new_vectors)
+                metadata.insert_many([(first_row + i, m) for i, m in enumerate(new_meta)])
         logger.info(f"Bulk added {len(new_vectors)} docs to FAISS.")
+        _maybe_promote()
 
     if auto_save:
         save_index()
@@ -120,53 +324,692 @@ def add_bulk(docs: list[dict], auto_save: bool = True):
 # ==============================
 # Search
 # ==============================
-def search_similar(query: str, top_k: int = 5) -> list[dict]:
+def search_similar(query: str, top_k: int = 5, **filters) -> list[dict]:
     """Search FAISS index for top-k similar documents."""
-    if index.ntotal == 0:
-        return []
+    return search_similar_many([query], top_k=top_k, **filters)[0]
+
+def _as_timestamp(value) -> str | None:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _fetch_vectors(ids: np.ndarray) -> np.ndarray:
+    """Stored vectors for ids: full precision from the re-rank file if kept, else from the index."""
+    if _raw_vectors is not None:
+        return _raw_vectors.fetch(ids)
+    with _index_lock:
+        return vector_index.reconstruct_ids(index, ids)
+
+def _filtered_search(query_vecs: np.ndarray, top_k: int, rerank: bool, sources=None, labels=None,
+                     since=None, until=None):
+    """
+    Pre-filtered search: resolve the filter to ids in SQLite first, then
+    search only those ids. Small matches are scored exactly; larger ones go
+    through faiss with an ID selector, so top_k never has to be over-fetched.
+    """
+    n_queries = len(query_vecs)
+    no_hits = (np.full((n_queries, top_k), -np.inf, dtype="float32"), np.full((n_queries, top_k), -1, dtype="int64"))
+    since, until = _as_timestamp(since), _as_timestamp(until)
+
+    # Always resolved through the timestamp index: ids are not in timestamp
+    # order (timestamps are taken before ids are reserved, batches interleave,
+    # legacy rows were migrated), so a time window is not an id range.
+    candidates = np.asarray(metadata.filter_ids(sources, labels, since, until), dtype="int64")
+    if not len(candidates):
+        return no_hits
+
+    if len(candidates) <= FILTER_EXACT_LIMIT:
+        return vector_index.exact_top_k(query_vecs, candidates, _fetch_vectors(candidates), top_k)
 
-    query_vec = embed_text(query)
+    selector = faiss.IDSelectorBatch(candidates)  # keeps a reference to `candidates` until the search returns
     with _index_lock:
-        D, I = index.search(np.array([query_vec]), top_k)
+        D, I = vector_index.search_with_selector(
+            index, query_vecs, top_k * RERANK_FACTOR if rerank else top_k, selector, **search_params
+        )
+    if rerank:
+        D, I = vector_index.rerank(query_vecs, I, _raw_vectors.fetch, top_k)
+    return D, I
+
+def _fuse_lexical(queries: list[str], query_vecs: np.ndarray, D: np.ndarray, I: np.ndarray, top_k: int,
+                  n_candidates: int, sources=None, labels=None, since=None, until=None):
+    """
+    Reciprocal rank fusion of the dense candidates with BM25 candidates.
+    Order comes from the fused rank, but returned scores stay cosine
+    similarities (computed exactly for lexical-only hits) so score
+    thresholds keep their meaning. Returns (scores, ids, fused scores).
+    """
+    since, until = _as_timestamp(since), _as_timestamp(until)
+    n_queries = len(queries)
+    out_ids = np.full((n_queries, top_k), -1, dtype="int64")
+    out_scores = np.full((n_queries, top_k), -np.inf, dtype="float32")
+    out_fused = np.zeros((n_queries, top_k), dtype="float32")
+    for q, query in enumerate(queries):
+        cosine = {int(i): float(d) for i, d in zip(I[q], D[q]) if i >= 0}
+        lexical = [doc_id for doc_id, _ in metadata.lexical_search(query, n_candidates, sources, labels, since, until)]
+        fused = vector_index.rrf_fuse([list(cosine), lexical], k=RRF_K)[:top_k]
+        missing = np.asarray([doc_id for doc_id, _ in fused if doc_id not in cosine], dtype="int64")
+        if len(missing):
+            cosine.update(zip(missing.tolist(), (_fetch_vectors(missing) @ query_vecs[q]).tolist()))
+        for rank, (doc_id, fused_score) in enumerate(fused):
+            out_ids[q, rank] = doc_id
+            out_scores[q, rank] = cosine[doc_id]
+            out_fused[q, rank] = fused_score
+    return out_scores, out_ids, out_fused
+
+@_routed
+def search_similar_many(queries: list[str], top_k: int = 5, sources: list[str] = None, labels: list[str] = None,
+                        since: str | datetime = None, until: str | datetime = None,
+                        mode: str = None) -> list[list[dict]]:
+    """
+    Batched search: embed all queries in one pass and run a single
+    index.search over the query matrix. Returns one result list per query.
+
+    Optional filters restrict results to documents from `sources`, carrying
+    any of `labels`, or ingested within [since, until] (ISO strings or datetimes).
+    `mode` ("dense" or "hybrid", default SEARCH_MODE) selects whether BM25
+    matches are fused in; hybrid hits also carry an "rrf_score".
+    """
+    if not queries:
+        return []
+    if index.ntotal == 0:
+        return [[] for _ in queries]
+
+    hybrid = (mode or SEARCH_MODE) == "hybrid" and metadata.lexical
+    k = top_k * HYBRID_CANDIDATES if hybrid else top_k
+    generation = _generation
+    query_vecs = embed_texts(queries)
+    rerank = _raw_vectors is not None and vector_index.is_quantized(index)
+    if sources or labels or since or until:
+        if generation != _generation:
+            query_vecs = _encode(queries, EMBED_MAX_BATCH_SIZE)
+        D, I = _filtered_search(query_vecs, k, rerank, sources, labels, since, until)
+    else:
+        with _index_lock:
+            query_vecs = _refresh_stale(queries, query_vecs, generation)
+            D, I = index.search(query_vecs, k * RERANK_FACTOR if rerank else k)
+        if rerank:
+            D, I = vector_index.rerank(query_vecs, I, _raw_vectors.fetch, k)
+    fused = None
+    if hybrid:
+        D, I, fused = _fuse_lexical(queries, query_vecs, D, I, top_k, k, sources, labels, since, until)
 
+    # Only the top-k rows per query are read from the metadata store, in one lookup.
+    # Ids without a row (evicted, awaiting rebuild) are skipped.
+    rows = metadata.get_many(sorted({int(idx) for idx in I.ravel() if idx >= 0}))
+    now = datetime.utcnow().isoformat()
     results = []
-    for idx, score in zip(I[0], D[0]):
-        if idx < len(metadata):
-            doc = metadata[idx].copy()
-            doc["score"] = float(score)
-            results.append(doc)
+    for q, (ids, scores) in enumerate(zip(I, D)):
+        hits = []
+        for rank, (idx, score) in enumerate(zip(ids, scores)):
+            doc = rows.get(int(idx))
+            if doc is not None:
+                hit = {**doc, "score": float(score)}
+                if fused is not None:
+                    hit["rrf_score"] = float(fused[q, rank])
+                hits.append(hit)
+                _recent_hits[int(idx)] = now
+        results.append(hits)
 
     return results
 
+# ==============================
+# Async API (off the event loop)
+# ==============================
+_executor = ThreadPoolExecutor(max_workers=VECTOR_STORE_WORKERS, thread_name_prefix="vector-store")
+
+async def _run_blocking(fn, *args, **kwargs):
+    """Run a blocking vector store call on the bounded executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+async def asearch_similar(query: str, top_k: int = 5, **filters) -> list[dict]:
+    return await _run_blocking(search_similar, query, top_k=top_k, **filters)
+
+async def asearch_similar_many(queries: list[str], top_k: int = 5, **filters) -> list[list[dict]]:
+    return await _run_blocking(search_similar_many, queries, top_k=top_k, **filters)
+
+async def aadd_document(text: str, url: str, source: str, labels: list[str] = None, auto_save: bool = True):
+    return await _run_blocking(add_document, text, url, source, labels=labels, auto_save=auto_save)
+
+async def aadd_bulk(docs: list[dict], auto_save: bool = True):
+    return await _run_blocking(add_bulk, docs, auto_save=auto_save)
+
+async def asave_index():
+    return await _run_blocking(save_index)
+
+# ==============================
+# ANN Index Promotion
+# ==============================
+@_routed
+def set_search_params(nprobe: int = None, ef_search: int = None):
+    """Tune IVF nprobe / HNSW efSearch at runtime (recall vs latency)."""
+    with _index_lock:
+        if nprobe:
+            search_params["nprobe"] = nprobe
+        if ef_search:
+            search_params["ef_search"] = ef_search
+        vector_index.apply_search_params(index, **search_params)
+
+def _maybe_promote():
+    """Start a background migration to the configured ANN index once the flat index is large enough."""
+    if INDEX_TYPE == "flat" or PROMOTE_THRESHOLD <= 0 or index.ntotal < PROMOTE_THRESHOLD:
+        return
+    if vector_index.index_kind(index) != "flat" or metadata.count() < PROMOTE_THRESHOLD:
+        return  # ntotal counts dead vectors; promote on live docs only
+    start_rebuild(INDEX_TYPE)
+
+@_routed
+def start_rebuild(kind: str = None, model_name: str = None) -> bool:
+    """Run rebuild_index on a background thread. Returns False if a rebuild is already running."""
+    if _rebuild_lock.locked():
+        return False
+    threading.Thread(target=rebuild_index, args=(kind, model_name), name="faiss-rebuild", daemon=True).start()
+    return True
+
+@_routed
+def rebuild_status() -> dict:
+    """Progress of the running rebuild, or the outcome of the last one."""
+    return dict(_rebuild_status)
+
+def _reembed(model, ids: np.ndarray, raw_file: FloatVectorFile = None, report: bool = True) -> np.ndarray:
+    """
+    Embed the stored text of `ids` with `model`, REEMBED_BATCH_SIZE docs at a
+    time. Ids whose row was evicted meanwhile get a zero vector (never returned).
+    """
+    vectors = np.zeros((len(ids), model.get_sentence_embedding_dimension()), dtype="float32")
+    next_log = 0.1
+    for start in range(0, len(ids), REEMBED_BATCH_SIZE):
+        batch = ids[start:start + REEMBED_BATCH_SIZE]
+        rows = metadata.get_many(batch.tolist())
+        present = [i for i, doc_id in enumerate(batch) if int(doc_id) in rows]
+        if present:
+            texts = [rows[int(batch[i])]["text"] for i in present]
+            vectors[start + np.asarray(present)] = model.encode(
+                texts, batch_size=REEMBED_BATCH_SIZE, normalize_embeddings=True
+            )
+        if raw_file is not None:
+            for doc_id, vector in zip(batch, vectors[start:start + len(batch)]):
+                raw_file.write(int(doc_id), vector[None, :])
+        if report:
+            done = start + len(batch)
+            _rebuild_status["done"] = done
+            if done >= next_log * len(ids):
+                logger.info(f"Re-embedding: {done}/{len(ids)} docs")
+                next_log += 0.1
+    return vectors
+
+def _copy_vectors(source, ids: np.ndarray) -> np.ndarray:
+    """
+    Copy the stored vectors of `ids` out of the live index, REBUILD_COPY_CHUNK
+    at a time, taking _index_lock per chunk so searches and adds interleave
+    with the copy. Ids removed meanwhile get a zero vector (never returned).
+    """
+    vectors = np.zeros((len(ids), source.d), dtype="float32")
+    for start in range(0, len(ids), REBUILD_COPY_CHUNK):
+        batch = ids[start:start + REBUILD_COPY_CHUNK]
+        with _index_lock:
+            if index is not source:
+                raise RuntimeError("index replaced during rebuild")
+            kept = np.flatnonzero(~np.isin(batch, np.asarray(_rebuild_removed, dtype="int64")))
+            vectors[start + kept] = vector_index.reconstruct_ids(source, batch[kept])
+        _rebuild_status["done"] = start + len(batch)
+    return vectors
+
+def _swap_model(model_name: str, model, raw_file: FloatVectorFile = None):
+    """Make `model` the live embedding model. Caller holds _index_lock and has just swapped the index."""
+    global MODEL_NAME, _embedding_model, dimension, _embedding_cache, _raw_vectors, _generation
+    old_cache = _embedding_cache
+    MODEL_NAME = model_name
+    _embedding_model = model
+    dimension = index.d
+    _embedding_cache = _open_embedding_cache(model_name, dimension)
+    if raw_file is not None:
+        raw_file.sync()
+        os.replace(raw_file.path, RAW_VECTORS_PATH)
+        fsync_dir(DATA_DIR)
+        raw_file.path = RAW_VECTORS_PATH
+        _raw_vectors = raw_file  # the old file closes once in-flight re-ranks release it
+    _generation += 1
+    old_cache.flush()
+
+@_routed
+def rebuild_index(kind: str = None, model_name: str = None) -> bool:
+    """
+    Build a new index generation from live documents only (dropping evicted
+    and orphan vectors), optionally as a different index type or re-embedded
+    with a different model, then swap it in. Without `kind` the current type
+    is kept, falling back to flat below PROMOTE_THRESHOLD live docs; an
+    explicit `kind` is always honoured.
+    Searches keep reading the old generation throughout: embedding, training
+    and insertion run outside _index_lock, and vectors are copied out of the
+    old generation in chunks; only the id snapshot, each chunk, the catch-up
+    of adds/removals made meanwhile and the swap hold it.
+    """
+    global index, _rebuild_removed
+    if not _rebuild_lock.acquire(blocking=False):
+        return False
+    reembed = bool(model_name) and model_name != MODEL_NAME
+    _rebuild_status.clear()
+    _rebuild_status.update(
+        state="running", phase="snapshot", kind=kind, model=model_name or MODEL_NAME,
+        done=0, total=0, started_at=datetime.utcnow().isoformat(),
+    )
+    swapped = False
+    new_raw = None
+    try:
+        # Ids at or past `cutoff` were added after this query and are live by definition.
+        cutoff = metadata.next_id()
+        alive = np.asarray(metadata.all_ids(), dtype="int64")
+        with _index_lock:
+            source = index
+            snapshot_ids = vector_index.all_ids(source)
+            _rebuild_removed = []
+        ids = snapshot_ids[np.isin(snapshot_ids, alive) | (snapshot_ids >= cutoff)]
+        if kind is None:
+            kind = vector_index.index_kind(source)
+            if kind != "flat" and len(ids) < PROMOTE_THRESHOLD:
+                # Too few live docs to keep an ANN index; promotion re-triggers as it grows.
+                _rebuild_status["downgraded_from"] = kind
+                kind = "flat"
+        elif kind != "flat" and len(ids) < PROMOTE_THRESHOLD:
+            logger.warning(f"Rebuilding as {kind} with {len(ids)} live docs, below FAISS_PROMOTE_THRESHOLD.")
+            _rebuild_status["below_threshold"] = True
+        _rebuild_status.update(kind=kind, total=len(ids))
+
+        if reembed:
+            _rebuild_status["phase"] = "embedding"
+            logger.info(f"Loading embedding model for re-embed: {model_name}")
+            new_model = SentenceTransformer(model_name)
+            if _raw_vectors is not None:
+                new_raw = FloatVectorFile(RAW_VECTORS_PATH + ".next", new_model.get_sentence_embedding_dimension())
+                new_raw.truncate(0)  # leftover from an interrupted re-embed
+            vectors = _reembed(new_model, ids, new_raw)
+        elif _raw_vectors is not None:
+            vectors = _raw_vectors.fetch(ids)  # full precision, even when rebuilding from a quantized index
+        else:
+            _rebuild_status["phase"] = "copying"
+            vectors = _copy_vectors(source, ids)
+
+        _rebuild_status["phase"] = "building"
+        logger.info(f"Rebuilding FAISS index as {kind} ({len(ids)} live of {len(snapshot_ids)} vectors)...")
+        rebuilt = vector_index.build_index(
+            kind, vectors.shape[1], vectors, ids=ids, nlist=IVF_NLIST, pq_m=PQ_M,
+            hnsw_m=HNSW_M, ef_construction=HNSW_EF_CONSTRUCTION,
+        )
+        vectors = None
+
+        _rebuild_status["phase"] = "swapping"
+        with _index_lock:
+            if index is not source:
+                logger.warning("FAISS index replaced during rebuild; discarding rebuilt copy.")
+                _rebuild_status.update(state="failed", error="index replaced during rebuild")
+                return False
+            added = np.setdiff1d(vector_index.all_ids(source), snapshot_ids)
+            if len(added):
+                if reembed:
+                    rebuilt.add_with_ids(_reembed(new_model, added, new_raw, report=False), added)
+                else:
+                    rebuilt.add_with_ids(vector_index.reconstruct_ids(source, added), added)
+            removed = np.asarray(_rebuild_removed, dtype="int64")
+            if len(removed) and vector_index.supports_remove(rebuilt):
+                rebuilt.remove_ids(removed)
+            vector_index.apply_search_params(rebuilt, **search_params)
+            index = rebuilt
+            if reembed:
+                _swap_model(model_name, new_model, new_raw)
+                new_raw = None
+            _wal.pending = max(_wal.pending, 1)  # force the next compaction to snapshot the new index
+            swapped = True
+        source = None  # last reference to the old generation; its memory is freed here
+        logger.info(f"FAISS index rebuilt as {kind} ({rebuilt.ntotal} vectors).")
+    except Exception as e:
+        logger.error(f"FAISS index rebuild failed: {e}")
+        _rebuild_status.update(state="failed", error=str(e))
+    finally:
+        _rebuild_removed = None
+        if new_raw is not None:
+            new_raw.close()
+            os.remove(new_raw.path)
+        _rebuild_lock.release()
+    if swapped:
+        # The WAL still holds vectors from before the swap; a model change is
+        # only recorded once a snapshot of the new generation is on disk.
+        if compact_index(wait=reembed) and reembed:
+            metadata.set_setting("embedding_model", model_name)
+        _rebuild_status.update(state="done", phase=None, finished_at=datetime.utcnow().isoformat())
+    return swapped
+
+# ==============================
+# Eviction
+# ==============================
+@_routed
+def remove_documents(ids: list[int]) -> int:
+    """
+    Remove documents by id. Metadata rows go immediately (so searches stop
+    returning them); vectors are removed in place where the index supports it,
+    otherwise they stay as dead entries until the next rebuild.
+    """
+    ids = np.asarray(sorted({int(i) for i in ids}), dtype="int64")
+    if not len(ids):
+        return 0
+    with _index_lock:
+        removed = metadata.delete_ids(ids.tolist())
+        _wal.append_deletes(ids)
+        if vector_index.supports_remove(index):
+            index.remove_ids(ids)
+        if _rebuild_removed is not None:
+            _rebuild_removed.extend(ids.tolist())
+    for doc_id in ids:
+        _recent_hits.pop(int(doc_id), None)
+    return removed
+
+@_routed
+def evict() -> dict:
+    """One eviction pass: TTL expiry, then LRU down to EVIDENCE_MAX_DOCS."""
+    hits = dict(_recent_hits)
+    for doc_id in hits:
+        _recent_hits.pop(doc_id, None)
+    metadata.touch_many(hits)
+
+    victims = set()
+    if EVIDENCE_TTL_DAYS > 0:
+        cutoff = (datetime.utcnow() - timedelta(days=EVIDENCE_TTL_DAYS)).isoformat()
+        victims.update(metadata.expired_ids(cutoff))
+    if EVIDENCE_MAX_DOCS > 0:
+        excess = metadata.count() - len(victims) - EVIDENCE_MAX_DOCS
+        if excess > 0:
+            lru = [i for i in metadata.least_recent_ids(excess + len(victims)) if i not in victims]
+            victims.update(lru[:excess])
+    evicted = remove_documents(list(victims)) if victims else 0
+    if evicted:
+        logger.info(f"Evicted {evicted} docs from FAISS evidence cache.")
+
+    dead = index.ntotal - metadata.count()
+    if index.ntotal and dead / index.ntotal >= REBUILD_DEAD_FRACTION:
+        start_rebuild()
+    return {"evicted": evicted, "dead_vectors": dead}
+
+def _eviction_loop():
+    while True:
+        time.sleep(EVICTION_INTERVAL)
+        try:
+            evict()
+        except Exception as e:
+            logger.error(f"FAISS eviction pass failed: {e}")
+
+def _start_evictor():
+    global _evictor
+    if EVICTION_INTERVAL > 0 and (_evictor is None or not _evictor.is_alive()):
+        _evictor = threading.Thread(target=_eviction_loop, name="faiss-evictor", daemon=True)
+        _evictor.start()
+
+# ==============================
+# Stats
+# ==============================
+@_routed
+def stats() -> dict:
+    """Counters for the /api/stats endpoint."""
+    live = metadata.count()
+    return {
+        "documents": live,
+        "dead_vectors": index.ntotal - live,
+        "index_type": vector_index.index_kind(index),
+        "wal_pending": _wal.pending,
+        "embedding_model": MODEL_NAME,
+        "embedding_cache": _embedding_cache.stats(),
+        "rebuild": dict(_rebuild_status),
+    }
+
 # ==============================
 # Persistence
 # ==============================
+@_routed
 def save_index():
-    """Persist FAISS index + metadata to disk."""
-    global index, metadata
+    """
+    Make all added documents durable.
+    Adds are already appended to the write-ahead log, so this only fsyncs the
+    active segment; a full snapshot is written by background compaction.
+    """
     with _index_lock:
-        faiss.write_index(index, INDEX_PATH)
-        with open(META_PATH, "w") as f:
-            json.dump(metadata, f, indent=2)
-    logger.info(f"FAISS index + metadata saved ({len(metadata)} docs).")
+        _wal.sync()
+        if _raw_vectors is not None:
+            _raw_vectors.sync()
+        pending = _wal.pending
+    _embedding_cache.flush()
+    if pending >= WAL_COMPACT_RECORDS:
+        threading.Thread(target=compact_index, name="faiss-compact", daemon=True).start()
+
+@_routed
+def compact_index(wait: bool = False) -> bool:
+    """
+    Fold the write-ahead log into a new faiss_index.bin snapshot (metadata is
+    already durable in SQLite). Only the in-memory copy happens under
+    _index_lock; disk writes do not block searches or adds.
+    Returns True once a snapshot of the current index is on disk. With
+    wait=False, returns False immediately if another compaction is running.
+    """
+    if not _compact_lock.acquire(blocking=wait):
+        return False  # another compaction is already running
+    try:
+        with _index_lock:
+            if _wal.pending == 0:
+                return True
+            index_bytes = faiss.serialize_index(index)
+            ntotal = index.ntotal
+            active_seq = _wal.rotate()
+
+        # The sealed segments are the only durable copy of these writes until the snapshot is.
+        write_durably(INDEX_PATH, index_bytes)
+        _wal.drop_before(active_seq)
+        logger.info(f"FAISS snapshot compacted ({ntotal} docs).")
+        return True
+    except Exception as e:
+        logger.error(f"FAISS compaction failed: {e}")
+        return False
+    finally:
+        _compact_lock.release()
+
+def _compaction_loop():
+    while True:
+        time.sleep(WAL_COMPACT_INTERVAL)
+        if _wal.pending:
+            compact_index()
+
+def _start_compactor():
+    global _compactor
+    if WAL_COMPACT_INTERVAL > 0 and (_compactor is None or not _compactor.is_alive()):
+        _compactor = threading.Thread(target=_compaction_loop, name="faiss-compactor", daemon=True)
+        _compactor.start()
+
+def _replay_wal() -> int:
+    """
+    Re-apply logged operations on top of the loaded snapshot. Ids are never
+    reused, so an add is new iff its id is above the snapshot's largest id;
+    deletes are idempotent.
+    """
+    ids = vector_index.all_ids(index)
+    snapshot_max = int(ids.max()) if len(ids) else -1
+    removable = vector_index.supports_remove(index)
+    applied = set()
+    for op, doc_id, vector, _ in _wal.replay():
+        if op == "del":
+            if removable:
+                index.remove_ids(np.array([doc_id], dtype="int64"))
+            continue
+        if _raw_vectors is not None:
+            _raw_vectors.write(doc_id, vector[None, :])
+        if doc_id > snapshot_max and doc_id not in applied:
+            index.add_with_ids(vector[None, :], np.array([doc_id], dtype="int64"))
+            applied.add(doc_id)
+    return len(applied)
+
+def _sync_raw_vectors():
+    """Line the re-rank file up with the index after load."""
+    if _raw_vectors is None:
+        return
+    if _raw_vectors.rows > _next_id:
+        _raw_vectors.truncate(_next_id)
+    elif _raw_vectors.rows < _next_id:
+        if vector_index.is_quantized(index):
+            logger.warning("Re-rank vectors backfilled from a quantized index; re-embed to restore full precision.")
+        ids = vector_index.all_ids(index)
+        ids = np.sort(ids[ids >= _raw_vectors.rows])
+        for doc_id, vector in zip(ids, vector_index.reconstruct_ids(index, ids)):
+            _raw_vectors.write(int(doc_id), vector[None, :])
+
+def _reconcile_model() -> str | None:
+    """
+    The index must be queried with the model that embedded it. If
+    EMBEDDING_MODEL changed since, keep serving with the recorded model and
+    return the configured one, to re-embed into in the background.
+    """
+    global MODEL_NAME, _embedding_cache
+    recorded = metadata.get_setting("embedding_model")
+    if recorded is None or metadata.count() == 0:
+        metadata.set_setting("embedding_model", MODEL_NAME)
+        return None
+    if recorded == MODEL_NAME:
+        return None
+    target = MODEL_NAME
+    logger.warning(f"Index was embedded with {recorded}; serving with it while re-embedding with {target}.")
+    MODEL_NAME = recorded
+    _embedding_cache = _open_embedding_cache(recorded, dimension)
+    return target
+
+def _claim_data_dir():
+    """
+    Take an exclusive lock on DATA_DIR. The index, WAL segments and snapshot
+    have a single writer; a second local-mode process (e.g. another uvicorn
+    worker) would clobber them, so it is refused here.
+    """
+    global _owner_lock
+    lock = open(OWNER_LOCK_PATH, "a+")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        raise RuntimeError(
+            f"Vector store in {DATA_DIR} is already owned by another process. With several workers, run "
+            "`python -m services.vector_service` once and start the workers with VECTOR_STORE_MODE=client."
+        )
+    _owner_lock = lock
 
 def load_index():
-    """Load FAISS index + metadata from disk if available."""
-    global index, metadata
+    """Load FAISS snapshot + write-ahead log from disk if available."""
+    global index, _next_id
+    _wal.close()
+    target_model = None
     try:
+        metadata.migrate_from_json(LEGACY_META_PATH, text_hash)
+        target_model = _reconcile_model()
         if os.path.exists(INDEX_PATH):
-            index = faiss.read_index(INDEX_PATH)
+            # Snapshots written before ID mapping are upgraded (id = row position).
+            loaded = faiss.read_index(INDEX_PATH)
+            index = vector_index.ensure_id_mapped(loaded)
+            upgraded = index is not loaded
             logger.info("FAISS index loaded.")
-        if os.path.exists(META_PATH):
-            with open(META_PATH, "r") as f:
-                metadata = json.load(f)
-            logger.info(f"Loaded {len(metadata)} metadata entries.")
+        else:
+            upgraded = False
+        replayed = _replay_wal()
+        if replayed:
+            logger.info(f"Replayed {replayed} docs from FAISS write-ahead log.")
+        ids = vector_index.all_ids(index)
+        max_index_id = int(ids.max()) if len(ids) else -1
+        _next_id = max(metadata.next_id(), max_index_id + 1)
+        _sync_raw_vectors()
+        # Metadata rows whose vector never reached the log (crash mid-add) would
+        # block re-ingestion of that text via the UNIQUE hash; drop them.
+        orphans = metadata.delete_from(max_index_id + 1)
+        if orphans:
+            logger.warning(f"Dropped {orphans} metadata rows without vectors.")
+        logger.info(f"Vector store ready with {index.ntotal} docs.")
     except Exception as e:
         logger.error(f"Failed to load FAISS index/metadata: {e}")
-        index = faiss.IndexFlatIP(dimension)
-        metadata = []
+        index = vector_index.empty_index(dimension)
+        _next_id = metadata.next_id()
+        replayed = 0
+        upgraded = False
+    vector_index.apply_search_params(index, **search_params)
+    _wal.open()
+    _wal.pending = replayed  # replayed records are folded in by the next compaction
+    if upgraded:
+        _wal.pending = max(_wal.pending, 1)
+    _start_compactor()
+    _start_evictor()
+    if target_model:
+        start_rebuild(model_name=target_model)
+    else:
+        _maybe_promote()
+
+# ==============================
+# Benchmark
+# ==============================
+def _keyword_query(text: str) -> str:
+    """Entity-style query for a doc: its numbers and capitalized words, else every other word."""
+    words = text.split()
+    entities = [w for i, w in enumerate(words) if any(c.isdigit() for c in w) or (i and w[:1].isupper())]
+    return " ".join(entities if len(entities) >= 2 else words[::2])
+
+def benchmark_hybrid(dataset_path: str = "data/disinfo_dataset.csv", sample_size: int = 1000, top_k: int = 5) -> dict:
+    """
+    Dense vs lexical vs hybrid on a labeled sample: the dataset rows plus up
+    to `sample_size` stored docs, each queried by its entities (numbers,
+    names). A query hits if its own doc is in the top_k. Reports hit@k, MRR
+    and ms/query. Runs on a temporary copy; the live store is untouched.
+    """
+    import csv
+    import tempfile
+
+    texts = []
+    if os.path.exists(dataset_path):
+        with open(dataset_path, newline="", encoding="utf-8") as f:
+            texts.extend(row["text"] for row in csv.DictReader(f) if row.get("text"))
+    for doc in metadata.iter_all():
+        if len(texts) >= sample_size + 100:
+            break
+        texts.append(doc["text"])
+    texts = list(dict.fromkeys(texts))
+
+    store = MetadataStore(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    store.insert_many([(i, {"text": t, "hash": text_hash(t)}) for i, t in enumerate(texts)])
+    bench_index = vector_index.build_index("flat", dimension, _encode(texts, EMBED_MAX_BATCH_SIZE))
+    queries = [_keyword_query(t) for t in texts]
+    query_vecs = _encode(queries, EMBED_MAX_BATCH_SIZE)
+    n_candidates = top_k * HYBRID_CANDIDATES
+
+    def dense(q):
+        return [int(i) for i in bench_index.search(query_vecs[q:q + 1], n_candidates)[1][0] if i >= 0]
+
+    def lexical(q):
+        return [doc_id for doc_id, _ in store.lexical_search(queries[q], n_candidates)]
+
+    def hybrid(q):
+        return [doc_id for doc_id, _ in vector_index.rrf_fuse([dense(q), lexical(q)], k=RRF_K)]
+
+    report = {"docs": len(texts), "top_k": top_k}
+    for name, ranker in (("dense", dense), ("lexical", lexical), ("hybrid", hybrid)):
+        hits, reciprocal_ranks = 0, 0.0
+        started = time.perf_counter()
+        for q in range(len(queries)):
+            ranked = ranker(q)[:top_k]
+            if q in ranked:
+                hits += 1
+                reciprocal_ranks += 1 / (ranked.index(q) + 1)
+        elapsed = time.perf_counter() - started
+        report[name] = {
+            "hit_at_k": round(hits / len(queries), 3),
+            "mrr": round(reciprocal_ranks / len(queries), 3),
+            "ms_per_query": round(elapsed * 1000 / len(queries), 3),
+        }
+    return report
 
 # ==============================
 # Auto-load on import
 # ==============================
-load_index()
+if VECTOR_STORE_MODE == "client":
+    _service_client = VectorStoreClient(VECTOR_STORE_SOCKET, authkey_path=AUTHKEY_PATH)
+    logger.info(f"Vector store in client mode via {VECTOR_STORE_SOCKET}")
+else:
+    _claim_data_dir()
+    load_index()
+
+if __name__ == "__main__":
+    print(benchmark_hybrid())
@@ -0,0 +1,143 @@
+import os
+import re
+import json
+import base64
+import numpy as np
+from core.logger import setup_logger
+
+logger = setup_logger()
+
+
+def fsync_dir(directory: str):
+    """Make renames and newly created files in `directory` durable."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_durably(path: str, data):
+    """Write `data` (any bytes-like object) to `path` atomically: fsynced temp file, rename, fsynced directory."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    fsync_dir(os.path.dirname(path) or ".")
+
+
+class SegmentLog:
+    """
+    Append-only write-ahead log for the FAISS store.
+
+    Each record is one JSON line: an add holds the document id, the float32
+    vector (base64) and optionally a metadata dict; a delete holds only the
+    id. An operation therefore costs O(document), not O(corpus). The log is split into numbered segments:
+
+        faiss_wal.000001.jsonl, faiss_wal.000002.jsonl, ...
+
+    Compaction seals the active segment (`rotate`), writes a snapshot, then
+    deletes the sealed segments (`drop_before`). Startup replays every
+    remaining segment on top of the snapshot.
+    """
+
+    def __init__(self, directory: str, prefix: str = "faiss_wal"):
+        self.directory = directory
+        self.prefix = prefix
+        self._pattern = re.compile(rf"^{re.escape(prefix)}\.(\d+)\.jsonl$")
+        self._fh = None
+        self.active_seq = 0
+        self.pending = 0  # records appended since the last compaction
+
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{self.prefix}.{seq:06d}.jsonl")
+
+    def segments(self) -> list[int]:
+        """Sequence numbers of all segments on disk, oldest first."""
+        seqs = []
+        for name in os.listdir(self.directory):
+            match = self._pattern.match(name)
+            if match:
+                seqs.append(int(match.group(1)))
+        return sorted(seqs)
+
+    def open(self):
+        """Start a fresh active segment after any that already exist."""
+        existing = self.segments()
+        self.active_seq = (existing[-1] if existing else 0) + 1
+        self._fh = open(self._path(self.active_seq), "a", encoding="utf-8")
+        fsync_dir(self.directory)
+
+    def close(self):
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+    def append(self, records: list[tuple[int, np.ndarray, dict]]):
+        """Append (row_id, vector, metadata-or-None) records and flush to the OS."""
+        if self._fh is None:
+            self.open()
+        lines = []
+        for row_id, vector, meta in records:
+            record = {
+                "id": int(row_id),
+                "vector": base64.b64encode(np.asarray(vector, dtype="float32").tobytes()).decode("ascii"),
+            }
+            if meta is not None:
+                record["meta"] = meta
+            lines.append(json.dumps(record) + "\n")
+        self._fh.write("".join(lines))
+        self._fh.flush()
+        self.pending += len(records)
+
+    def append_deletes(self, ids):
+        """Append delete records for the given document ids."""
+        if self._fh is None:
+            self.open()
+        self._fh.write("".join(json.dumps({"id": int(i), "op": "del"}) + "\n" for i in ids))
+        self._fh.flush()
+        self.pending += len(ids)
+
+    def sync(self):
+        """fsync the active segment so appended records survive a crash."""
+        if self._fh:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def rotate(self) -> int:
+        """Seal the active segment and open the next one. Returns the new active seq."""
+        self.sync()
+        self.close()
+        self.active_seq += 1
+        self._fh = open(self._path(self.active_seq), "a", encoding="utf-8")
+        fsync_dir(self.directory)
+        self.pending = 0
+        return self.active_seq
+
+    def drop_before(self, seq: int):
+        """Delete sealed segments that are now covered by a snapshot. The snapshot must already be durable."""
+        for old in self.segments():
+            if old < seq:
+                try:
+                    os.remove(self._path(old))
+                except OSError as e:
+                    logger.warning(f"[WAL] Could not remove segment {old}: {e}")
+
+    def replay(self):
+        """Yield (op, id, vector, metadata) for every intact record, oldest first. op is "add" or "del"."""
+        for seq in self.segments():
+            with open(self._path(seq), "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f, start=1):
+                    try:
+                        record = json.loads(line)
+                        if record.get("op") == "del":
+                            yield "del", record["id"], None, None
+                            continue
+                        vector = np.frombuffer(base64.b64decode(record["vector"]), dtype="float32")
+                    except (ValueError, KeyError) as e:
+                        # A torn final write is expected after a crash; skip it.
+                        logger.warning(f"[WAL] Skipping bad record in segment {seq} line {line_no}: {e}")
+                        continue
+                    yield "add", record["id"], vector, record.get("meta")
@@ -0,0 +1,78 @@
+import time
+import threading
+import numpy as np
+
+from services.embedding_batcher import EmbeddingBatcher
+
+
+class RecordingEncoder:
+    """encode_fn stand-in: one row per text holding its length, plus a log of batch sizes."""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, texts, batch_size=None):
+        self.batches.append(len(texts))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return np.array([[len(text)] for text in texts], dtype="float32")
+
+
+def embed_concurrently(batcher, submissions):
+    """Call batcher.embed for every submission from its own thread at once; returns results in order."""
+    results = [None] * len(submissions)
+    barrier = threading.Barrier(len(submissions))
+
+    def call(i):
+        barrier.wait()
+        try:
+            results[i] = batcher.embed(submissions[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(submissions))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results
+
+
+def test_concurrent_callers_share_one_encode_call():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingBatcher(encoder, max_batch_size=64, max_wait_ms=300)
+    submissions = [["a"], ["bb", "ccc"], ["dddd"], ["eeeee", "ffffff"]]
+
+    results = embed_concurrently(batcher, submissions)
+
+    assert encoder.batches == [6]
+    assert batcher.batches_run == 1
+    assert batcher.texts_encoded == 6
+    # Every caller gets back exactly its own rows, in order.
+    for texts, rows in zip(submissions, results):
+        assert rows[:, 0].tolist() == [len(text) for text in texts]
+
+
+def test_full_batch_runs_without_waiting_out_the_window():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingBatcher(encoder, max_batch_size=2, max_wait_ms=5000)
+
+    start = time.monotonic()
+    rows = batcher.embed(["a", "bb"])
+
+    assert time.monotonic() - start < 2
+    assert rows.shape == (2, 1)
+    assert encoder.batches == [2]
+
+
+def test_encode_error_reaches_every_caller_in_the_batch():
+    batcher = EmbeddingBatcher(RecordingEncoder(fail=True), max_batch_size=64, max_wait_ms=300)
+
+    results = embed_concurrently(batcher, [["a"], ["b"], ["c"]])
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    # The worker survives a failed batch.
+    batcher.encode_fn = RecordingEncoder()
+    assert batcher.embed(["abc"])[0, 0] == 3
+
@@ -0,0 +1,60 @@
+import numpy as np
+
+from services.embedding_cache import EmbeddingCache
+
+DIMENSION = 4
+
+
+def _vector(value: float) -> np.ndarray:
+    return np.full(DIMENSION, value, dtype="float32")
+
+
+def _cache(directory, **kwargs) -> EmbeddingCache:
+    return EmbeddingCache(str(directory), "test-model", DIMENSION, **kwargs)
+
+
+def test_key_is_case_sensitive_and_per_model(tmp_path):
+    cache = _cache(tmp_path, disk_capacity=0)
+    other = EmbeddingCache(str(tmp_path), "other-model", DIMENSION, disk_capacity=0)
+
+    assert cache.key("US economy") != cache.key("us economy")
+    assert cache.key("US economy") != other.key("US economy")
+
+
+def test_disk_tier_survives_reopen(tmp_path):
+    cache = _cache(tmp_path, memory_size=0, disk_capacity=8)
+    key = cache.key("claim")
+    cache.put(key, _vector(1.0))
+    cache.flush()
+
+    reopened = _cache(tmp_path, memory_size=0, disk_capacity=8)
+
+    np.testing.assert_array_equal(reopened.get(key), _vector(1.0))
+    assert reopened.stats()["hits_disk"] == 1
+
+
+def test_disk_tier_evicts_oldest_when_full(tmp_path):
+    cache = _cache(tmp_path, memory_size=0, disk_capacity=2)
+    keys = [cache.key(f"claim {i}") for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, _vector(i))
+
+    assert cache.get(keys[0]) is None
+    np.testing.assert_array_equal(cache.get(keys[1]), _vector(1))
+    np.testing.assert_array_equal(cache.get(keys[2]), _vector(2))
+    assert cache.stats()["disk_entries"] == 2
+
+
+def test_slot_reused_by_another_process_is_a_miss(tmp_path):
+    ours = _cache(tmp_path, memory_size=0, disk_capacity=1)
+    key = ours.key("claim")
+    ours.put(key, _vector(1.0))
+    ours.flush()
+
+    # A second process sharing the files reuses the only slot for another text.
+    theirs = _cache(tmp_path, memory_size=0, disk_capacity=1)
+    theirs.put(theirs.key("other claim"), _vector(2.0))
+    theirs.flush()
+
+    assert ours.get(key) is None
+    assert ours.stats()["misses"] == 1
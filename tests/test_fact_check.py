@@ -0,0 +1,406 @@
+import json
+import asyncio
+import uuid
+import pytest
+
+from services import gemini_client, factcheck_client
+from services.llm_cache import LLMCache, llm_cache
+from services.request_context import request_scope
+from services.google_factcheck import query_factcheck_api
+from modules.fact_check import fact_check_api
+
+
+class FakeGemini:
+    """Stands in for genai.GenerativeModel and counts generate calls per prompt kind."""
+
+    calls = {"fact_check": 0, "reasoning": 0}
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    async def generate_content_async(self, prompt):
+        if "fallacies" in prompt:
+            FakeGemini.calls["reasoning"] += 1
+            text = json.dumps({"fallacy": [], "bias": [], "debiased_text": "x", "generative_explainer": "x"})
+        else:
+            FakeGemini.calls["fact_check"] += 1
+            text = json.dumps({"verdict": "False", "confidence": 90, "reasoning": "x", "relevant_sources": []})
+        part = type("Part", (), {"text": text})
+        content = type("Content", (), {"parts": [part]})
+        return type("Response", (), {"candidates": [type("Candidate", (), {"content": content})]})
+
+
+class FakeResponse:
+    status = 200
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return {"claims": [
+            {"text": "claim", "claimReview": [{"url": "https://example.org/review", "languageCode": "en"}]},
+            {"text": "Behauptung", "claimReview": [{"url": "https://example.de/pruefung", "languageCode": "de"}]},
+        ]}
+
+
+class FakeSession:
+    gets = 0
+    params = None
+
+    def get(self, url, **kwargs):
+        FakeSession.gets += 1
+        FakeSession.params = kwargs.get("params")
+        return FakeResponse()
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    FakeGemini.calls = {"fact_check": 0, "reasoning": 0}
+    FakeSession.gets = 0
+    monkeypatch.setattr(gemini_client.genai, "GenerativeModel", FakeGemini)
+    monkeypatch.setattr(factcheck_client, "get_session", lambda: FakeSession())
+    monkeypatch.setattr(llm_cache, "mode", "bypass")
+
+    async def no_provenance(claim_text, media_file=None):
+        return {}
+
+    async def no_social_signals(claim, limit=5):
+        return []
+
+    monkeypatch.setattr(fact_check_api, "provenance_pipeline", no_provenance)
+    monkeypatch.setattr(fact_check_api, "fetch_social_signals", no_social_signals)
+
+
+@pytest.mark.asyncio
+async def test_factcheck_runs_each_llm_call_once_per_request(fakes):
+    claim = f"The moon is made of cheese {uuid.uuid4()}"
+    with request_scope():
+        result = await fact_check_api._run_factcheck(claim)
+
+    assert result["verdict"] == "False"
+    # unified_factcheck and reasoning_pipeline both ask for the reasoning prompt.
+    assert FakeGemini.calls == {"fact_check": 1, "reasoning": 1}
+    assert FakeSession.gets == 1
+
+
+@pytest.mark.asyncio
+async def test_factcheck_connectors_share_one_api_call(fakes):
+    claim = f"Vaccines contain microchips {uuid.uuid4()}"
+    with request_scope():
+        urls = await query_factcheck_api(claim)
+        articles = await factcheck_client.fetch_factcheck_articles(claim)
+
+    assert urls == ["https://example.org/review", "https://example.de/pruefung"]
+    # The article view keeps only English reviews, as it did when it sent languageCode itself.
+    assert [article["url"] for article in articles] == ["https://example.org/review"]
+    assert FakeSession.gets == 1
+    assert sorted(FakeSession.params) == ["key", "query"]
+
+
+@pytest.mark.asyncio
+async def test_gateway_honours_retry_after_from_fake_server():
+    from aiohttp import web
+
+    runner = web.AppRunner(gemini_client.fake_gemini_app(rate_limit_every=2, retry_after=0.2, text="ok"))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    gateway = gemini_client.LLMGateway(rpm=600, tpm=100000, max_concurrency=1, backoff_base=0.05,
+                                       api_base=f"http://127.0.0.1:{port}")
+    try:
+        # Second call is answered with a 429; the gateway waits out Retry-After and retries.
+        assert [await gateway.generate("a"), await gateway.generate("b")] == ["ok", "ok"]
+    finally:
+        await runner.cleanup()
+
+    stats = gateway.stats()
+    assert stats["rate_limited"] == 1
+    assert stats["retries"] == 1
+    assert stats["succeeded"] == 2
+
+
+def _gateway_with(send, **kwargs) -> gemini_client.LLMGateway:
+    gateway = gemini_client.LLMGateway(rpm=600, tpm=100000, max_concurrency=1, backoff_base=0.01, **kwargs)
+    gateway._send_sdk = send
+    return gateway
+
+
+@pytest.mark.asyncio
+async def test_gateway_does_not_retry_rejected_calls():
+    calls = []
+
+    async def send(prompt):
+        calls.append(prompt)
+        raise PermissionError("API key not valid")
+
+    gateway = _gateway_with(send)
+    with pytest.raises(gemini_client.LLMGatewayError):
+        await gateway.generate("a")
+
+    assert len(calls) == 1
+    assert gateway.stats()["retries"] == 0
+    assert gateway.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_gateway_retries_transient_errors():
+    calls = []
+
+    async def send(prompt):
+        calls.append(prompt)
+        if len(calls) == 1:
+            raise gemini_client.TransientError("HTTP 503")
+        return "ok", None
+
+    gateway = _gateway_with(send)
+    assert await gateway.generate("a") == "ok"
+    assert len(calls) == 2
+    assert gateway.stats()["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_gateway_queue_timeout_counts_as_failed():
+    started = asyncio.Event()
+
+    async def send(prompt):
+        started.set()
+        await asyncio.sleep(0.5)
+        return "ok", None
+
+    gateway = _gateway_with(send, queue_timeout=0.05)
+    holder = asyncio.ensure_future(gateway.generate("a"))
+    await started.wait()
+    with pytest.raises(gemini_client.LLMGatewayError):
+        await gateway.generate("b")
+    await holder
+
+    stats = gateway.stats()
+    assert stats["queue_timeouts"] == 1
+    assert stats["failed"] == 1
+    assert stats["succeeded"] == 1
+
+
+def _delayed(seconds, value=None, error=None, calls=None):
+    async def stage(*args, **kwargs):
+        if calls is not None:
+            calls.append((args, kwargs))
+        await asyncio.sleep(seconds)
+        if error is not None:
+            raise error
+        return value
+
+    return stage
+
+
+@pytest.fixture
+def stream_stages(monkeypatch):
+    """Stub every stage of the streaming pipeline; tests override delays per stage."""
+    verdict_calls = []
+    stages = {
+        "query_factcheck_api": _delayed(0.05, ["https://example.org/review"]),
+        "provenance_pipeline": _delayed(0.02, {"origin": "x"}),
+        "fetch_social_signals": _delayed(0, [{"platform": "reddit"}]),
+        "gemini_fact_check_prompt": _delayed(0.01, {"verdict": "False", "confidence": 80,
+                                                    "relevant_sources": ["https://example.org/review"]},
+                                             calls=verdict_calls),
+        "gemini_reasoning_prompt": _delayed(0.01, {"fallacy": ["strawman"], "debiased_text": "y"}),
+        "reasoning_pipeline": _delayed(0.03, {"bias": ["framing"]}),
+    }
+    for name, stage in stages.items():
+        monkeypatch.setattr(fact_check_api, name, stage)
+    monkeypatch.setattr(fact_check_api, "sign_record", lambda claim: {"ledger_hash": "h", "signed_at": "t"})
+    monkeypatch.setattr(fact_check_api, "GEMINI_PROMPT_MODE", "separate")
+    return verdict_calls
+
+
+async def _stream(claim: str) -> list[tuple[str, object]]:
+    events = []
+    async for chunk in fact_check_api._factcheck_events(claim):
+        event, data = chunk.strip().split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_stages_as_they_complete(stream_stages):
+    events = await _stream("The moon is made of cheese")
+    names = [name for name, _ in events]
+
+    assert names[0] == "accepted"
+    assert names[-2:] == ["ledger", "done"]
+    # Fastest stage first; the verdict only starts once its evidence is in.
+    assert names.index("social_signals") < names.index("evidence") < names.index("verdict")
+    assert sorted(names[1:-2]) == ["evidence", "provenance", "reasoning", "social_signals", "verdict"]
+    assert stream_stages[0][1]["evidence"] == ["https://example.org/review"]
+
+    done = dict(events)["done"]
+    assert done["verdict"] == "False"
+    assert done["reasoning"]["fallacy"] == ["strawman"]
+    assert done["reasoning"]["bias"] == ["framing"]
+    assert done["ledger_status"] == {"ledger_hash": "h", "signed_at": "t"}
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_a_failed_stage_and_still_finishes(stream_stages, monkeypatch):
+    monkeypatch.setattr(fact_check_api, "query_factcheck_api", _delayed(0, error=RuntimeError("quota")))
+
+    events = await _stream("Vaccines contain microchips")
+    names = [name for name, _ in events]
+
+    assert ("error", {"stage": "evidence", "detail": "quota"}) in events
+    assert names.index("error") < names.index("evidence") < names.index("verdict")
+    assert dict(events)["evidence"]["items"] == []
+    assert names[-1] == "done"
+
+
+@pytest.mark.asyncio
+async def test_combined_mode_streams_reasoning_after_the_verdict(stream_stages, monkeypatch):
+    monkeypatch.setattr(fact_check_api, "GEMINI_PROMPT_MODE", "combined")
+
+    names = [name for name, _ in await _stream("The moon is made of cheese")]
+
+    assert names.index("verdict") < names.index("reasoning") < names.index("done")
+
+
+# ---------- combined prompt mode (user-024) ----------
+COMBINED = {"verdict": "false", "confidence": "85", "reasoning": "r", "relevant_sources": ["s"],
+            "fallacy": ["strawman"], "bias": [], "debiased_text": "d", "generative_explainer": "e"}
+
+
+def test_validate_combined_normalizes_a_complete_answer():
+    result, defaulted = gemini_client._validate_combined(dict(COMBINED), "claim", ["ev"])
+
+    assert defaulted == []
+    assert result["verdict"] == "False"
+    assert result["confidence"] == 85
+    assert set(result) == set(gemini_client.FACT_CHECK_FIELDS + gemini_client.REASONING_FIELDS)
+
+
+def test_validate_combined_defaults_each_bad_field():
+    parsed = {**COMBINED, "verdict": "Probably", "confidence": "high", "fallacy": "none", "debiased_text": None}
+    del parsed["bias"]
+
+    result, defaulted = gemini_client._validate_combined(parsed, "claim", ["ev"])
+
+    assert sorted(defaulted) == ["bias", "confidence", "debiased_text", "fallacy", "verdict"]
+    assert result["verdict"] == "Unverified"
+    assert result["confidence"] == 0
+    assert result["fallacy"] == result["bias"] == []
+    assert result["debiased_text"] == "claim"
+    assert result["reasoning"] == "r"  # valid fields are kept
+
+    with pytest.raises(ValueError):
+        gemini_client._validate_combined(["not", "an", "object"], "claim", [])
+
+
+@pytest.fixture
+def combined_mode(scripted_gemini, monkeypatch):
+    """Combined prompt mode over the scripted transport."""
+    monkeypatch.setattr(gemini_client, "GEMINI_PROMPT_MODE", "combined")
+    replies, prompts, _ = scripted_gemini
+    return replies, prompts
+
+
+@pytest.mark.asyncio
+async def test_combined_answer_serves_both_prompts_from_one_call(combined_mode):
+    replies, prompts = combined_mode
+    replies.append("```json\n" + json.dumps(COMBINED) + "\n```")
+    claim = f"The moon is made of cheese {uuid.uuid4()}"
+
+    with request_scope():
+        verdict = await gemini_client.gemini_fact_check_prompt(claim, ["ev"])
+        reasoning = await gemini_client.gemini_reasoning_prompt(claim)
+
+    assert len(prompts) == 1
+    assert verdict == {"verdict": "False", "confidence": 85, "reasoning": "r", "relevant_sources": ["s"]}
+    assert reasoning == {"fallacy": ["strawman"], "bias": [], "debiased_text": "d", "generative_explainer": "e"}
+
+
+@pytest.mark.asyncio
+async def test_combined_answer_reasks_bad_json_once_then_falls_back(combined_mode):
+    replies, prompts = combined_mode
+    replies.append("not json")
+
+    verdict = await gemini_client.gemini_fact_check_prompt(f"claim {uuid.uuid4()}", ["ev"])
+
+    assert len(prompts) == 2
+    assert verdict["verdict"] == "Unverified"
+    assert verdict["relevant_sources"] == ["ev"]
+
+
+@pytest.mark.asyncio
+async def test_combined_answer_does_not_retry_gateway_errors(combined_mode):
+    replies, prompts = combined_mode
+    replies.append(gemini_client.LLMGatewayError("rejected"))
+    claim = f"claim {uuid.uuid4()}"
+
+    combined = await gemini_client.gemini_combined_prompt(claim, [])
+
+    assert len(prompts) == 1
+    assert combined == gemini_client._combined_fallback(claim, [])
+
+
+# ---------- malformed answers are never cached (user-022) ----------
+@pytest.fixture
+def scripted_gemini(monkeypatch, tmp_path):
+    """Real gateway and LLM cache over a transport that plays back `replies` (the last one repeats)."""
+    replies, prompts = [], []
+
+    async def send(prompt):
+        prompts.append(prompt)
+        reply = replies.pop(0) if len(replies) > 1 else replies[0]
+        if isinstance(reply, Exception):
+            raise reply
+        return reply, None
+
+    cache = LLMCache(str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(gemini_client, "gateway", _gateway_with(send))
+    monkeypatch.setattr(gemini_client, "llm_cache", cache)
+    monkeypatch.setattr(gemini_client, "GEMINI_PROMPT_MODE", "separate")
+    return replies, prompts, cache
+
+
+@pytest.mark.asyncio
+async def test_empty_answer_is_retried_and_never_cached(scripted_gemini):
+    replies, prompts, cache = scripted_gemini
+    replies.append("")
+
+    verdict = await gemini_client.gemini_fact_check_prompt(f"claim {uuid.uuid4()}", ["ev"])
+
+    assert verdict["verdict"] == "Unverified"
+    assert len(prompts) == 2  # one re-ask, then the fallback
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_answer_missing_required_keys_is_retried_before_caching(scripted_gemini):
+    replies, prompts, cache = scripted_gemini
+    replies.extend([json.dumps({"debiased_text": "d"}), json.dumps({"fallacy": [], "bias": ["framing"]})])
+    claim = f"claim {uuid.uuid4()}"
+
+    reasoning = await gemini_client.gemini_reasoning_prompt(claim)
+
+    assert reasoning["bias"] == ["framing"]
+    assert len(prompts) == 2
+    assert cache.stats()["entries"] == 1
+    assert await gemini_client.gemini_reasoning_prompt(claim) == reasoning  # served from the cache
+    assert len(prompts) == 2
+
+
+@pytest.mark.asyncio
+async def test_malformed_answer_reask_shares_the_gateway_retry_budget(scripted_gemini):
+    replies, prompts, _ = scripted_gemini
+    replies.extend(["not json", gemini_client.TransientError("HTTP 503")])
+
+    verdict = await gemini_client.gemini_fact_check_prompt(f"claim {uuid.uuid4()}", ["ev"])
+
+    assert verdict["verdict"] == "Unverified"
+    # Re-ask plus transient retries never exceed the gateway's max_retries upstream calls.
+    assert len(prompts) == gemini_client.gateway.max_retries
+    stats = gemini_client.gateway.stats()
+    assert stats["malformed"] == 1
+    assert stats["failed"] == 1
@@ -0,0 +1,93 @@
+import time
+import threading
+import pytest
+
+from services.ingest_queue import IngestQueue
+
+
+class RecordingIngest:
+    def __init__(self, fail_first: bool = False):
+        self.batches = []
+        self.fail_first = fail_first
+
+    def __call__(self, docs):
+        if self.fail_first and not self.batches:
+            self.batches.append(None)
+            raise RuntimeError("index unavailable")
+        self.batches.append([doc["text"] for doc in docs])
+
+
+def make_queue(ingest, **kwargs) -> IngestQueue:
+    # A long wait keeps submitted docs pending until flush(), so the tests control when batches run.
+    return IngestQueue(ingest, key_fn=str.lower, **{"batch_size": 64, "max_wait_ms": 10_000, **kwargs})
+
+
+def docs(*texts):
+    return [{"text": text} for text in texts]
+
+
+def test_full_queue_drops_newest_by_default():
+    ingest = RecordingIngest()
+    queue = make_queue(ingest, max_size=2)
+
+    assert queue.submit(docs("a", "b", "c")) == 2
+    assert queue.stats()["depth"] == 2
+    assert queue.flush(timeout=5)
+
+    assert ingest.batches == [["a", "b"]]
+    assert queue.counters["dropped"] == 1
+
+
+def test_drop_oldest_keeps_the_latest_docs():
+    ingest = RecordingIngest()
+    queue = make_queue(ingest, max_size=2, policy="drop_oldest")
+
+    assert queue.submit(docs("a", "b", "c")) == 3
+    assert queue.flush(timeout=5)
+
+    assert ingest.batches == [["b", "c"]]
+    assert queue.counters["dropped"] == 1
+
+
+def test_pending_duplicates_are_coalesced():
+    ingest = RecordingIngest()
+    queue = make_queue(ingest)
+
+    queue.submit(docs("Claim", "other"))
+    assert queue.submit(docs("CLAIM")) == 0
+    assert queue.flush(timeout=5)
+
+    assert ingest.batches == [["Claim", "other"]]
+    assert queue.counters["coalesced"] == 1
+
+
+def test_flush_drains_in_batches_and_survives_a_failed_batch():
+    ingest = RecordingIngest(fail_first=True)
+    queue = make_queue(ingest, batch_size=2)
+
+    queue.submit(docs("a", "b", "c", "d", "e"))
+    assert queue.flush(timeout=5)
+
+    assert ingest.batches == [None, ["c", "d"], ["e"]]
+    assert queue.counters["failed"] == 2
+    assert queue.counters["ingested"] == 3
+    assert queue.stats()["depth"] == 0
+
+
+def test_submit_never_blocks_on_a_slow_ingest():
+    release = threading.Event()
+    queue = make_queue(lambda batch: release.wait(5), batch_size=1, max_wait_ms=0, max_size=1)
+
+    queue.submit(docs("a"))  # taken by the worker, which then blocks
+    for _ in range(100):
+        if queue.stats()["in_flight"]:
+            break
+        time.sleep(0.01)
+    assert queue.submit(docs("b", "c")) == 1  # "c" is dropped instead of waiting for room
+    release.set()
+    assert queue.flush(timeout=5)
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        IngestQueue(lambda batch: None, key_fn=str.lower, policy="block")
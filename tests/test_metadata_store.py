@@ -0,0 +1,67 @@
+import threading
+
+from services.metadata_store import MetadataStore
+
+
+def _doc(i: int, **fields) -> dict:
+    return {"text": f"doc {i}", "hash": f"{i:064x}", "source": "NewsAPI", "timestamp": f"2025-01-{i % 28 + 1:02d}",
+            **fields}
+
+
+def test_stores_sharing_a_db_never_reuse_ids(tmp_path):
+    path = str(tmp_path / "meta.db")
+    stores = [MetadataStore(path), MetadataStore(path)]
+    claimed = []
+    lock = threading.Lock()
+
+    def worker(store: MetadataStore):
+        for _ in range(50):
+            first = store.reserve_ids(3)
+            with lock:
+                claimed.extend(range(first, first + 3))
+
+    threads = [threading.Thread(target=worker, args=(store,)) for store in stores for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(claimed) == len(set(claimed)) == 4 * 50 * 3
+    assert MetadataStore(path).next_id() == max(claimed) + 1
+
+
+def test_reserve_ids_respects_floor_and_inserted_rows(tmp_path):
+    store = MetadataStore(str(tmp_path / "meta.db"))
+    store.insert_many([(i, _doc(i)) for i in range(5)])
+
+    assert store.reserve_ids(2) == 5
+    assert store.reserve_ids(1, floor=100) == 100
+    assert store.reserve_ids(1) == 101
+
+
+def test_filter_ids_combines_source_label_and_time(tmp_path):
+    store = MetadataStore(str(tmp_path / "meta.db"))
+    store.insert_many([
+        (0, _doc(0, source="NewsAPI", labels=["health"])),
+        (1, _doc(1, source="Wikipedia", labels=["health", "economy"])),
+        (2, _doc(2, source="NewsAPI", labels=["economy"])),
+        (3, _doc(3, source="Reddit")),
+    ])
+
+    assert sorted(store.filter_ids(sources=["NewsAPI"])) == [0, 2]
+    assert sorted(store.filter_ids(labels=["health"])) == [0, 1]
+    assert store.filter_ids(sources=["NewsAPI"], labels=["economy"]) == [2]
+    assert sorted(store.filter_ids(since="2025-01-02", until="2025-01-03")) == [1, 2]
+    assert store.filter_ids(sources=["GoogleFactCheck"]) == []
+
+
+def test_recency_prefers_last_hit_over_ingestion_time(tmp_path):
+    store = MetadataStore(str(tmp_path / "meta.db"))
+    store.insert_many([(i, _doc(i)) for i in range(4)])  # ingested 2025-01-01 .. 2025-01-04
+    store.touch_many({0: "2025-02-01", 1: "2025-01-10"})
+
+    assert store.least_recent_ids(2) == [2, 3]
+    assert store.least_recent_ids(4) == [2, 3, 1, 0]
+    assert store.expired_ids("2025-01-03") == [0, 1]
+    assert store.delete_ids([2, 3]) == 2
+    assert store.least_recent_ids(4) == [1, 0]
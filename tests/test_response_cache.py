@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+
+from services import response_cache as rc
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rc.time, "time", clock)
+    return clock
+
+
+def loader_returning(*values):
+    calls = []
+
+    async def loader():
+        calls.append(len(calls))
+        return values[min(len(calls) - 1, len(values) - 1)]
+
+    return loader, calls
+
+
+@pytest.mark.asyncio
+async def test_empty_results_use_the_negative_ttl(clock):
+    cache = rc.ResponseCache(negative_ttl=10, stale_ttl=100)
+    loader, calls = loader_returning([], ["found"])
+
+    assert await cache.fetch("k", loader, ttl=3600) == []
+    clock.now += 5
+    assert await cache.fetch("k", loader, ttl=3600) == []
+    # Past the negative TTL an empty result is refetched, never served stale.
+    clock.now += 6
+    assert await cache.fetch("k", loader, ttl=3600) == ["found"]
+    assert len(calls) == 2
+    assert cache.counters["negative_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_one_refresh_runs(clock):
+    cache = rc.ResponseCache(stale_ttl=100)
+    loader, calls = loader_returning(["old"], ["new"])
+
+    await cache.fetch("k", loader, ttl=10)
+    clock.now += 50
+    assert await asyncio.gather(cache.fetch("k", loader, ttl=10), cache.fetch("k", loader, ttl=10)) == [["old"], ["old"]]
+    await asyncio.sleep(0)  # let the background refresh finish
+
+    assert await cache.fetch("k", loader, ttl=10) == ["new"]
+    assert len(calls) == 2
+    assert cache.counters["stale_hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_entry_past_stale_window_is_refetched(clock):
+    cache = rc.ResponseCache(stale_ttl=100)
+    loader, calls = loader_returning(["old"], ["new"])
+
+    await cache.fetch("k", loader, ttl=10)
+    clock.now += 111
+    assert await cache.fetch("k", loader, ttl=10) == ["new"]
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call(clock):
+    cache = rc.ResponseCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["value"]
+
+    results = await asyncio.gather(*(cache.fetch("k", loader, ttl=60) for _ in range(5)))
+
+    assert results == [["value"]] * 5
+    assert len(calls) == 1
+    assert cache.counters["coalesced"] == 4
+
+
+def test_disk_prune_drops_unservable_rows(tmp_path, clock):
+    cache = rc.ResponseCache(disk_path=str(tmp_path / "cache.db"), stale_ttl=100, prune_every=1000)
+    cache._disk_put("old", (["a"], clock.now - 200, 50))  # past ttl + stale_ttl
+    cache._disk_put("stale", (["b"], clock.now - 120, 50))  # still servable stale
+    cache._disk_put("fresh", (["c"], clock.now, 50))
+
+    assert cache._disk_prune() == 1
+    assert cache._disk_get("old") is None
+    assert cache._disk_get("stale") is not None
+
+
+def test_disk_rows_are_capped_and_pruned_periodically(tmp_path, clock):
+    cache = rc.ResponseCache(disk_path=str(tmp_path / "cache.db"), max_disk_rows=3, prune_every=5)
+    for i in range(5):
+        cache._disk_put(f"k{i}", ([i], clock.now + i, 3600))
+
+    rows = cache._disk.execute("SELECT key FROM responses ORDER BY stored_at").fetchall()
+    assert [key for (key,) in rows] == ["k2", "k3", "k4"]
+    assert cache.counters["pruned"] == 2
+
+
+def test_disk_tier_is_pruned_on_open(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    rc.ResponseCache(disk_path=path, stale_ttl=0)._disk_put("old", (["a"], clock.now - 100, 10))
+
+    reopened = rc.ResponseCache(disk_path=path, stale_ttl=0)
+
+    assert reopened.counters["pruned"] == 1
+    assert reopened._disk_get("old") is None
@@ -0,0 +1,97 @@
+import uuid
+import pytest
+
+from modules.fact_check import retriever
+
+
+class FakeQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, docs):
+        self.submitted.extend(docs)
+        return len(docs)
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """FAISS answers with `cached`; a single external source records whether it was queried."""
+    state = {"cached": [], "external_calls": 0, "queue": FakeQueue()}
+
+    async def fake_search(claim, top_k=3, **filters):
+        return state["cached"]
+
+    async def external(claim):
+        state["external_calls"] += 1
+        return [{"text": f"Report on {claim}", "url": "https://news.example/1", "source": "NewsAPI",
+                 "timestamp": None, "ingest": True}]
+
+    monkeypatch.setattr(retriever, "asearch_similar", fake_search)
+    monkeypatch.setattr(retriever, "EVIDENCE_SOURCES", [("FAISS", retriever._from_cache), ("NewsAPI", external)])
+    monkeypatch.setattr(retriever, "evidence_queue", state["queue"])
+    monkeypatch.setattr(retriever, "CACHE_FIRST_MODE", "skip")
+    return state
+
+
+def _cached(text, url, score=0.99):
+    return {"text": text, "url": url, "source": "Twitter", "timestamp": "2999-01-01T00:00:00", "score": score}
+
+
+@pytest.mark.asyncio
+async def test_claim_cached_only_as_mocks_still_fans_out(sources):
+    claim = f"Vaccines contain microchips {uuid.uuid4()}"
+    sources["cached"] = [_cached(f"Mock tweet about {claim}", ""), _cached(f"Mock FB post about {claim}", "")]
+
+    evidence, timings = await retriever.retrieve_evidence_detailed(claim)
+
+    assert timings["cache_first"] is False
+    assert sources["external_calls"] == 1
+    assert any("news.example" in item for item in evidence)
+
+
+@pytest.mark.asyncio
+async def test_confident_real_hits_skip_external_sources(sources):
+    claim = f"Vaccines contain microchips {uuid.uuid4()}"
+    sources["cached"] = [_cached("Fact check: no microchips", "https://a.example"),
+                         _cached("Vaccine ingredients explained", "https://b.example")]
+
+    _, timings = await retriever.retrieve_evidence_detailed(claim)
+
+    assert timings["cache_first"] is True
+    assert sources["external_calls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_mock_social_signals_are_not_ingested(monkeypatch):
+    claim = f"The moon is made of cheese {uuid.uuid4()}"
+
+    async def signals(query, limit=5):
+        return [
+            {"platform": "Twitter", "text": f"Mock tweet about {query}", "url": "", "mock": True},
+            {"platform": "YouTube", "text": "Moon cheese debunked", "url": "https://youtube.example/v"},
+        ]
+
+    monkeypatch.setattr(retriever, "fetch_social_signals", signals)
+
+    items = await retriever._from_social(claim)
+
+    assert [item["ingest"] for item in items] == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_cached_evidence_for_many_claims_is_one_batched_lookup(monkeypatch):
+    calls = []
+
+    async def fake_search_many(queries, top_k=5, **filters):
+        calls.append((list(queries), top_k))
+        return [[{"text": f"Hit for {query}", "url": "https://a.example", "source": "NewsAPI", "score": 0.9}]
+                for query in queries]
+
+    monkeypatch.setattr(retriever, "asearch_similar_many", fake_search_many)
+
+    results = await retriever.search_cached_evidence_many(["claim one", "claim two"], top_k=2)
+
+    assert calls == [(["claim one", "claim two"], 2)]
+    assert [[item["text"] for item in hits] for hits in results] == [["Hit for claim one"], ["Hit for claim two"]]
+    assert results[0][0]["url"] == "https://a.example"
+    assert await retriever.search_cached_evidence_many([]) == []
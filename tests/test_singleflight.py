@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+
+from services.singleflight import SingleFlight, claim_fingerprint, coalesced, singleflight
+
+
+def test_fingerprint_keeps_case_and_ignores_surrounding_whitespace():
+    assert claim_fingerprint("check", "  The moon is cheese\n") == claim_fingerprint("check", "The moon is cheese")
+    assert claim_fingerprint("check", "The moon is cheese") != claim_fingerprint("check", "the moon is cheese")
+    assert claim_fingerprint("check", "x", {"a": 1}) != claim_fingerprint("check", "x", {"a": 2})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"verdict": "False"}
+
+    results = await asyncio.gather(*(flight.do("check", "k", work) for _ in range(4)))
+
+    assert results == [{"verdict": "False"}] * 4
+    assert len(calls) == 1
+    assert flight.counters["check"] == {"calls": 4, "executions": 1, "coalesced": 3, "failed": 0}
+    # Each caller owns its copy.
+    results[0]["verdict"] = "True"
+    assert results[1]["verdict"] == "False"
+
+
+@pytest.mark.asyncio
+async def test_claims_differing_in_case_get_their_own_result():
+    @coalesced("echo_claim")
+    async def echo(claim: str) -> dict:
+        await asyncio.sleep(0.01)
+        return {"claim": claim}
+
+    first, second, third = await asyncio.gather(echo("Vaccines work"), echo("VACCINES WORK"), echo("Vaccines work "))
+
+    assert first == {"claim": "Vaccines work"}
+    assert second == {"claim": "VACCINES WORK"}
+    assert third == first
+    assert singleflight.counters["echo_claim"]["executions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_waiter_and_are_not_kept():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(flight.do("check", "k", boom), flight.do("check", "k", boom),
+                                   return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.counters["check"]["failed"] == 1
+    assert flight.stats()["inflight"] == 0
@@ -0,0 +1,44 @@
+import faiss
+import numpy as np
+import pytest
+
+from services import vector_index
+
+DIMENSION = 32
+
+
+def _vectors(n: int = 1000) -> np.ndarray:
+    vectors = np.random.default_rng(0).standard_normal((n, DIMENSION)).astype("float32")
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+@pytest.mark.parametrize("kind", vector_index.INDEX_TYPES)
+def test_index_kind_round_trips(kind):
+    index = vector_index.build_index(kind, DIMENSION, _vectors(), nlist=8, pq_m=8)
+
+    assert vector_index.index_kind(index) == kind
+    assert vector_index.is_quantized(index) == (kind in vector_index.QUANTIZED_TYPES)
+
+
+@pytest.mark.parametrize("kind", vector_index.INDEX_TYPES)
+def test_index_kind_survives_serialization(kind):
+    index = vector_index.build_index(kind, DIMENSION, _vectors(), nlist=8, pq_m=8)
+    restored = faiss.deserialize_index(faiss.serialize_index(index))
+
+    assert vector_index.index_kind(restored) == kind
+
+
+def test_rrf_fuse_rewards_agreement_between_rankings():
+    dense = [1, 2, 3, 4]
+    lexical = [3, 5, 1]
+
+    fused = vector_index.rrf_fuse([dense, lexical], k=60)
+
+    assert [doc_id for doc_id, _ in fused] == [1, 3, 2, 5, 4]
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 63)
+    assert fused[1][1] == pytest.approx(1 / 63 + 1 / 61)
+
+
+def test_rrf_fuse_single_ranking_keeps_order():
+    assert [doc_id for doc_id, _ in vector_index.rrf_fuse([[7, 3, 9]])] == [7, 3, 9]
@@ -0,0 +1,309 @@
+import os
+import sys
+import json
+import subprocess
+import textwrap
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each scenario runs in a fresh interpreter: vector_store loads (and locks)
+# its data directory on import, and crash tests must kill the process.
+# Embeddings come from a deterministic bag-of-words hash instead of the model.
+PRELUDE = """
+import os, re, json, hashlib
+import numpy as np
+from services import vector_store as vs
+
+def fake_encode(texts, batch_size=None):
+    out = np.zeros((len(texts), vs.dimension), dtype="float32")
+    for row, text in enumerate(texts):
+        for word in re.findall(r"\\w+", text.lower()):
+            out[row, int(hashlib.sha256(word.encode()).hexdigest(), 16) % vs.dimension] += 1.0
+        out[row] /= max(np.linalg.norm(out[row]), 1e-6)
+    return out
+
+vs._encode = fake_encode
+vs._batcher.encode_fn = fake_encode
+
+def emit(value):
+    print("RESULT " + json.dumps(value), flush=True)
+"""
+
+
+def run_store(data_dir, body: str, **env) -> list:
+    """Run `body` against a store in `data_dir`; returns every value it emit()s."""
+    child_env = {
+        **{name: value for name, value in os.environ.items() if name != "SEARCH_MODE"},  # test the defaults
+        "VECTOR_STORE_DIR": str(data_dir),
+        "WAL_COMPACT_INTERVAL": "0",
+        "EVICTION_INTERVAL": "0",
+        "EMBED_CACHE_DISK_SIZE": "0",
+        **{name: str(value) for name, value in env.items()},
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", PRELUDE + textwrap.dedent(body)],
+        cwd=REPO_ROOT, env=child_env, capture_output=True, text=True, timeout=120,
+    )
+    if result.returncode not in (0, 9):  # 9: simulated crash
+        raise AssertionError(f"store process failed:\n{result.stderr}")
+    return [json.loads(line[len("RESULT "):]) for line in result.stdout.splitlines() if line.startswith("RESULT ")]
+
+
+DOCS = [
+    {"text": "WHO declares the outbreak a public health emergency", "source": "NewsAPI"},
+    {"text": "NASA confirms Earth will not go dark for six days", "source": "GoogleFactCheck"},
+    {"text": "Central bank raises interest rates by 0.5 percent", "source": "Wikipedia"},
+]
+
+
+# ---------- durability (user-003) ----------
+def test_wal_replays_acknowledged_adds_after_crash(tmp_path):
+    run_store(tmp_path, f"""
+        vs.add_bulk({DOCS!r})
+        os._exit(9)  # crash: no snapshot, no clean shutdown
+    """)
+
+    [ntotal, top] = run_store(tmp_path, """
+        emit(vs.index.ntotal)
+        emit(vs.search_similar("NASA Earth dark days", top_k=1, mode="dense")[0]["text"])
+    """)
+
+    assert ntotal == 3
+    assert top == DOCS[1]["text"]
+
+
+def test_compaction_then_reload_keeps_every_doc(tmp_path):
+    [sealed] = run_store(tmp_path, f"""
+        vs.add_bulk({DOCS[:2]!r})
+        emit(vs._wal.active_seq)
+        assert vs.compact_index(wait=True)
+        vs.add_bulk({DOCS[2:]!r})
+        os._exit(9)
+    """)
+
+    [ntotal, has_snapshot, segments] = run_store(tmp_path, """
+        emit(vs.index.ntotal)
+        emit(os.path.exists(vs.INDEX_PATH))
+        emit(vs._wal.segments())
+    """)
+
+    assert ntotal == 3
+    assert has_snapshot
+    # The segment folded into the snapshot is gone; the later add was replayed from the next one.
+    assert sealed not in segments
+
+
+# ---------- search modes (user-019) ----------
+def test_default_search_is_dense_and_ordered_by_cosine(tmp_path):
+    [default, dense, expected] = run_store(tmp_path, f"""
+        vs.add_bulk({DOCS!r})
+        query = "public health emergency declared"
+        emit([[hit["text"], round(hit["score"], 5)] for hit in vs.search_similar(query, top_k=3)])
+        emit([[hit["text"], round(hit["score"], 5)] for hit in vs.search_similar(query, top_k=3, mode="dense")])
+        texts = [doc["text"] for doc in {DOCS!r}]
+        emit(sorted((fake_encode(texts) @ fake_encode([query])[0]).round(5).tolist(), reverse=True))
+    """)
+
+    assert default == dense
+    # Scores match brute-force cosine, best first (docs scoring a tie may come back in either order).
+    assert [score for _, score in default] == pytest.approx(expected, abs=1e-4)
+    assert default[0][0] == DOCS[0]["text"]
+
+
+def test_hybrid_mode_is_opt_in_and_fuses_lexical_hits(tmp_path):
+    [dense_hit, hybrid] = run_store(tmp_path, f"""
+        vs.add_bulk({DOCS!r})
+        emit("rrf_score" in vs.search_similar("interest rates", top_k=1)[0])
+        emit(vs.search_similar("interest rates", top_k=2, mode="hybrid"))
+    """)
+
+    assert dense_hit is False
+    assert hybrid[0]["text"] == DOCS[2]["text"]
+    assert all("rrf_score" in hit for hit in hybrid)
+
+
+# ---------- duplicate detection (user-001) ----------
+def test_duplicates_are_skipped_within_and_across_batches(tmp_path):
+    [ntotal, count, found, first_source] = run_store(tmp_path, f"""
+        docs = {DOCS!r}
+        vs.add_bulk(docs + [{{"text": "  " + docs[0]["text"].upper() + " ", "source": "Reddit"}}])
+        vs.add_bulk(docs[1:])
+        vs.add_document(docs[2]["text"].lower(), url="", source="Reddit")
+        emit(vs.index.ntotal)
+        emit(vs.metadata.count())
+        emit(vs.contains_hash(vs.text_hash(docs[0]["text"])))
+        emit(vs.get_by_text(docs[0]["text"].upper())["source"])
+    """)
+
+    assert ntotal == count == 3
+    assert found is True
+    # The first copy wins; later duplicates never overwrite it.
+    assert first_source == DOCS[0]["source"]
+
+
+# ---------- filtered search (user-012) ----------
+@pytest.mark.parametrize("exact_limit", [20000, 0])  # exact scoring / faiss ID selector
+def test_filters_restrict_hits_before_ranking(tmp_path, exact_limit):
+    [by_source, by_label, window, future] = run_store(tmp_path, f"""
+        docs = {DOCS!r}
+        docs[0]["labels"] = ["health"]
+        docs[2]["labels"] = ["health", "economy"]
+        vs.add_bulk(docs)
+        query = "NASA Earth dark days"
+        emit([hit["source"] for hit in vs.search_similar(query, top_k=3, sources=["NewsAPI", "Wikipedia"])])
+        emit(sorted(hit["source"] for hit in vs.search_similar(query, top_k=3, labels=["health"])))
+        emit(len(vs.search_similar(query, top_k=3, since="2000-01-01T00:00:00")))
+        emit(vs.search_similar(query, top_k=3, since="2999-01-01T00:00:00"))
+    """, FAISS_FILTER_EXACT_LIMIT=exact_limit)
+
+    # The closest doc (NASA) is excluded by the filter rather than crowding out the matches.
+    assert sorted(by_source) == ["NewsAPI", "Wikipedia"]
+    assert by_label == ["NewsAPI", "Wikipedia"]
+    assert window == 3
+    assert future == []
+
+
+@pytest.mark.parametrize("exact_limit", [20000, 0])
+def test_time_window_does_not_assume_ids_follow_timestamps(tmp_path, exact_limit):
+    [texts] = run_store(tmp_path, f"""
+        vs.add_bulk({DOCS!r})
+        # Ingestion order 0, 1, 2 but timestamps 2025-03, 2025-01, 2025-02.
+        with vs.metadata._conn() as conn:
+            for doc_id, ts in ((0, "2025-03-01T00:00:00"), (1, "2025-01-01T00:00:00"), (2, "2025-02-01T00:00:00")):
+                conn.execute("UPDATE docs SET timestamp = ? WHERE id = ?", (ts, doc_id))
+        hits = vs.search_similar("NASA Earth dark days", top_k=3, since="2025-01-15T00:00:00", until="2025-03-15T00:00:00")
+        emit(sorted(hit["text"] for hit in hits))
+    """, FAISS_FILTER_EXACT_LIMIT=exact_limit)
+
+    # The NASA doc sits between the matches by id but outside the window by time.
+    assert texts == sorted([DOCS[0]["text"], DOCS[2]["text"]])
+
+
+# ---------- eviction (user-011) ----------
+def test_eviction_drops_least_recently_hit_docs_beyond_the_cap(tmp_path):
+    [report, remaining, nasa_hits] = run_store(tmp_path, f"""
+        vs.add_bulk({DOCS!r})
+        # Hit every doc but NASA's, which leaves it the least recently used.
+        vs.search_similar_many(["WHO public health emergency", "Central bank interest rates"], top_k=1)
+        emit(vs.evict())
+        emit(sorted(doc["source"] for doc in vs.metadata.get_many(vs.metadata.all_ids()).values()))
+        emit([hit["text"] for hit in vs.search_similar("NASA Earth dark days", top_k=3)])
+    """, EVIDENCE_MAX_DOCS=2)
+
+    assert report == {"evicted": 1, "dead_vectors": 0}
+    assert remaining == ["NewsAPI", "Wikipedia"]
+    assert DOCS[1]["text"] not in nasa_hits
+
+
+def test_eviction_expires_docs_past_the_ttl(tmp_path):
+    [report, remaining] = run_store(tmp_path, f"""
+        vs.add_bulk({DOCS!r})
+        conn = vs.metadata._conn()
+        with conn:
+            conn.execute("UPDATE docs SET timestamp = '2000-01-01T00:00:00' WHERE source = 'Wikipedia'")
+        emit(vs.evict())
+        emit(sorted(doc["source"] for doc in vs.metadata.get_many(vs.metadata.all_ids()).values()))
+    """, EVIDENCE_TTL_DAYS=1)
+
+    assert report["evicted"] == 1
+    assert remaining == ["GoogleFactCheck", "NewsAPI"]
+
+
+# ---------- background rebuild (user-013) ----------
+def test_rebuild_swaps_atomically_under_concurrent_searches_and_adds(tmp_path):
+    [swapped, kind, seen, errors, ntotal, count, status] = run_store(tmp_path, f"""
+        import threading
+        vs.add_bulk({DOCS!r})
+        stop = threading.Event()
+        seen, errors = set(), []
+
+        def searcher():
+            while not stop.is_set():
+                try:
+                    seen.add(vs.search_similar("NASA Earth dark days", top_k=1)[0]["text"])
+                except Exception as e:
+                    errors.append(repr(e))
+
+        def writer():
+            for i in range(40):
+                vs.add_document(f"Extra report {{i}} on topic {{i}}", url="", source="Reddit", auto_save=False)
+
+        threads = [threading.Thread(target=searcher), threading.Thread(target=writer)]
+        for thread in threads:
+            thread.start()
+        swapped = vs.rebuild_index("hnsw")
+        threads[1].join()
+        stop.set()
+        threads[0].join()
+        emit(swapped)
+        emit(vs.stats()["index_type"])
+        emit(sorted(seen))
+        emit(errors)
+        emit(vs.index.ntotal)
+        emit(vs.metadata.count())
+        emit(vs.rebuild_status()["state"])
+    """, FAISS_PROMOTE_THRESHOLD=1)
+
+    assert swapped is True
+    assert kind == "hnsw"
+    # Every search during the rebuild was answered, from one generation or the other.
+    assert errors == []
+    assert seen == [DOCS[1]["text"]]
+    # Adds made while the new generation was being built were carried over.
+    assert ntotal == count == len(DOCS) + 40
+    assert status == "done"
+
+
+def test_rebuild_honours_an_explicit_kind_below_the_threshold(tmp_path):
+    [explicit, default] = run_store(tmp_path, f"""
+        vs.add_bulk({DOCS!r})
+        vs.remove_documents([vs.metadata.id_for_hash(vs.text_hash({DOCS[2]["text"]!r}))])
+        for kind in ("hnsw", None):
+            assert vs.rebuild_index(kind)
+            status = vs.rebuild_status()
+            emit([vs.stats()["index_type"], status.get("below_threshold"), status.get("downgraded_from"),
+                  vs.index.ntotal, vs.search_similar("NASA Earth dark days", top_k=1)[0]["text"]])
+    """, FAISS_PROMOTE_THRESHOLD=1000, FAISS_REBUILD_COPY_CHUNK=1)
+
+    # Copied chunk by chunk, without the removed doc.
+    assert explicit == ["hnsw", True, None, 2, DOCS[1]["text"]]
+    # Without a kind, an ANN index below the threshold falls back to flat.
+    assert default == ["flat", None, "hnsw", 2, DOCS[1]["text"]]
+
+
+# ---------- shared service (user-010) ----------
+def test_service_socket_and_generated_key_are_owner_only(tmp_path):
+    [modes, answered, rejected] = run_store(tmp_path, f"""
+        import stat, threading, time
+        from multiprocessing import AuthenticationError
+        from services import vector_service
+
+        vs.add_bulk({DOCS!r})
+        threading.Thread(target=vector_service.serve, daemon=True).start()
+        while not os.path.exists(vs.VECTOR_STORE_SOCKET) or stat.S_IMODE(os.stat(vs.VECTOR_STORE_SOCKET).st_mode) != 0o600:
+            time.sleep(0.01)
+        emit([oct(stat.S_IMODE(os.stat(path).st_mode)) for path in (vs.AUTHKEY_PATH, vs.VECTOR_STORE_SOCKET)])
+        client = vector_service.VectorStoreClient(vs.VECTOR_STORE_SOCKET, authkey_path=vs.AUTHKEY_PATH)
+        emit(client.call("stats")["documents"])
+        try:
+            vector_service.VectorStoreClient(vs.VECTOR_STORE_SOCKET, authkey=b"truthlens-vector-store").call("stats")
+            emit(False)
+        except AuthenticationError:
+            emit(True)
+        os._exit(0)
+    """, VECTOR_STORE_MODE="server", VECTOR_STORE_AUTHKEY="")
+
+    assert modes == ["0o600", "0o600"]
+    assert answered == len(DOCS)
+    assert rejected is True
+
+
+def test_client_mode_never_opens_the_metadata_db(tmp_path):
+    [metadata, created] = run_store(tmp_path, """
+        emit(vs.metadata is None)
+        emit(sorted(os.listdir(vs.DATA_DIR)))
+    """, VECTOR_STORE_MODE="client")
+
+    assert metadata is True
+    assert created == []